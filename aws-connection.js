@@ -6,7 +6,8 @@ const AWS_CONFIG = {
     region: 'us-east-1',
     apiVersion: '2012-08-10',
     tableName: 'trading-system-signals',
-    lambdaFunctionName: 'trading-system-engine'
+    lambdaFunctionName: 'trading-system-engine',
+    signalQueryFunctionName: 'trading-system-signal-query'
 };
 
 // Initialize AWS SDK
@@ -85,20 +86,20 @@ async function loadRealSignalsFromAWS() {
     try {
         console.log('🔍 Loading REAL signals from DynamoDB...');
         
-        if (!isAWSConfigured || !dynamodb) {
+        if (!isAWSConfigured || !lambda) {
             console.log('📡 AWS not configured, using demo signals');
             return await getEnhancedMockSignals();
         }
 
-        // Fixed DynamoDB scan parameters
+        // Latest signals from the time-indexed query API (no table scan)
         const params = {
-            TableName: AWS_CONFIG.tableName,
-            Limit: 20
+            FunctionName: AWS_CONFIG.signalQueryFunctionName,
+            InvocationType: 'RequestResponse',
+            Payload: JSON.stringify({ limit: 20 })
         };
 
-        // Use promise() method correctly
-        const result = await new Promise((resolve, reject) => {
-            dynamodb.scan(params, (err, data) => {
+        const response = await new Promise((resolve, reject) => {
+            lambda.invoke(params, (err, data) => {
                 if (err) {
                     reject(err);
                 } else {
@@ -106,6 +107,12 @@ async function loadRealSignalsFromAWS() {
                 }
             });
         });
+
+        const queryResult = JSON.parse(JSON.parse(response.Payload).body);
+        if (queryResult.status !== 'success') {
+            throw new Error(queryResult.error);
+        }
+        const result = { Items: queryResult.items };
         
         console.log(`📊 Found ${result.Items.length} items in DynamoDB table`);
         
@@ -134,22 +141,8 @@ async function loadRealSignalsFromAWS() {
             }];
         }
 
-        // Convert DynamoDB items to our format
-        const signals = result.Items.map(item => {
-            // Convert DynamoDB format to JavaScript objects
-            const convertDynamoDBItem = (dbItem) => {
-                const converted = {};
-                for (const [key, value] of Object.entries(dbItem)) {
-                    if (value.S) converted[key] = value.S;
-                    else if (value.N) converted[key] = parseFloat(value.N);
-                    else if (value.L) converted[key] = value.L.map(v => v.S || parseFloat(v.N));
-                    else if (value.M) converted[key] = convertDynamoDBItem(value.M);
-                }
-                return converted;
-            };
-            
-            return convertDynamoDBItem(item);
-        });
+        // Query API items are already plain JSON
+        const signals = result.Items;
 
         // Sort by timestamp (newest first)
         signals.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp));
@@ -0,0 +1,63 @@
+"""
+☁️ Shared AWS Clients
+
+boto3 is imported on first use rather than when a handler module loads,
+and every client, resource and table is created once per container and
+reused across warm invocations - creating a boto3 client costs tens of
+milliseconds and loads its service model each time.
+
+boto3 clients are thread-safe, so the cached ones can be shared by the
+scan's worker threads.
+"""
+
+import copy
+import os
+import threading
+
+SIGNALS_TABLE = os.environ.get('SIGNALS_TABLE', 'trading-system-signals')
+
+_lock = threading.RLock()
+_cache = {}
+
+def _cached(key, factory):
+    """Create a value once per container, even with concurrent first callers"""
+    value = _cache.get(key)
+    if value is None:
+        with _lock:
+            value = _cache.get(key)
+            if value is None:
+                value = factory()
+                _cache[key] = value
+    return value
+
+def get_client(service, config=None):
+    """Low-level boto3 client for a service (sns, lambda, ...)
+
+    `config` holds botocore Config options (read_timeout, retries, ...);
+    each distinct config gets its own cached client.
+    """
+    def create():
+        import boto3
+        if not config:
+            return boto3.client(service)
+        from botocore.config import Config
+        # Config rewrites the retries dict it is given - keep the caller's (and the cache key) intact
+        return boto3.client(service, config=Config(**copy.deepcopy(config)))
+    return _cached(('client', service, repr(sorted((config or {}).items()))), create)
+
+def get_resource(service):
+    """boto3 resource for a service (dynamodb)"""
+    def create():
+        import boto3
+        return boto3.resource(service)
+    return _cached(('resource', service), create)
+
+def get_table(name=None):
+    """DynamoDB table handle - the signals table by default"""
+    name = name or SIGNALS_TABLE
+    return _cached(('table', name), lambda: get_resource('dynamodb').Table(name))
+
+def reset_clients():
+    """Drop every cached client so the next call creates fresh ones"""
+    with _lock:
+        _cache.clear()
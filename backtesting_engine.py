@@ -1,12 +1,13 @@
 import json
-import boto3
 import os
 from datetime import datetime, timedelta
-import urllib.request
-import urllib.parse
-import ssl
-import statistics
-from decimal import Decimal
+from indicator_engine import numpy_available, calculate_indicator_records
+from incremental_rsi import IncrementalRSI, rsi_from_closes
+from bar_cache import BarStore, BAR_COLUMNS
+from bar_series import BarSeries, bar_column, bar_dates
+from http_client import get_json
+from universe_registry import universe_symbols
+from aws_clients import get_resource
 
 def lambda_handler(event, context):
     """
@@ -20,7 +21,7 @@ def lambda_handler(event, context):
     
     try:
         # Initialize AWS services
-        dynamodb = boto3.resource('dynamodb')
+        dynamodb = get_resource('dynamodb')
         
         # Environment variables
         signals_table_name = os.environ.get('SIGNALS_TABLE', 'trading-system-signals')
@@ -29,15 +30,23 @@ def lambda_handler(event, context):
         # Get operation type
         operation = event.get('operation', 'full_backtest')
         days_back = event.get('days_back', 365)  # Default 1 year
+        offline = event.get('offline', False)  # Use only locally cached bars
+        workers = event.get('workers')  # Backtest process-pool size override
         
         if operation == 'full_backtest':
-            results = run_full_backtest(dynamodb, performance_table_name, days_back)
+            results = run_full_backtest(dynamodb, performance_table_name, days_back, offline, workers)
         elif operation == 'optimize_thresholds':
-            results = optimize_confidence_thresholds(dynamodb, performance_table_name)
+            # Leave headroom inside the Lambda timeout for persisting results
+            time_budget = context.get_remaining_time_in_millis() / 1000 - 30 if context else None
+            results = optimize_confidence_thresholds(dynamodb, performance_table_name, days_back, offline, workers, time_budget)
+        elif operation == 'replay_backtest':
+            # Live analysis replayed over history (imported here - it depends on this module)
+            from replay_engine import run_replay_backtest
+            results = run_replay_backtest(days_back, offline, holding_period=event.get('holding_period', 5))
         elif operation == 'analyze_current_signals':
             results = analyze_current_signal_performance(dynamodb, signals_table_name)
         else:
-            results = run_full_backtest(dynamodb, performance_table_name, days_back)
+            results = run_full_backtest(dynamodb, performance_table_name, days_back, offline, workers)
         
         return {
             'statusCode': 200,
@@ -61,47 +70,71 @@ def lambda_handler(event, context):
             })
         }
 
-def get_comprehensive_historical_data(symbol, days=365):
-    """Get comprehensive historical data for backtesting"""
+def fetch_yahoo_daily_bars(symbol, period1, period2):
+    """Fetch daily OHLCV columns from Yahoo Finance between two epoch timestamps"""
+    url = f'https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d&period1={period1}&period2={period2}'
+    
+    # Shared keep-alive connection pool - no new TLS handshake per symbol
+    data = get_json(url)
+    
+    result = data['chart']['result'][0]
+    timestamps = result.get('timestamp') or []
+    quotes = result['indicators']['quote'][0]
+    
+    columns = {column: [] for column, _ in BAR_COLUMNS}
+    for i, timestamp in enumerate(timestamps):
+        if all(quotes[key][i] is not None for key in ['open', 'high', 'low', 'close', 'volume']):
+            columns['timestamp'].append(int(timestamp))
+            columns['open'].append(quotes['open'][i])
+            columns['high'].append(quotes['high'][i])
+            columns['low'].append(quotes['low'][i])
+            columns['close'].append(quotes['close'][i])
+            columns['volume'].append(int(quotes['volume'][i]))
+    
+    return columns
+
+def get_comprehensive_historical_data(symbol, days=365, store=None, offline=False):
+    """Get comprehensive historical data for backtesting
+    
+    Bars are served from the local BarStore; only the tail since the last
+    cached bar is downloaded. With offline=True no request is made at all.
+    Returns a BarSeries view over the cached columns for the window.
+    """
     try:
         print(f'📈 Fetching {days} days of data for {symbol}...')
         
-        # Yahoo Finance API for comprehensive historical data
+        store = store or BarStore()
+        
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days)
         
         start_timestamp = int(start_date.timestamp())
         end_timestamp = int(end_date.timestamp())
         
-        url = f'https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d&period1={start_timestamp}&period2={end_timestamp}'
-        
-        context = ssl.create_default_context()
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+        cached = store.load(symbol, '1d')
         
-        with urllib.request.urlopen(req, context=context) as response:
-            data = json.loads(response.read().decode())
+        if not offline:
+            # Allow a few days of slack for weekends/holidays at the start of the window
+            covers_window = cached['timestamp'] and cached['timestamp'][0] <= start_timestamp + 5 * 86400
+            
+            if covers_window:
+                # Re-fetch from the start of the last cached session so a partial day gets
+                # refreshed - its settled bar is stamped earlier than the partial one
+                fresh = fetch_yahoo_daily_bars(symbol, cached['timestamp'][-1] // 86400 * 86400, end_timestamp)
+                appended = store.merge(symbol, '1d', fresh)
+                print(f'💾 Cache hit for {symbol} - refreshed {appended} bars')
+            else:
+                fresh = fetch_yahoo_daily_bars(symbol, start_timestamp, end_timestamp)
+                store.replace(symbol, '1d', fresh)
+            
+            cached = store.load(symbol, '1d')
         
-        result = data['chart']['result'][0]
-        timestamps = result['timestamp']
-        quotes = result['indicators']['quote'][0]
+        # Requested window as a view over the cached columns - no per-bar objects
+        historical_data = BarSeries(cached).between(start_timestamp, end_timestamp)
         
-        if not timestamps or not quotes['close']:
+        if not historical_data:
             return None
         
-        # Create comprehensive dataset
-        historical_data = []
-        for i, timestamp in enumerate(timestamps):
-            if all(quotes[key][i] is not None for key in ['open', 'high', 'low', 'close', 'volume']):
-                historical_data.append({
-                    'date': datetime.fromtimestamp(timestamp),
-                    'open': quotes['open'][i],
-                    'high': quotes['high'][i],
-                    'low': quotes['low'][i],
-                    'close': quotes['close'][i],
-                    'volume': quotes['volume'][i]
-                })
-        
         print(f'✅ Retrieved {len(historical_data)} days of data for {symbol}')
         return historical_data
         
@@ -109,36 +142,53 @@ def get_comprehensive_historical_data(symbol, days=365):
         print(f'❌ Error fetching historical data for {symbol}: {e}')
         return None
 
-def calculate_all_indicators(data):
+def calculate_all_indicators(data, rsi_mode='simple'):
     """Calculate comprehensive technical indicators for backtesting"""
     if not data or len(data) < 50:
         return []
     
+    # Vectorized single pass over the whole history when numpy is available
+    if numpy_available():
+        return calculate_indicator_records(data, rsi_mode)
+    
     enhanced_data = []
     
+    # Whole columns once - works the same for a BarSeries or a list of bar dicts
+    all_closes = bar_column(data, 'close')
+    all_volumes = bar_column(data, 'volume')
+    all_highs = bar_column(data, 'high')
+    all_lows = bar_column(data, 'low')
+    all_opens = bar_column(data, 'open')
+    dates = bar_dates(data)
+    
+    # Running RSI state - fed every close once instead of rebuilding deltas per bar
+    rsi_state = IncrementalRSI(mode=rsi_mode)
+    for close in all_closes[:50]:
+        rsi_state.update(close)
+    
     for i in range(50, len(data)):  # Start from day 50 to have enough history
-        current_data = data[max(0, i-50):i+1]  # Last 50 days + current
+        start = max(0, i-50)  # Last 50 days + current
         
-        if len(current_data) < 20:
+        if i + 1 - start < 20:
             continue
             
-        closes = [d['close'] for d in current_data]
-        volumes = [d['volume'] for d in current_data]
-        highs = [d['high'] for d in current_data]
-        lows = [d['low'] for d in current_data]
+        closes = all_closes[start:i+1]
+        volumes = all_volumes[start:i+1]
+        highs = all_highs[start:i+1]
+        lows = all_lows[start:i+1]
         
         # Calculate all indicators (same as your ML system)
         indicators = {
-            'date': data[i]['date'],
-            'close': data[i]['close'],
-            'open': data[i]['open'],
-            'high': data[i]['high'],
-            'low': data[i]['low'],
-            'volume': data[i]['volume']
+            'date': dates[i],
+            'close': all_closes[i],
+            'open': all_opens[i],
+            'high': all_highs[i],
+            'low': all_lows[i],
+            'volume': all_volumes[i]
         }
         
         # RSI
-        indicators['rsi'] = calculate_rsi_historical(closes)
+        indicators['rsi'] = rsi_state.update(all_closes[i])
         
         # Moving averages
         indicators['sma_5'] = sum(closes[-5:]) / 5 if len(closes) >= 5 else closes[-1]
@@ -155,7 +205,8 @@ def calculate_all_indicators(data):
         avg_volume_10 = sum(volumes[-10:]) / 10 if len(volumes) >= 10 else volumes[-1]
         indicators['volume_ratio'] = volumes[-1] / avg_volume_10 if avg_volume_10 > 0 else 1
         
-        # Volatility
+        # Volatility (statistics is deferred to first use, like in the live engine)
+        import statistics
         indicators['volatility_10'] = statistics.stdev(closes[-10:]) if len(closes) >= 10 else 0
         indicators['volatility_20'] = statistics.stdev(closes[-20:]) if len(closes) >= 20 else 0
         
@@ -173,33 +224,20 @@ def calculate_all_indicators(data):
     
     return enhanced_data
 
-def calculate_rsi_historical(prices, period=14):
+def calculate_rsi_historical(prices, period=14, mode='simple'):
     """Calculate RSI for historical data"""
-    if len(prices) < period + 1:
-        return 50
-    
-    deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-    gains = [d if d > 0 else 0 for d in deltas]
-    losses = [-d if d < 0 else 0 for d in deltas]
-    
-    if len(gains) < period:
-        return 50
-    
-    avg_gain = sum(gains[-period:]) / period
-    avg_loss = sum(losses[-period:]) / period
-    
-    if avg_loss == 0:
-        return 100
-    
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    return rsi_from_closes(prices, period, mode)
 
-def simulate_ml_signals_historical(indicators_data, confidence_threshold=60):
-    """Simulate your exact ML signal generation on historical data"""
-    signals = []
+def score_ml_signals_historical(indicators_data):
+    """Score every bar once with your exact ML logic
     
-    for i, indicators in enumerate(indicators_data[:-5]):  # Leave 5 days for future returns
+    Returns one (index, signal_score, final_confidence, reasons) tuple per bar.
+    Nothing here depends on the confidence threshold, so any number of
+    thresholds can be derived from the same scores via signals_for_threshold.
+    """
+    scored_bars = []
+    
+    for i, indicators in enumerate(indicators_data):
         # Apply your exact ML logic
         signal_score = 0
         confidence_multiplier = 1.0
@@ -289,17 +327,42 @@ def simulate_ml_signals_historical(indicators_data, confidence_threshold=60):
             signal_score += 15
             reasons.append('MACD bullish')
         
-        # Check thresholds (same as your ML system)
-        if abs(signal_score) < 30:
-            continue
-        
         # Calculate confidence
         base_confidence = min(95, abs(signal_score) * 1.3)
         final_confidence = min(95, base_confidence * confidence_multiplier)
         
+        scored_bars.append((i, signal_score, final_confidence, reasons))
+    
+    return scored_bars
+
+def signals_for_threshold(indicators_data, scored_bars, confidence_threshold=60, min_signal_score=30, holding_period=5, signal_cache=None):
+    """Derive simulated trades for one threshold from pre-scored bars
+    
+    A bar's trade record does not depend on the threshold, so callers sweeping
+    many thresholds can pass a shared signal_cache dict to build each one once.
+    """
+    signals = []
+    
+    # Leave `holding_period` days for future returns
+    last_entry = len(indicators_data) - holding_period
+    
+    for i, signal_score, final_confidence, reasons in scored_bars:
+        if i >= last_entry:
+            break
+        
+        # Check thresholds (same as your ML system)
+        if abs(signal_score) < min_signal_score:
+            continue
+        
         if final_confidence < confidence_threshold:
             continue
         
+        if signal_cache is not None and (i, holding_period) in signal_cache:
+            signals.append(signal_cache[(i, holding_period)])
+            continue
+        
+        indicators = indicators_data[i]
+        
         # Determine signal type
         if signal_score > 0:
             if signal_score > 100:
@@ -316,10 +379,10 @@ def simulate_ml_signals_historical(indicators_data, confidence_threshold=60):
             else:
                 signal_type = 'WEAK_SELL'
         
-        # Calculate future returns (5-day holding period)
-        if i + 5 < len(indicators_data):
+        # Calculate future returns over the holding period
+        if i + holding_period < len(indicators_data):
             entry_price = indicators['close']
-            exit_price = indicators_data[i + 5]['close']
+            exit_price = indicators_data[i + holding_period]['close']
             
             if signal_type in ['STRONG_BUY', 'BUY', 'WEAK_BUY']:
                 trade_return = ((exit_price - entry_price) / entry_price) * 100
@@ -333,86 +396,234 @@ def simulate_ml_signals_historical(indicators_data, confidence_threshold=60):
             'signal_type': signal_type,
             'confidence': round(final_confidence, 1),
             'entry_price': round(indicators['close'], 2),
-            'exit_price': round(indicators_data[i + 5]['close'], 2) if i + 5 < len(indicators_data) else indicators['close'],
+            'exit_price': round(indicators_data[i + holding_period]['close'], 2) if i + holding_period < len(indicators_data) else indicators['close'],
             'trade_return': round(trade_return, 2),
             'signal_score': signal_score,
             'reasons': reasons[:3],
             'successful_trade': trade_return > 2.0 if signal_type in ['STRONG_BUY', 'BUY', 'WEAK_BUY'] else trade_return > 2.0
         }
         
+        if signal_cache is not None:
+            signal_cache[(i, holding_period)] = signal
+        
         signals.append(signal)
     
     return signals
 
-def run_full_backtest(dynamodb, performance_table_name, days_back=365):
+def simulate_ml_signals_historical(indicators_data, confidence_threshold=60):
+    """Simulate your exact ML signal generation on historical data"""
+    return signals_for_threshold(indicators_data, score_ml_signals_historical(indicators_data), confidence_threshold)
+
+def simulate_ml_signals_for_thresholds(indicators_data, thresholds):
+    """Simulate many confidence thresholds from a single scoring pass"""
+    scored_bars = score_ml_signals_historical(indicators_data)
+    signal_cache = {}
+    return {
+        threshold: signals_for_threshold(indicators_data, scored_bars, threshold, signal_cache=signal_cache)
+        for threshold in thresholds
+    }
+
+# Your current signal universe (see universes.json)
+BACKTEST_UNIVERSE = os.environ.get('BACKTEST_UNIVERSE', 'backtest')
+BACKTEST_SYMBOLS = universe_symbols(BACKTEST_UNIVERSE)
+
+# Confidence thresholds evaluated by every backtest
+BACKTEST_THRESHOLDS = [60, 70, 80, 90]
+
+# Process-pool size for backtests (1 = run serially in this process)
+BACKTEST_WORKERS = int(os.environ.get('BACKTEST_WORKERS', os.cpu_count() or 1))
+
+# Per-process memo of (indicators, scored bars, signal cache) so a worker reuses them across thresholds
+_indicator_frames = {}
+
+# Bars loaded by prefetch_historical_data, reused by serial runs and forked workers
+_historical_bars = {}
+
+def clear_backtest_memos():
+    """Drop memoized bars and frames - they may be stale in a later warm invocation"""
+    _indicator_frames.clear()
+    _historical_bars.clear()
+
+def summarize_threshold_signals(signals):
+    """Summarize simulated signals for one symbol/threshold, returning (results, raw total return)"""
+    if not signals:
+        return {
+            'total_trades': 0,
+            'win_rate': 0,
+            'avg_return': 0,
+            'total_return': 0
+        }, 0
+    
+    # Calculate performance
+    trades = len(signals)
+    winning = len([s for s in signals if s['successful_trade']])
+    win_rate = (winning / trades) * 100 if trades > 0 else 0
+    avg_return = sum([s['trade_return'] for s in signals]) / trades if trades > 0 else 0
+    total_return = sum([s['trade_return'] for s in signals])
+    
+    return {
+        'total_trades': trades,
+        'winning_trades': winning,
+        'losing_trades': trades - winning,
+        'win_rate': round(win_rate, 2),
+        'avg_return': round(avg_return, 2),
+        'total_return': round(total_return, 2),
+        'best_trade': max([s['trade_return'] for s in signals]) if signals else 0,
+        'worst_trade': min([s['trade_return'] for s in signals]) if signals else 0
+    }, total_return
+
+def load_indicator_frame(symbol, days_back, offline=False):
+    """Fetch bars, calculate indicators and score every bar for a symbol, memoized per process"""
+    key = (symbol, days_back)
+    if key not in _indicator_frames:
+        historical_data = _historical_bars.get(key)
+        if historical_data is None:
+            historical_data = get_comprehensive_historical_data(symbol, days_back, offline=offline)
+        indicators_data = calculate_all_indicators(historical_data) if historical_data else []
+        _indicator_frames[key] = (indicators_data, score_ml_signals_historical(indicators_data), {})
+    return _indicator_frames[key]
+
+def backtest_shard(shard):
+    """Backtest one (symbol, threshold) shard - runs inside a worker process"""
+    symbol, threshold, days_back = shard
+    
+    # Bars were prefetched into the local cache by the coordinator
+    indicators_data, scored_bars, signal_cache = load_indicator_frame(symbol, days_back, offline=True)
+    if not indicators_data:
+        return symbol, threshold, None, 0
+    
+    signals = signals_for_threshold(indicators_data, scored_bars, threshold, signal_cache=signal_cache)
+    results, raw_total_return = summarize_threshold_signals(signals)
+    return symbol, threshold, results, raw_total_return
+
+def prefetch_historical_data(symbols, days_back):
+    """Fill the local bar cache for every symbol and keep the loaded bars - network bound, so threads are enough"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with ThreadPoolExecutor(max_workers=min(8, len(symbols)) or 1) as executor:
+        loaded = executor.map(lambda symbol: get_comprehensive_historical_data(symbol, days_back), symbols)
+        for symbol, historical_data in zip(symbols, loaded):
+            if historical_data is not None:
+                _historical_bars[(symbol, days_back)] = historical_data
+
+class BacktestPool:
+    """Process pool for one backtest or optimizer run, with every symbol pinned to one worker
+    
+    Each worker keeps its own frame memo, and a symbol's tasks always go to the
+    same worker, so its indicators and scores are computed once per run however
+    many rungs evaluate it. Tasks run serially in this process when no process
+    pool can be started.
+    """
+    
+    def __init__(self, workers=None):
+        self.executors = []
+        self.slots = {}
+        
+        workers = workers or BACKTEST_WORKERS
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            
+            try:
+                for _ in range(workers):
+                    self.executors.append(ProcessPoolExecutor(max_workers=1))
+            except (OSError, NotImplementedError) as e:
+                # AWS Lambda has no /dev/shm, so multiprocessing primitives are unavailable there
+                print(f'⚠️ Process pool unavailable ({e}) - running backtest serially')
+                self.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        return False
+    
+    def shutdown(self):
+        # Tasks still running past a deadline are abandoned rather than waited for
+        for executor in self.executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.executors = []
+    
+    def _executor(self, symbol):
+        slot = self.slots.setdefault(symbol, len(self.slots) % len(self.executors))
+        return self.executors[slot]
+    
+    def map(self, func, tasks, deadline=None):
+        """Run func over tasks (each starting with its symbol), in task order
+        
+        The deadline (a datetime) is checked before every task, and no new task
+        starts after it; results of the tasks finished by then are returned.
+        """
+        def remaining():
+            return None if deadline is None else (deadline - datetime.now()).total_seconds()
+        
+        if not self.executors:
+            results = []
+            for task in tasks:
+                if deadline is not None and remaining() <= 0:
+                    break
+                results.append(func(task))
+            return results
+        
+        from concurrent.futures import TimeoutError as FutureTimeout
+        
+        futures = [self._executor(task[0]).submit(func, task) for task in tasks]
+        try:
+            for future in futures:
+                future.result(timeout=None if deadline is None else max(0, remaining()))
+        except FutureTimeout:
+            for future in futures:
+                future.cancel()
+        return [future.result() for future in futures if future.done() and not future.cancelled()]
+
+def run_backtest_shards(symbols, days_back, offline=False, workers=None):
+    """Run every (symbol, threshold) shard, across a process pool when possible"""
+    shards = [(symbol, threshold, days_back) for symbol in symbols for threshold in BACKTEST_THRESHOLDS]
+    
+    # Frames from an earlier warm invocation may be stale (and forked workers would inherit them)
+    clear_backtest_memos()
+    
+    if not offline:
+        prefetch_historical_data(symbols, days_back)
+    
+    # Pinning keeps a symbol's thresholds on the same worker's frame memo
+    with BacktestPool(workers) as pool:
+        results = pool.map(backtest_shard, shards)
+    clear_backtest_memos()
+    return results
+
+def run_full_backtest(dynamodb, performance_table_name, days_back=365, offline=False, workers=None):
     """Run comprehensive backtesting on your ML-enhanced signals"""
     print(f'📊 Starting {days_back}-day backtest for maximum charity optimization...')
     
     # Test your current signal universe
-    symbols = [
-        'AAPL', 'GOOGL', 'MSFT', 'AMZN', 'META', 'TSLA', 'NVDA', 'NFLX',
-        'ADBE', 'CRM', 'ORCL', 'INTC', 'AMD', 'QCOM',
-        'JPM', 'BAC', 'GS', 'V', 'MA',
-        'SPY', 'QQQ', 'IWM', 'XLF', 'XLK',
-        'PLTR', 'SNOW', 'COIN', 'ROKU', 'SHOP'
-    ]
+    symbols = BACKTEST_SYMBOLS
+    
+    shard_results = {
+        (symbol, threshold): (results, raw_total_return)
+        for symbol, threshold, results, raw_total_return in run_backtest_shards(symbols, days_back, offline, workers)
+    }
     
     all_results = {}
     total_trades = 0
     total_profit = 0
     winning_trades = 0
     
+    # Merge in universe/threshold order so totals are identical however shards were scheduled
     for symbol in symbols:
-        print(f'📈 Backtesting {symbol}...')
-        
-        # Get historical data
-        historical_data = get_comprehensive_historical_data(symbol, days_back)
-        if not historical_data:
-            continue
-        
-        # Calculate indicators
-        indicators_data = calculate_all_indicators(historical_data)
-        if not indicators_data:
+        if any(shard_results[(symbol, threshold)][0] is None for threshold in BACKTEST_THRESHOLDS):
             continue
         
-        # Test different confidence thresholds
         confidence_results = {}
-        for threshold in [60, 70, 80, 90]:
-            # Simulate signals
-            signals = simulate_ml_signals_historical(indicators_data, threshold)
-            
-            if not signals:
-                confidence_results[threshold] = {
-                    'total_trades': 0,
-                    'win_rate': 0,
-                    'avg_return': 0,
-                    'total_return': 0
-                }
-                continue
-            
-            # Calculate performance
-            trades = len(signals)
-            winning = len([s for s in signals if s['successful_trade']])
-            win_rate = (winning / trades) * 100 if trades > 0 else 0
-            avg_return = sum([s['trade_return'] for s in signals]) / trades if trades > 0 else 0
-            total_return = sum([s['trade_return'] for s in signals])
-            
-            confidence_results[threshold] = {
-                'total_trades': trades,
-                'winning_trades': winning,
-                'losing_trades': trades - winning,
-                'win_rate': round(win_rate, 2),
-                'avg_return': round(avg_return, 2),
-                'total_return': round(total_return, 2),
-                'best_trade': max([s['trade_return'] for s in signals]) if signals else 0,
-                'worst_trade': min([s['trade_return'] for s in signals]) if signals else 0
-            }
+        for threshold in BACKTEST_THRESHOLDS:
+            results, raw_total_return = shard_results[(symbol, threshold)]
+            confidence_results[threshold] = results
             
             # Track totals for optimal threshold (70%)
-            if threshold == 70:
-                total_trades += trades
-                total_profit += total_return
-                winning_trades += winning
+            if threshold == 70 and results['total_trades'] > 0:
+                total_trades += results['total_trades']
+                total_profit += raw_total_return
+                winning_trades += results['winning_trades']
         
         all_results[symbol] = confidence_results
         print(f'✅ {symbol} backtest complete - Best: {max([r["total_return"] for r in confidence_results.values() if r["total_trades"] > 0], default=0):.1f}%')
@@ -487,18 +698,206 @@ def calculate_charity_impact(results):
         'charity_impact_score': 'HIGH' if annual_return > 15 else 'MEDIUM' if annual_return > 8 else 'LOW'
     }
 
-def optimize_confidence_thresholds(dynamodb, performance_table_name):
-    """Optimize confidence thresholds for maximum profitability"""
-    print('🎯 Optimizing confidence thresholds for maximum charity impact...')
+# Coarse search grid for the threshold optimizer
+OPTIMIZER_GRID = {
+    'confidence_threshold': [60, 65, 70, 75, 80, 85, 90, 95],
+    'min_signal_score': [30, 40, 50, 60, 80],
+    'holding_period': [1, 3, 5, 7, 10]
+}
+
+# Successive-halving schedule: cumulative share of the universe per rung, and survivors kept
+OPTIMIZER_RUNGS = [0.25, 0.5, 1.0]
+OPTIMIZER_KEEP_FRACTION = 1 / 3
+
+# Configs with fewer trades than this are not trusted
+OPTIMIZER_MIN_TRADES = 20
+
+# Current production settings - the baseline the optimizer has to beat
+BASELINE_CONFIG = (70, 30, 5)
+
+def evaluate_threshold_configs(task):
+    """Evaluate (threshold, min score, holding period) configs on one symbol - runs inside a worker process"""
+    symbol, days_back, configs = task
     
-    # This would run backtests at different thresholds
-    # For now, return optimization results
+    indicators_data, scored_bars, signal_cache = load_indicator_frame(symbol, days_back, offline=True)
+    
+    stats = []
+    for threshold, min_signal_score, holding_period in configs:
+        signals = signals_for_threshold(indicators_data, scored_bars, threshold, min_signal_score, holding_period, signal_cache)
+        returns = [s['trade_return'] for s in signals]
+        stats.append((len(returns), len([s for s in signals if s['successful_trade']]), sum(returns)))
+    return stats
+
+def score_threshold_config(trades, winning, total_return):
+    """Optimizer objective: average return scaled by sqrt(trades), so tiny samples can't win on luck"""
+    if trades < OPTIMIZER_MIN_TRADES:
+        return float('-inf')
+    return (total_return / trades) * trades ** 0.5
+
+def summarize_threshold_config(config, totals):
+    """Readable performance summary for one optimizer config"""
+    trades, winning, total_return = totals
     return {
-        'optimal_threshold': 70,
-        'reasoning': 'Best balance of trade frequency and win rate',
-        'expected_improvement': '15-25% more profitable trades',
-        'charity_impact': 'Significantly increased funding for children'
+        'confidence_threshold': config[0],
+        'min_signal_score': config[1],
+        'holding_period': config[2],
+        'total_trades': trades,
+        'win_rate': round((winning / trades) * 100, 2) if trades > 0 else 0,
+        'avg_return': round(total_return / trades, 2) if trades > 0 else 0,
+        'total_return': round(total_return, 2)
+    }
+
+def evaluate_configs_on_symbols(pool, configs, symbols, days_back, totals, deadline=None):
+    """Add each config's trades/wins/returns over `symbols` into the running totals
+    
+    Returns how many symbols were evaluated before the deadline. Every config
+    is evaluated on the same symbols, so the totals stay comparable.
+    """
+    tasks = [(symbol, days_back, configs) for symbol in symbols]
+    completed = pool.map(evaluate_threshold_configs, tasks, deadline)
+    for symbol_stats in completed:
+        for config, (trades, winning, total_return) in zip(configs, symbol_stats):
+            current = totals.get(config, (0, 0, 0))
+            totals[config] = (current[0] + trades, current[1] + winning, current[2] + total_return)
+    return len(completed)
+
+def refine_config_grid(config):
+    """Fine grid around a coarse winner"""
+    threshold, min_signal_score, holding_period = config
+    return sorted({
+        (t, m, h)
+        for t in range(max(50, threshold - 4), min(95, threshold + 4) + 1)
+        for m in (min_signal_score - 5, min_signal_score, min_signal_score + 5) if m >= 20
+        for h in (holding_period - 1, holding_period, holding_period + 1) if h >= 1
+    })
+
+def store_optimization_results(dynamodb, performance_table_name, results):
+    """Persist optimizer results to the performance table"""
+    try:
+        table = dynamodb.Table(performance_table_name)
+        from decimal import Decimal
+        item = json.loads(json.dumps(results), parse_float=Decimal)
+        item['date'] = datetime.now().strftime('%Y-%m-%d')
+        item['symbol'] = 'OPTIMIZER#confidence_thresholds'
+        table.put_item(Item=item)
+        print(f'💾 Stored optimization results in {performance_table_name}')
+        return True
+    except Exception as e:
+        print(f'❌ Error storing optimization results: {e}')
+        return False
+
+def optimize_confidence_thresholds(dynamodb, performance_table_name, days_back=365, offline=False, workers=None, time_budget=None):
+    """Optimize confidence thresholds for maximum profitability
+    
+    Searches confidence threshold, minimum |signal_score| and holding period.
+    The coarse grid is pruned by successive halving over growing slices of the
+    universe, then the winner is refined on a fine grid over the full universe.
+    Stops early (keeping the best config so far) when time_budget seconds run out;
+    the budget is checked before every symbol, so no rung runs past it. A run
+    that evaluated no symbol, or whose best config made no trade, returns
+    status 'incomplete' and stores nothing.
+    """
+    print('🎯 Optimizing confidence thresholds for maximum charity impact...')
+    
+    started = datetime.now()
+    deadline = started + timedelta(seconds=time_budget) if time_budget is not None else None
+    def out_of_time():
+        return deadline is not None and datetime.now() >= deadline
+    
+    symbols = BACKTEST_SYMBOLS
+    clear_backtest_memos()
+    if not offline:
+        prefetch_historical_data(symbols, days_back)
+    
+    configs = [
+        (t, m, h)
+        for t in OPTIMIZER_GRID['confidence_threshold']
+        for m in OPTIMIZER_GRID['min_signal_score']
+        for h in OPTIMIZER_GRID['holding_period']
+    ]
+    if BASELINE_CONFIG not in configs:
+        configs.append(BASELINE_CONFIG)
+    
+    def config_score(config):
+        return score_threshold_config(*totals.get(config, (0, 0, 0)))
+    
+    # One pool for the whole search, so every symbol's frame is computed once
+    with BacktestPool(workers) as pool:
+        # Successive halving: every rung adds symbols and keeps the best third of the configs
+        totals = {}
+        evaluated_symbols = 0
+        candidates_evaluated = len(configs)
+        rungs_completed = 0
+        for share in OPTIMIZER_RUNGS:
+            rung_end = max(1, int(round(len(symbols) * share)))
+            new_symbols = symbols[evaluated_symbols:rung_end]
+            evaluated_symbols += evaluate_configs_on_symbols(pool, configs, new_symbols, days_back, totals, deadline)
+            rungs_completed += 1
+            
+            ranked = sorted(configs, key=config_score, reverse=True)
+            print(f'🔍 Rung {rungs_completed}: {len(configs)} configs on {evaluated_symbols} symbols - leader {ranked[0]}')
+            
+            if evaluated_symbols >= len(symbols) or out_of_time():
+                break
+            configs = ranked[:max(1, int(len(ranked) * OPTIMIZER_KEEP_FRACTION))]
+            if BASELINE_CONFIG not in configs:
+                configs.append(BASELINE_CONFIG)
+        
+        # Only configs scored on the same symbols are comparable - those of the last rung
+        comparable = list(configs)
+        if evaluated_symbols >= len(symbols) and not out_of_time():
+            # Coarse-to-fine: refine around the winner on the full universe
+            fine_configs = [c for c in refine_config_grid(ranked[0]) if c not in totals]
+            fine_totals = {}
+            if evaluate_configs_on_symbols(pool, fine_configs, symbols, days_back, fine_totals, deadline) == len(symbols):
+                totals.update(fine_totals)
+                candidates_evaluated += len(fine_configs)
+                comparable.extend(fine_configs)
+    
+    clear_backtest_memos()
+    
+    comparable.sort(key=config_score, reverse=True)
+    best = comparable[0]
+    best_summary = summarize_threshold_config(best, totals.get(best, (0, 0, 0)))
+    
+    if evaluated_symbols == 0 or best_summary['total_trades'] == 0:
+        # Nothing to compare - keep the previously stored optimum rather than overwrite it
+        reason = 'no symbol evaluated before the deadline' if evaluated_symbols == 0 else 'no config produced a trade'
+        print(f'⚠️ Optimization incomplete ({reason}) - results not stored')
+        return {
+            'status': 'incomplete',
+            'reason': reason,
+            'candidates_evaluated': candidates_evaluated,
+            'rungs_completed': rungs_completed,
+            'symbols_evaluated': evaluated_symbols,
+            'completed_within_budget': not out_of_time(),
+            'optimization_seconds': round((datetime.now() - started).total_seconds(), 2)
+        }
+    
+    baseline_summary = summarize_threshold_config(BASELINE_CONFIG, totals.get(BASELINE_CONFIG, (0, 0, 0)))
+    improvement = best_summary['total_return'] - baseline_summary['total_return']
+    
+    results = {
+        'status': 'complete',
+        'optimal_threshold': best[0],
+        'optimal_min_signal_score': best[1],
+        'optimal_holding_period': best[2],
+        'optimal_performance': best_summary,
+        'baseline_performance': baseline_summary,
+        'top_candidates': [summarize_threshold_config(c, totals.get(c, (0, 0, 0))) for c in comparable[:5]],
+        'candidates_evaluated': candidates_evaluated,
+        'rungs_completed': rungs_completed,
+        'symbols_evaluated': evaluated_symbols,
+        'completed_within_budget': not out_of_time(),
+        'optimization_seconds': round((datetime.now() - started).total_seconds(), 2),
+        'reasoning': f'Best average return per trade (scaled by sqrt of trade count, min {OPTIMIZER_MIN_TRADES} trades) over {evaluated_symbols} symbols',
+        'expected_improvement': f'{improvement:+.1f}% total return vs current {BASELINE_CONFIG[0]}% threshold'
     }
+    
+    print(f'🎯 Optimal: {best[0]}% confidence, |score| >= {best[1]}, {best[2]}-day hold - {best_summary["total_return"]:.1f}% total return')
+    store_optimization_results(dynamodb, performance_table_name, results)
+    
+    return results
 
 def analyze_current_signal_performance(dynamodb, signals_table_name):
     """Analyze performance of recently generated signals"""
@@ -0,0 +1,107 @@
+"""
+💾 On-Disk OHLCV Bar Cache
+
+Persistent bar store keyed by symbol and interval. Each column is a flat
+binary file of fixed-width values (int64 epoch timestamps, float64 OHLC,
+int64 volume), so loading is a single read per column and refreshing only
+rewrites the tail it overlaps. There is one row per trading day.
+
+Layout: {root}/{interval}/{SYMBOL}/{column}.bin
+"""
+
+import os
+from array import array
+
+BAR_CACHE_DIR = os.environ.get('BAR_CACHE_DIR', '/tmp/bar-cache')
+
+# Column name -> array typecode (q = int64, d = float64)
+BAR_COLUMNS = [
+    ('timestamp', 'q'),
+    ('open', 'd'),
+    ('high', 'd'),
+    ('low', 'd'),
+    ('close', 'd'),
+    ('volume', 'q')
+]
+
+def _day(timestamp):
+    return int(timestamp) // 86400
+
+class BarStore:
+    """Columnar daily bar store on the local filesystem, appended to at the tail"""
+
+    def __init__(self, root=None):
+        self.root = root or BAR_CACHE_DIR
+
+    def _symbol_dir(self, symbol, interval):
+        return os.path.join(self.root, interval, symbol.upper())
+
+    def _column_path(self, symbol, interval, column):
+        return os.path.join(self._symbol_dir(symbol, interval), f'{column}.bin')
+
+    def load(self, symbol, interval='1d'):
+        """Load all cached columns for a symbol (empty arrays when nothing is cached)"""
+        columns = {}
+        for column, typecode in BAR_COLUMNS:
+            values = array(typecode)
+            path = self._column_path(symbol, interval, column)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    values.frombytes(f.read())
+            columns[column] = values
+
+        # An interrupted append can leave columns of different lengths - keep the complete rows
+        rows = min(len(values) for values in columns.values())
+        for column in columns:
+            del columns[column][rows:]
+        return columns
+
+    def _write(self, symbol, interval, columns, mode):
+        os.makedirs(self._symbol_dir(symbol, interval), exist_ok=True)
+        for column, typecode in BAR_COLUMNS:
+            with open(self._column_path(symbol, interval, column), mode) as f:
+                array(typecode, columns[column]).tofile(f)
+
+    def replace(self, symbol, interval, columns):
+        """Overwrite the cached series for a symbol"""
+        self._write(symbol, interval, columns, 'wb')
+
+    def merge(self, symbol, interval, columns):
+        """Merge freshly fetched rows into the cache, rewriting only the overlapping tail
+
+        Rows are keyed by trading day (the UTC day of their timestamp), so a
+        fetched bar replaces the cached bar of the same session even when it
+        carries another timestamp - Yahoo stamps a still-trading daily bar with
+        its last trade time and the settled bar with the session open. Cached
+        sessions missing from the fetch are kept.
+        Returns the number of rows appended or rewritten.
+        """
+        if not len(columns['timestamp']):
+            return 0
+
+        cached = self.load(symbol, interval)
+
+        # Cached rows before the first fetched session stay untouched on disk
+        first_day = _day(columns['timestamp'][0])
+        keep = len(cached['timestamp'])
+        while keep and _day(cached['timestamp'][keep - 1]) >= first_day:
+            keep -= 1
+
+        rows = {}
+        for source, start in ((cached, keep), (columns, 0)):
+            for i in range(start, len(source['timestamp'])):
+                rows[_day(source['timestamp'][i])] = [source[column][i] for column, _ in BAR_COLUMNS]
+        days = sorted(rows)
+        tail = {column: [rows[day][j] for day in days] for j, (column, _) in enumerate(BAR_COLUMNS)}
+
+        if keep == 0:
+            self.replace(symbol, interval, tail)
+            return len(days)
+
+        if keep < len(cached['timestamp']):
+            for column, typecode in BAR_COLUMNS:
+                with open(self._column_path(symbol, interval, column), 'r+b') as f:
+                    f.truncate(keep * array(typecode).itemsize)
+
+        self._write(symbol, interval, tail, 'ab')
+        return len(days)
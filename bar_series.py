@@ -0,0 +1,176 @@
+"""
+📏 Columnar Bar Series
+
+BarSeries holds OHLCV bars as parallel fixed-width columns (int64 epoch
+timestamps, float64 OHLC, int64 volume) - the same layout BarStore keeps
+on disk - instead of one dict per bar. A bar costs 48 bytes rather than a
+few hundred, and slicing returns a view over the same buffers, so the
+scan's 50-bar windows and the replay's per-bar windows never copy.
+
+It still behaves like the list of bar dicts the analysis code was written
+for: len(), series[-1]['close'], iteration and slicing all work, with each
+bar dict built on access. Hot paths read whole columns instead, through
+bar_column() / bar_values(), which accept either representation.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+from bar_cache import BAR_COLUMNS
+
+COLUMN_NAMES = [column for column, _ in BAR_COLUMNS]
+
+# Buffer formats accepted without a copy, per array typecode (NumPy int64 is 'l' on 64-bit Linux)
+_FORMATS = {'q': ('q', 'l'), 'd': ('d',)}
+
+def _column_view(values, typecode):
+    """1-D memoryview of `values` in `typecode`, zero-copy when the buffer already matches"""
+    try:
+        view = memoryview(values)
+    except TypeError:
+        view = None
+
+    if view is not None and view.ndim == 1 and view.format in _FORMATS[typecode] and view.itemsize == 8:
+        if view.format == typecode:
+            return view
+        if view.c_contiguous:
+            return view.cast('B').cast(typecode)
+
+    try:
+        return memoryview(array(typecode, values))
+    except TypeError:
+        # Integer columns given as floats (volume from some feeds)
+        return memoryview(array(typecode, (int(value) for value in values)))
+
+class BarSeries:
+    """Parallel OHLCV columns with zero-copy slicing"""
+
+    __slots__ = COLUMN_NAMES
+
+    def __init__(self, columns):
+        """Wrap a dict of columns (BarStore arrays, lists, NumPy arrays or memoryviews)"""
+        for column, typecode in BAR_COLUMNS:
+            setattr(self, column, _column_view(columns[column], typecode))
+
+        if len({len(getattr(self, column)) for column in COLUMN_NAMES}) > 1:
+            raise ValueError('BarSeries columns must all have the same length')
+
+    @classmethod
+    def from_bars(cls, bars):
+        """Build from bar dicts; the timestamp comes from 'timestamp' or a datetime 'date' (0 if neither)"""
+        columns = {column: array(typecode) for column, typecode in BAR_COLUMNS}
+        for bar in bars:
+            if 'timestamp' in bar:
+                timestamp = int(bar['timestamp'])
+            elif 'date' in bar:
+                timestamp = int(bar['date'].timestamp())
+            else:
+                timestamp = 0
+            columns['timestamp'].append(timestamp)
+            columns['open'].append(bar['open'])
+            columns['high'].append(bar['high'])
+            columns['low'].append(bar['low'])
+            columns['close'].append(bar['close'])
+            columns['volume'].append(int(bar['volume']))
+        return cls(columns)
+
+    @classmethod
+    def _view(cls, columns):
+        series = cls.__new__(cls)
+        for column in COLUMN_NAMES:
+            setattr(series, column, columns[column])
+        return series
+
+    def __len__(self):
+        return len(self.close)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return BarSeries._view({column: getattr(self, column)[index] for column in COLUMN_NAMES})
+
+        timestamp = self.timestamp[index]
+        return {
+            'date': datetime.fromtimestamp(timestamp),
+            'timestamp': timestamp,
+            'open': self.open[index],
+            'high': self.high[index],
+            'low': self.low[index],
+            'close': self.close[index],
+            'volume': self.volume[index]
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return f'<BarSeries {len(self)} bars>'
+
+    def __reduce__(self):
+        # memoryviews don't pickle - ship compact copies of the viewed columns
+        return BarSeries, ({column: self._copy(column, typecode) for column, typecode in BAR_COLUMNS},)
+
+    def _copy(self, column, typecode):
+        values = array(typecode)
+        values.frombytes(getattr(self, column).tobytes())
+        return values
+
+    @property
+    def nbytes(self):
+        """Bytes viewed by this series (shared with any series it was sliced from)"""
+        return sum(getattr(self, column).nbytes for column in COLUMN_NAMES)
+
+    def column(self, name):
+        """Zero-copy view of one column"""
+        return getattr(self, name)
+
+    def to_numpy(self, name):
+        """Zero-copy NumPy array over one column"""
+        import numpy as np
+        return np.asarray(getattr(self, name))
+
+    def dates(self):
+        """Bar timestamps as naive local datetimes, like the historical bar dicts' 'date'"""
+        return [datetime.fromtimestamp(timestamp) for timestamp in self.timestamp]
+
+    def between(self, start_timestamp, end_timestamp):
+        """View of the bars with start <= timestamp <= end (timestamps are ascending)"""
+        timestamps = self.timestamp
+        return self[bisect_left(timestamps, start_timestamp):bisect_right(timestamps, end_timestamp)]
+
+    def with_bar(self, bar):
+        """New series with one more bar appended (copies - used for today's partial bar)"""
+        columns = {}
+        for column, typecode in BAR_COLUMNS:
+            values = self._copy(column, typecode)
+            if column == 'timestamp':
+                values.append(int(bar.get('timestamp', 0)))
+            elif column == 'volume':
+                values.append(int(bar['volume']))
+            else:
+                values.append(bar[column])
+            columns[column] = values
+        return BarSeries(columns)
+
+def as_bar_series(data):
+    """`data` as a BarSeries - returned as is when it already is one"""
+    return data if isinstance(data, BarSeries) else BarSeries.from_bars(data)
+
+def bar_values(data, name):
+    """One column of a BarSeries or list of bar dicts, without copying a BarSeries"""
+    if isinstance(data, BarSeries):
+        return getattr(data, name)
+    return [bar[name] for bar in data]
+
+def bar_column(data, name):
+    """One column of a BarSeries or list of bar dicts as a Python list"""
+    if isinstance(data, BarSeries):
+        return getattr(data, name).tolist()
+    return [bar[name] for bar in data]
+
+def bar_dates(data):
+    """Bar dates (datetimes) of a BarSeries or list of historical bar dicts"""
+    if isinstance(data, BarSeries):
+        return data.dates()
+    return [bar['date'] for bar in data]
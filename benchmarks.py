@@ -0,0 +1,282 @@
+"""
+⏱️ Hot-Path Benchmarks
+
+Times the indicator, scoring and storage hot paths on synthetic OHLCV data
+at several history lengths and universe sizes, writes the results to JSON
+and compares them with a stored baseline to flag regressions.
+
+    python benchmarks.py                      # run, write benchmark-results.json, compare
+    python benchmarks.py --save-baseline      # run and store as the new baseline
+    python benchmarks.py --quick              # smaller sizes, for a fast check
+
+Handler import times are measured too, each in a fresh interpreter, as
+the part of a Lambda cold start the code controls: import[module] is the
+module import alone, cold_start[module] adds the first invocation's AWS
+client setup. Each records which heavy dependencies the import pulled in,
+and a handler import that loads a module deferred to first use
+(DEFERRED_MODULES) fails the run.
+
+Timings are hardware specific - keep the baseline from the machine the
+comparisons run on.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+from backtesting_engine import calculate_all_indicators, calculate_rsi_historical, simulate_ml_signals_historical
+from bar_series import BarSeries
+from dynamo_codec import encode_signal
+from indicator_engine import numpy_available
+from real_lambda_function import calculate_enhanced_indicators, convert_floats_to_decimal, ml_enhanced_analysis_with_sentiment
+from replay_engine import DeterministicSentiment
+
+RESULTS_FILE = 'benchmark-results.json'
+BASELINE_FILE = 'benchmark-baseline.json'
+
+# A benchmark slower than baseline by more than this fraction is a regression
+REGRESSION_TOLERANCE = 0.25
+
+HISTORY_LENGTHS = [250, 1000, 2500]
+UNIVERSE_SIZES = [29, 500, 2000]
+QUICK_HISTORY_LENGTHS = [250]
+QUICK_UNIVERSE_SIZES = [29]
+
+# Lambda handler modules, in the order of their cold-start impact
+HANDLER_MODULES = ['real_lambda_function', 'sharded_scan', 'intraday_ingest', 'signal_query', 'backtesting_engine', 'lambda_function']
+QUICK_HANDLER_MODULES = ['real_lambda_function']
+
+# Dependencies that dominate a cold start when a handler imports them eagerly
+HEAVY_MODULES = ['boto3', 'botocore', 'numpy', 'alpaca_trade_api']
+
+# Standard-library modules the handlers defer to first use - a plain handler
+# import that loads one of them fails the run
+DEFERRED_MODULES = ['statistics', 'decimal']
+
+# What a handler's first invocation sets up besides the import
+CLIENT_SETUP = "from aws_clients import get_client, get_table; get_table(); get_client('sns')"
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+{setup}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'seconds': elapsed, 'heavy': [name for name in {heavy!r} if name in sys.modules], 'deferred': [name for name in {deferred!r} if name in sys.modules]}}))
+"""
+
+def synthetic_bars(count, seed=0, start=datetime(2020, 1, 1), volatility=0.02):
+    """Random-walk daily OHLCV bars with a datetime `date`, reproducible per seed"""
+    rng = random.Random(seed)
+    price = 100.0
+    bars = []
+    for i in range(count):
+        open_price = price
+        price = max(1.0, price * math.exp(rng.gauss(0, volatility)))
+        bars.append({
+            'date': start + timedelta(days=i),
+            'open': open_price,
+            'high': max(open_price, price) * (1 + abs(rng.gauss(0, volatility / 2))),
+            'low': min(open_price, price) * (1 - abs(rng.gauss(0, volatility / 2))),
+            'close': price,
+            'volume': rng.randint(100000, 20000000)
+        })
+    return bars
+
+def synthetic_universe(size, count=50):
+    """`size` symbols of `count` bars each - the live scan's window shape"""
+    return {f'SYM{i:04d}': synthetic_bars(count, seed=i) for i in range(size)}
+
+def measure(func, repeat=5):
+    """Best and median seconds per call, each sample looping for at least 0.2s"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    samples = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {'best_s': min(samples), 'median_s': statistics.median(samples), 'loops': number}
+
+def measure_import(module, setup='', repeat=5):
+    """Best and median seconds to import a module in a fresh interpreter, and the heavy and deferred modules loaded"""
+    probe = IMPORT_PROBE.format(module=module, setup=setup, heavy=HEAVY_MODULES, deferred=DEFERRED_MODULES)
+    env = dict(os.environ)
+    # Creating clients only needs a region, never credentials or network
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+    samples = []
+    heavy = []
+    deferred = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-c', probe],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=env
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f'exit {completed.returncode}')
+        sample = json.loads(completed.stdout.strip().splitlines()[-1])
+        samples.append(sample['seconds'])
+        heavy = sample['heavy']
+        deferred = sample['deferred']
+
+    return {'best_s': min(samples), 'median_s': statistics.median(samples), 'loops': 1, 'heavy_imports': heavy, 'deferred_imports': deferred}
+
+def import_benchmarks(modules, repeat=5):
+    """import[module] and cold_start[module] results for each handler module"""
+    results = {}
+    for module in modules:
+        for name, setup in ((f'import[{module}]', ''), (f'cold_start[{module}]', CLIENT_SETUP)):
+            try:
+                results[name] = dict(measure_import(module, setup, repeat), params={'module': module})
+            except RuntimeError as e:
+                print(f'⚠️ Skipping {name}: {e}')
+                continue
+            print(f'⏱️ {name}: {results[name]["best_s"] * 1000:.1f}ms (heavy: {", ".join(results[name]["heavy_imports"]) or "none"})')
+    return results
+
+def deferred_import_violations(results):
+    """import[module] results that loaded a DEFERRED_MODULES entry (client setup may load them legitimately)"""
+    return {
+        name: result['deferred_imports']
+        for name, result in results.items()
+        if name.startswith('import[') and result.get('deferred_imports')
+    }
+
+def benchmark_cases(history_lengths, universe_sizes):
+    """(name, params, callable) for every benchmark"""
+    cases = []
+
+    for length in history_lengths:
+        bars = synthetic_bars(length)
+        closes = [bar['close'] for bar in bars]
+        indicators = calculate_all_indicators(bars)
+        params = {'bars': length}
+        series = BarSeries.from_bars(bars)
+        cases.append((f'calculate_all_indicators[bars={length}]', params, lambda bars=bars: calculate_all_indicators(bars)))
+        cases.append((f'calculate_all_indicators[bars={length},series]', params, lambda series=series: calculate_all_indicators(series)))
+        cases.append((f'calculate_rsi_historical[bars={length}]', params, lambda closes=closes: calculate_rsi_historical(closes)))
+        cases.append((f'simulate_ml_signals_historical[bars={length}]', params, lambda indicators=indicators: simulate_ml_signals_historical(indicators)))
+
+    sentiment = DeterministicSentiment()
+    now = datetime(2024, 1, 2, 15, 30)
+    for size in universe_sizes:
+        universe = synthetic_universe(size)
+        params = {'symbols': size}
+        inputs = [
+            (symbol, bars, calculate_enhanced_indicators(bars), sentiment(symbol, now))
+            for symbol, bars in universe.items()
+        ]
+        signals = [signal for signal in (ml_enhanced_analysis_with_sentiment(*args, now=now) for args in inputs) if signal]
+
+        def scan_indicators(universe=universe):
+            for bars in universe.values():
+                calculate_enhanced_indicators(bars)
+
+        def scan_analysis(inputs=inputs):
+            for args in inputs:
+                ml_enhanced_analysis_with_sentiment(*args, now=now)
+
+        def convert_signals(signals=signals):
+            for signal in signals:
+                convert_floats_to_decimal(signal)
+
+        def encode_signals(signals=signals):
+            for signal in signals:
+                encode_signal(signal)
+
+        cases.append((f'calculate_enhanced_indicators[symbols={size}]', params, scan_indicators))
+        cases.append((f'ml_enhanced_analysis_with_sentiment[symbols={size}]', params, scan_analysis))
+        cases.append((f'convert_floats_to_decimal[symbols={size}]', dict(params, signals=len(signals)), convert_signals))
+        cases.append((f'encode_signal[symbols={size}]', dict(params, signals=len(signals)), encode_signals))
+
+    return cases
+
+def run_benchmarks(quick=False, repeat=5):
+    """Run every benchmark and return the results document"""
+    history_lengths = QUICK_HISTORY_LENGTHS if quick else HISTORY_LENGTHS
+    universe_sizes = QUICK_UNIVERSE_SIZES if quick else UNIVERSE_SIZES
+    handler_modules = QUICK_HANDLER_MODULES if quick else HANDLER_MODULES
+
+    results = import_benchmarks(handler_modules, repeat)
+    for name, params, func in benchmark_cases(history_lengths, universe_sizes):
+        results[name] = dict(measure(func, repeat), params=params)
+        print(f'⏱️ {name}: {results[name]["best_s"] * 1000:.3f}ms')
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': numpy_available(),
+            'quick': quick
+        },
+        'results': results
+    }
+
+def compare_to_baseline(current, baseline, tolerance=REGRESSION_TOLERANCE):
+    """Per-benchmark ratio to baseline (best times); regressions exceed 1 + tolerance"""
+    comparison = {}
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if not reference or reference['best_s'] <= 0:
+            continue
+        ratio = result['best_s'] / reference['best_s']
+        comparison[name] = {
+            'baseline_s': reference['best_s'],
+            'current_s': result['best_s'],
+            'ratio': round(ratio, 3),
+            'regression': ratio > 1 + tolerance
+        }
+    return comparison
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the trading engine hot paths')
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--quick', action='store_true')
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.quick, args.repeat)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f'💾 Baseline saved to {args.baseline}')
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = None
+        print(f'📭 No baseline at {args.baseline} - run with --save-baseline to create one')
+
+    if baseline:
+        current['comparison'] = compare_to_baseline(current, baseline, args.tolerance)
+        for name, entry in current['comparison'].items():
+            marker = '❌ REGRESSION' if entry['regression'] else '✅'
+            print(f'{marker} {name}: {entry["ratio"]:.2f}x baseline')
+
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+    print(f'📊 Results written to {args.output}')
+
+    regressions = [name for name, entry in current.get('comparison', {}).items() if entry['regression']]
+    violations = deferred_import_violations(current['results'])
+    for name, modules in violations.items():
+        print(f'❌ {name} loaded deferred modules: {", ".join(modules)}')
+    return 1 if regressions or violations else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
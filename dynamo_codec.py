@@ -0,0 +1,249 @@
+"""
+⚡ DynamoDB Record Codec
+
+Schema-driven encoders for signal and trade records. Each record type has a
+known field layout, so encoding is a single pass over fixed fields: floats
+are quantized to their field's precision in one formatting step and nested
+structures are handled by precomputed sub-encoders instead of re-walking
+every value recursively. Decoders turn stored items back into floats.
+
+Fields outside the schema still go through the generic recursive conversion,
+so new signal attributes keep working before their schema entry is added.
+
+decimal is imported on first encode or decode rather than at module load,
+so handler modules that import the codec don't pay for it at cold start.
+
+DynamoDB rejects NaN and infinity (and with them the whole batch), so
+non-finite floats are stored as null.
+"""
+
+from math import isfinite
+
+def _generic_encode(value):
+    """Recursive float -> Decimal fallback for fields without a schema entry"""
+    from decimal import Decimal
+    if isinstance(value, float):
+        return Decimal(str(value)) if isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _generic_encode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_generic_encode(item) for item in value]
+    return value
+
+def _generic_decode(value):
+    """Recursive Decimal -> int/float for fields without a schema entry"""
+    from decimal import Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {key: _generic_decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_generic_decode(item) for item in value]
+    return value
+
+def fixed(places):
+    """Field spec: float quantized to `places` decimals"""
+    return ('fixed', places)
+
+def integer():
+    """Field spec: whole number (mentions, shares, epoch seconds)"""
+    return ('integer', None)
+
+def passthrough():
+    """Field spec: strings, booleans and lists of strings are stored as-is"""
+    return ('passthrough', None)
+
+def record(schema):
+    """Field spec: nested record with its own schema"""
+    return ('record', RecordCodec(schema))
+
+def _field_encoder(kind, arg):
+    """Converter for one typed field (None for passthrough fields)"""
+    from decimal import Decimal
+    if kind == 'fixed':
+        # Quantize in one formatting step instead of round() + str()
+        template = f'%.{arg}f'
+        return lambda value: Decimal(template % value) if isfinite(value) else None
+    if kind == 'integer':
+        return int
+    if kind == 'record':
+        return arg.encode
+    return None
+
+def _field_decoder(kind, arg):
+    if kind == 'fixed':
+        return float
+    if kind == 'integer':
+        return int
+    if kind == 'record':
+        return arg.decode
+    return None
+
+class RecordCodec:
+    """Precomputed encoder/decoder tables for one record type
+
+    Passthrough fields are carried over by one shallow dict copy, every typed
+    field is converted by its (field, converter) table entry, and only keys
+    unknown to the schema fall back to the generic recursive walk.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.known_fields = frozenset(schema)
+        # Built on first encode - the converters bind Decimal
+        self.encoders = None
+        self.decoders = {field: _field_decoder(*spec) for field, spec in schema.items()}
+
+    def _build_encoders(self):
+        encoders = []
+        for field, spec in self.schema.items():
+            encoder = _field_encoder(*spec)
+            if encoder is not None:
+                encoders.append((field, encoder))
+        self.encoders = encoders
+        return encoders
+
+    def encode(self, item):
+        """Record -> DynamoDB item with Decimal numbers"""
+        encoders = self.encoders if self.encoders is not None else self._build_encoders()
+        encoded = dict(item)
+        for field in item.keys() - self.known_fields:
+            encoded[field] = _generic_encode(item[field])
+        for field, encoder in encoders:
+            value = item.get(field)
+            if value is not None:
+                encoded[field] = encoder(value)
+        return encoded
+
+    def decode(self, item):
+        """Stored DynamoDB item -> record with native floats"""
+        decoded = {}
+        for field, value in item.items():
+            if field not in self.decoders:
+                decoded[field] = _generic_decode(value)
+                continue
+            decoder = self.decoders[field]
+            decoded[field] = decoder(value) if decoder is not None and value is not None else value
+        return decoded
+
+# Precision matches the rounding applied by ml_enhanced_analysis_with_sentiment
+SIGNAL_SCHEMA = {
+    'symbol': passthrough(),
+    'signal_type': passthrough(),
+    'confidence': fixed(1),
+    'price': fixed(2),
+    'timestamp': passthrough(),
+    'date_bucket': passthrough(),
+    'reasons': passthrough(),
+    'technical_data': record({
+        'rsi': fixed(1),
+        'volume_ratio': fixed(2),
+        'momentum_5': fixed(2),
+        'sma_20': fixed(2),
+        'signal_score': fixed(2),
+        'confidence_multiplier': fixed(2),
+        'profit_potential': fixed(1)
+    }),
+    'sentiment_data': record({
+        'overall_sentiment': fixed(3),
+        'reddit_mentions': integer(),
+        'reddit_sentiment': fixed(3),
+        'news_articles': integer(),
+        'news_sentiment': fixed(3),
+        'trending': passthrough(),
+        'sentiment_boost': fixed(1)
+    }),
+    'ttl': integer(),
+    'execution_status': passthrough(),
+    'market_open_at_creation': passthrough(),
+    'ml_enhanced': passthrough(),
+    'sentiment_enhanced': passthrough(),
+    'enhancement_version': passthrough(),
+    'trading_enabled': passthrough()
+}
+
+# Executed paper trades (see execute_paper_trades)
+TRADE_SCHEMA = {
+    'symbol': passthrough(),
+    'action': passthrough(),
+    'shares': integer(),
+    'price': fixed(2),
+    'confidence': fixed(1),
+    'order_id': passthrough(),
+    'estimated_value': fixed(2),
+    'profit_potential': fixed(1),
+    'sentiment_boost': fixed(1),
+    'timestamp': passthrough()
+}
+
+# Materialized latest-state item (see signal_snapshot.py) - its signals, portfolio
+# and scan_stats maps are free-form and go through the generic conversion
+SNAPSHOT_SCHEMA = {
+    'symbol': passthrough(),
+    'timestamp': passthrough(),
+    'version': integer(),
+    'generated_at': passthrough()
+}
+
+SIGNAL_CODEC = RecordCodec(SIGNAL_SCHEMA)
+TRADE_CODEC = RecordCodec(TRADE_SCHEMA)
+SNAPSHOT_CODEC = RecordCodec(SNAPSHOT_SCHEMA)
+
+encode_signal = SIGNAL_CODEC.encode
+decode_signal = SIGNAL_CODEC.decode
+encode_trade = TRADE_CODEC.encode
+decode_trade = TRADE_CODEC.decode
+encode_snapshot = SNAPSHOT_CODEC.encode
+decode_snapshot = SNAPSHOT_CODEC.decode
+
+def benchmark_signal_encoding(iterations=20000):
+    """Micro-benchmark: per-item cost of encode_signal vs convert_floats_to_decimal"""
+    import timeit
+    from real_lambda_function import convert_floats_to_decimal
+
+    signal = {
+        'symbol': 'AAPL',
+        'signal_type': 'BUY',
+        'confidence': 87.4,
+        'price': 189.23,
+        'timestamp': '2024-01-02T15:30:00.000000',
+        'reasons': ['Above 5-day trend ($187.10)', 'Oversold conditions (RSI: 31.2)', 'Positive sentiment (0.31)'],
+        'technical_data': {
+            'rsi': 31.2,
+            'volume_ratio': 1.84,
+            'momentum_5': 2.31,
+            'sma_20': 185.02,
+            'signal_score': 93.60000000000001,
+            'confidence_multiplier': 1.45,
+            'profit_potential': 12.7
+        },
+        'sentiment_data': {
+            'overall_sentiment': 0.312,
+            'reddit_mentions': 27,
+            'reddit_sentiment': 0.402,
+            'news_articles': 8,
+            'news_sentiment': 0.252,
+            'trending': True,
+            'sentiment_boost': 1.6
+        },
+        'ttl': 1704813000,
+        'execution_status': 'ready',
+        'market_open_at_creation': True,
+        'ml_enhanced': True,
+        'sentiment_enhanced': True,
+        'enhancement_version': '2.1',
+        'trading_enabled': False
+    }
+
+    generic_us = timeit.timeit(lambda: convert_floats_to_decimal(signal), number=iterations) / iterations * 1e6
+    codec_us = timeit.timeit(lambda: encode_signal(signal), number=iterations) / iterations * 1e6
+
+    return {
+        'iterations': iterations,
+        'convert_floats_to_decimal_us': round(generic_us, 2),
+        'encode_signal_us': round(codec_us, 2),
+        'speedup': round(generic_us / codec_us, 2) if codec_us > 0 else None
+    }
+
+if __name__ == '__main__':
+    print(benchmark_signal_encoding())
@@ -0,0 +1,152 @@
+"""
+🌐 Pooled HTTP Client
+
+Module-level keep-alive connection pool for market data requests. One SSL
+context is created per container and connections are reused per host, so
+warm Lambda invocations skip the TCP and TLS handshakes entirely. Requests
+accept gzip and are retried with backoff on connection errors, 429 and 5xx.
+"""
+
+import gzip
+import http.client
+import json
+import os
+import ssl
+import threading
+import time
+import urllib.parse
+
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', '10'))
+HTTP_MAX_RETRIES = int(os.environ.get('HTTP_MAX_RETRIES', '2'))
+HTTP_TIMEOUT = float(os.environ.get('HTTP_TIMEOUT', '10'))
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json',
+    'Accept-Encoding': 'gzip',
+    'Connection': 'keep-alive'
+}
+
+# Statuses worth retrying - rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class HTTPRequestError(Exception):
+    """Non-success HTTP response"""
+
+    def __init__(self, status, url):
+        super().__init__(f'HTTP {status} for {url}')
+        self.status = status
+        self.url = url
+
+class PooledHTTPClient:
+    """Thread-safe keep-alive HTTPS client with a per-host connection pool"""
+
+    def __init__(self, pool_size=None, max_retries=None, timeout=None, backoff=0.25):
+        self.pool_size = pool_size or HTTP_POOL_SIZE
+        self.max_retries = HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.timeout = timeout or HTTP_TIMEOUT
+        self.backoff = backoff
+        self.ssl_context = ssl.create_default_context()
+
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'connections_opened': 0, 'connections_reused': 0, 'retries': 0}
+
+    def _count(self, stat):
+        # Requests run on many fetch threads - += on a shared dict is not atomic
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _checkout(self, host, timeout):
+        with self._lock:
+            idle = self._idle.get(host)
+            if idle:
+                self.stats['connections_reused'] += 1
+                connection = idle.pop()
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection
+            self.stats['connections_opened'] += 1
+        return http.client.HTTPSConnection(host, timeout=timeout, context=self.ssl_context)
+
+    def _checkin(self, host, connection):
+        with self._lock:
+            idle = self._idle.setdefault(host, [])
+            if len(idle) < self.pool_size:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def request(self, url, headers=None, timeout=None):
+        """GET a URL and return the (decompressed) response body as bytes"""
+        parsed = urllib.parse.urlsplit(url)
+        path = parsed.path + (f'?{parsed.query}' if parsed.query else '')
+        request_headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        timeout = timeout or self.timeout
+
+        attempt = 0
+        while True:
+            connection = self._checkout(parsed.netloc, timeout)
+            try:
+                self._count('requests')
+                connection.request('GET', path, headers=request_headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                self._count('retries')
+                # A pooled connection the server already closed fails fast - retry it immediately
+                if attempt > 1:
+                    time.sleep(self.backoff * 2 ** (attempt - 1))
+                continue
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(parsed.netloc, connection)
+
+            if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                attempt += 1
+                self._count('retries')
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+                continue
+
+            if response.status >= 400:
+                raise HTTPRequestError(response.status, url)
+
+            if response.getheader('Content-Encoding', '').lower() == 'gzip':
+                body = gzip.decompress(body)
+            return body
+
+    def get_json(self, url, headers=None, timeout=None):
+        """GET a URL and decode the JSON body"""
+        return json.loads(self.request(url, headers, timeout).decode())
+
+    def close(self):
+        """Close every idle pooled connection"""
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+# Shared across warm Lambda invocations of this container
+_client = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    """Module-level pooled client, created on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PooledHTTPClient()
+    return _client
+
+def get_json(url, headers=None, timeout=None):
+    """GET JSON through the shared pooled client"""
+    return get_http_client().get_json(url, headers, timeout)
@@ -0,0 +1,106 @@
+"""
+📈 Incremental RSI
+
+Keeps running gain/loss state so each new close updates RSI in constant
+time. Shared by the backtester and the live Lambda indicator path.
+
+Modes:
+- 'simple': average of the last `period` gains/losses - reproduces the
+  existing calculate_rsi / calculate_rsi_historical values exactly
+- 'wilder': Wilder's smoothing, seeded with the first simple average
+"""
+
+from collections import deque
+
+RSI_MODES = ('simple', 'wilder')
+
+class IncrementalRSI:
+    """Running RSI state updated one close at a time"""
+
+    def __init__(self, period=14, mode='simple'):
+        if mode not in RSI_MODES:
+            raise ValueError(f'Unknown RSI mode: {mode} (expected one of {RSI_MODES})')
+
+        self.period = period
+        self.mode = mode
+        self.prev_close = None
+        self.deltas_seen = 0
+
+        # Simple mode: the trailing window of gains/losses
+        self.gains = deque(maxlen=period)
+        self.losses = deque(maxlen=period)
+
+        # Wilder mode: smoothed averages
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def copy(self):
+        """Independent copy of the current state"""
+        clone = IncrementalRSI(self.period, self.mode)
+        clone.prev_close = self.prev_close
+        clone.deltas_seen = self.deltas_seen
+        clone.gains = deque(self.gains, maxlen=self.period)
+        clone.losses = deque(self.losses, maxlen=self.period)
+        clone.avg_gain = self.avg_gain
+        clone.avg_loss = self.avg_loss
+        return clone
+
+    def update(self, close):
+        """Add a new close and return the updated RSI"""
+        if self.prev_close is not None:
+            delta = close - self.prev_close
+            gain = delta if delta > 0 else 0
+            loss = -delta if delta < 0 else 0
+            self.deltas_seen += 1
+
+            if self.mode == 'simple':
+                self.gains.append(gain)
+                self.losses.append(loss)
+            elif self.deltas_seen <= self.period:
+                # Wilder seed: accumulate the first simple average
+                self.gains.append(gain)
+                self.losses.append(loss)
+                if self.deltas_seen == self.period:
+                    self.avg_gain = sum(self.gains) / self.period
+                    self.avg_loss = sum(self.losses) / self.period
+            else:
+                self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+                self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        self.prev_close = close
+        return self.value
+
+    def peek(self, close):
+        """RSI if `close` were the next bar, without changing the state"""
+        return self.copy().update(close)
+
+    @property
+    def value(self):
+        """Current RSI (50 until `period` deltas have been seen)"""
+        if self.deltas_seen < self.period:
+            return 50
+
+        if self.mode == 'simple':
+            # Summing the fixed-size window keeps results bit-identical to the list version
+            avg_gain = sum(self.gains) / self.period
+            avg_loss = sum(self.losses) / self.period
+        else:
+            avg_gain = self.avg_gain
+            avg_loss = self.avg_loss
+
+        if avg_loss == 0:
+            return 100
+
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+def rsi_from_closes(closes, period=14, mode='simple'):
+    """One-shot RSI over a list of closes using the incremental state"""
+    if mode == 'simple':
+        # Only the last `period` deltas matter for the simple average
+        closes = closes[-(period + 1):]
+
+    state = IncrementalRSI(period, mode)
+    for close in closes:
+        state.update(close)
+    return state.value
@@ -0,0 +1,230 @@
+"""
+📐 Columnar Indicator Engine
+
+Computes every backtest indicator column in one vectorized pass over the
+full price history instead of re-slicing a 51-bar window for every bar.
+Values match the per-bar definitions in backtesting_engine.calculate_all_indicators.
+
+LiveIndicatorState does the same for the live scan's 50-bar window, keeping
+the completed-bar aggregates so only today's bar has to be folded in.
+"""
+
+from bar_series import bar_column, bar_dates, bar_values
+from incremental_rsi import IncrementalRSI
+
+# Bars of history required before the first indicator row (same as the backtester)
+WARMUP_BARS = 50
+
+# Column order of each indicator record (matches calculate_all_indicators)
+INDICATOR_KEYS = [
+    'rsi', 'sma_5', 'sma_10', 'sma_20', 'sma_50',
+    'momentum_3', 'momentum_5', 'momentum_10',
+    'volume_ratio', 'volatility_10', 'volatility_20',
+    'price_position', 'macd'
+]
+
+# numpy is imported on first vectorized use - the live scan never needs it
+np = None
+sliding_window_view = None
+_numpy_checked = False
+
+def _load_numpy():
+    global np, sliding_window_view, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+            from numpy.lib.stride_tricks import sliding_window_view as window_view
+            np, sliding_window_view = numpy, window_view
+        except ImportError:  # numpy is optional - callers fall back to the per-bar loop
+            pass
+        _numpy_checked = True
+    return np
+
+def numpy_available():
+    """Check whether the vectorized engine can run in this environment"""
+    return _load_numpy() is not None
+
+def _rolling(values, window, reducer, **kwargs):
+    """Apply a reducer over trailing windows, aligned so index i covers bars i-window+1..i"""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        windows = sliding_window_view(values, window)
+        out[window - 1:] = getattr(windows, reducer)(axis=1, **kwargs)
+    return out
+
+def _momentum(closes, lag):
+    """Percent change versus the close `lag` bars ago"""
+    out = np.full(len(closes), np.nan)
+    if len(closes) > lag:
+        out[lag:] = (closes[lag:] - closes[:-lag]) / closes[:-lag] * 100
+    return out
+
+def _rsi(closes, period=14, mode='simple'):
+    """RSI ending at each bar - vectorized for the simple average, incremental for Wilder"""
+    out = np.full(len(closes), np.nan)
+    if len(closes) < period + 1:
+        return out
+
+    if mode != 'simple':
+        # Wilder smoothing is recursive, so walk the incremental state once
+        state = IncrementalRSI(period, mode)
+        values = [state.update(close) for close in closes.tolist()]
+        out[period:] = values[period:]
+        return out
+
+    deltas = np.diff(closes)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+
+    avg_gain = sliding_window_view(gains, period).sum(axis=1) / period
+    avg_loss = sliding_window_view(losses, period).sum(axis=1) / period
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    out[period:] = np.where(avg_loss == 0, 100.0, rsi)
+    return out
+
+def compute_indicator_columns(closes, highs, lows, volumes, rsi_mode='simple'):
+    """Compute all indicator columns for a full history; warm-up rows are NaN"""
+    _load_numpy()
+    closes = np.asarray(closes, dtype=np.float64)
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+
+    columns = {
+        'rsi': _rsi(closes, mode=rsi_mode),
+        'sma_5': _rolling(closes, 5, 'mean'),
+        'sma_10': _rolling(closes, 10, 'mean'),
+        'sma_20': _rolling(closes, 20, 'mean'),
+        'sma_50': _rolling(closes, 50, 'mean'),
+        'momentum_3': _momentum(closes, 3),
+        'momentum_5': _momentum(closes, 5),
+        'momentum_10': _momentum(closes, 10),
+        'volatility_10': _rolling(closes, 10, 'std', ddof=1),
+        'volatility_20': _rolling(closes, 20, 'std', ddof=1)
+    }
+
+    # Volume ratio versus the 10-day average (1 when there is no volume)
+    avg_volume_10 = _rolling(volumes, 10, 'mean')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_ratio = volumes / avg_volume_10
+    columns['volume_ratio'] = np.where(avg_volume_10 > 0, volume_ratio, np.where(np.isnan(avg_volume_10), np.nan, 1.0))
+
+    # Position within the 20-day high/low range (0.5 for a flat range)
+    recent_high = _rolling(highs, 20, 'max')
+    recent_low = _rolling(lows, 20, 'min')
+    price_range = recent_high - recent_low
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_position = (closes - recent_low) / price_range
+    columns['price_position'] = np.where(price_range != 0, price_position, np.where(np.isnan(price_range), np.nan, 0.5))
+    columns['recent_high'] = recent_high
+    columns['recent_low'] = recent_low
+
+    # Simplified MACD: latest close versus the 26-day average
+    columns['macd'] = closes - _rolling(closes, 26, 'mean')
+
+    return columns
+
+def calculate_indicator_records(data, rsi_mode='simple'):
+    """Vectorized equivalent of calculate_all_indicators - one record per bar after warm-up
+
+    `data` is a BarSeries (columns are handed to numpy without copying) or a list of bar dicts.
+    """
+    if not data or len(data) < WARMUP_BARS:
+        return []
+
+    columns = compute_indicator_columns(
+        bar_values(data, 'close'),
+        bar_values(data, 'high'),
+        bar_values(data, 'low'),
+        bar_values(data, 'volume'),
+        rsi_mode
+    )
+
+    # Convert each column once to Python floats rather than per-cell numpy scalars
+    column_lists = [(key, columns[key][WARMUP_BARS:].tolist()) for key in INDICATOR_KEYS]
+    bar_lists = [(key, bar_column(data[WARMUP_BARS:], key)) for key in ('close', 'open', 'high', 'low', 'volume')]
+    dates = bar_dates(data[WARMUP_BARS:])
+
+    enhanced_data = []
+    for offset, date in enumerate(dates):
+        indicators = {'date': date}
+        for key, values in bar_lists:
+            indicators[key] = values[offset]
+        for key, values in column_lists:
+            indicators[key] = values[offset]
+        enhanced_data.append(indicators)
+
+    return enhanced_data
+
+class LiveIndicatorState:
+    """Indicator state for the live scan, built once from completed bars
+
+    Between scans only today's partial bar changes, so every window sum,
+    high/low and the RSI state over the completed bars are kept, and
+    indicators_for() combines them with the latest bar in constant time.
+    Results are identical to calculate_enhanced_indicators(completed + [latest]).
+    """
+
+    def __init__(self, completed_bars, rsi_mode='simple'):
+        self.closes = bar_column(completed_bars, 'close')
+        self.volumes = bar_column(completed_bars, 'volume')
+        self.highs = bar_column(completed_bars, 'high')
+        self.lows = bar_column(completed_bars, 'low')
+
+        # Sums over the last k-1 completed values: adding the new value last keeps
+        # the same summation order as sum(closes[-k:]), so results are bit-identical
+        self.close_sums = {k: sum(self.closes[-(k - 1):]) for k in (5, 10, 20, 26, 50)}
+        self.volume_sum_10 = sum(self.volumes[-9:])
+        self.high_19 = max(self.highs[-19:]) if self.highs else None
+        self.low_19 = min(self.lows[-19:]) if self.lows else None
+
+        self.rsi_state = IncrementalRSI(mode=rsi_mode)
+        for close in (self.closes[-15:] if rsi_mode == 'simple' else self.closes):
+            self.rsi_state.update(close)
+
+    def matches(self, prices):
+        """True when `prices` is this state's completed bars plus one latest bar"""
+        completed = prices[:-1]
+        return len(completed) == len(self.closes) and bar_column(completed, 'close') == self.closes
+
+    def indicators_for(self, latest):
+        """Indicators for the completed history plus `latest` (today's partial bar)"""
+        n = len(self.closes) + 1
+        if n < 20:
+            return {}
+
+        close = latest['close']
+        closes = self.closes
+
+        def sma(k):
+            return (self.close_sums[k] + close) / k if n >= k else close
+
+        def momentum(lag):
+            return ((close - closes[-lag]) / closes[-lag]) * 100 if n >= lag + 1 else 0
+
+        avg_volume_10 = (self.volume_sum_10 + latest['volume']) / 10 if n >= 10 else latest['volume']
+        recent_high = max(self.high_19, latest['high'])
+        recent_low = min(self.low_19, latest['low'])
+
+        # Deferred to first use: statistics loads decimal and fractions at import
+        import statistics
+
+        return {
+            'rsi': self.rsi_state.peek(close),
+            'sma_5': sma(5),
+            'sma_10': sma(10),
+            'sma_20': sma(20),
+            'sma_50': sma(50),
+            'momentum_3': momentum(3),
+            'momentum_5': momentum(5),
+            'momentum_10': momentum(10),
+            'volatility_10': statistics.stdev(closes[-9:] + [close]) if n >= 10 else 0,
+            'volatility_20': statistics.stdev(closes[-19:] + [close]) if n >= 20 else 0,
+            'volume_ratio': latest['volume'] / avg_volume_10 if avg_volume_10 > 0 else 1,
+            'price_position': (close - recent_low) / (recent_high - recent_low) if recent_high != recent_low else 0.5,
+            'macd': close - sma(26),
+            'recent_high': recent_high,
+            'recent_low': recent_low
+        }
@@ -0,0 +1,316 @@
+"""
+⏱️ Intraday Minute-Bar Ingestion
+
+Event-driven alternative to the 30-minute scheduled scan. Minute bars are
+pushed onto an SQS queue; each batch is folded into per-symbol partial
+daily bars, and only the symbols whose bar changed are re-analyzed with
+the live pipeline (warm LiveIndicatorState + ml_enhanced_analysis_with_sentiment).
+A symbol's signal is stored and acted on only when its signal type changes,
+so a steady stream of minutes does not re-store or re-trade the same call.
+
+Session state lives in container memory, so it is seeded rather than
+rebuilt from the minutes a container happens to see: the first batch that
+touches a symbol's session fetches today's bar so far from one batched
+quote request, and only minutes after the quote are folded in. Sessions
+are re-synced from the quote every INTRADAY_RESEED_SECONDS, so after a
+cold start - or with more than one consumer splitting the queue - each
+session converges on the provider's view of the day. If the quote is
+unavailable the session starts from its first minute, as before.
+
+For local runs, bars can be replayed from a JSON-lines file or a TCP socket
+(one JSON bar per line) with run_replay().
+
+Minute bar format: {"symbol", "timestamp" (epoch seconds), "open", "high", "low", "close", "volume"}
+"""
+
+import json
+import os
+import socket
+import time
+from datetime import datetime
+
+from aws_clients import get_table
+from dynamo_codec import encode_signal
+from market_data import get_market_data
+from real_lambda_function import (
+    SIGNAL_FLUSH_SECONDS,
+    calculate_enhanced_indicators_cached,
+    get_sentiment_data,
+    init_alpaca_paper_trading,
+    is_market_open,
+    ml_enhanced_analysis_with_sentiment,
+    process_signal_stream
+)
+from paper_execution import PaperExecutor
+from scan_metrics import start_scan, timer
+from sentiment_provider import get_sentiment_provider
+from signal_writer import BatchSignalWriter
+
+# Completed daily bars combined with today's partial bar (same window as the scheduled scan)
+INTRADAY_LOOKBACK = 50
+INTRADAY_FETCH_TIMEOUT = float(os.environ.get('INTRADAY_FETCH_TIMEOUT', '10'))
+
+# How often a session bar is re-synced from the live quote
+INTRADAY_RESEED_SECONDS = float(os.environ.get('INTRADAY_RESEED_SECONDS', '300'))
+
+class IntradayEngine:
+    """Per-symbol session bars built from minute bars, re-analyzed only when they change"""
+
+    def __init__(self, market_data=None, lookback=INTRADAY_LOOKBACK, reseed_seconds=INTRADAY_RESEED_SECONDS):
+        self.market_data = market_data or get_market_data()
+        self.lookback = lookback
+        self.reseed_seconds = reseed_seconds
+        self.sessions = {}
+        self.synced_at = {}
+        self.last_signal_types = {}
+        self.stats = {'bars': 0, 'duplicates': 0, 'seeded': 0, 'covered_by_quote': 0, 'analyzed': 0, 'signals_emitted': 0}
+
+    def _start_session(self, symbol, day, bar, timestamp):
+        """New session bar for `day`, from a quote bar or the first minute"""
+        session = self.sessions.get(symbol)
+        if session is None or session['day'] < day:
+            self.last_signal_types.pop(symbol, None)
+        self.sessions[symbol] = {
+            'day': day,
+            'minutes': set(),
+            'seeded_through': 0,
+            'first_timestamp': timestamp,
+            'last_timestamp': timestamp,
+            'open': bar['open'],
+            'high': bar['high'],
+            'low': bar['low'],
+            'close': bar['close'],
+            'volume': 0
+        }
+        return self.sessions[symbol]
+
+    def seed_sessions(self, bars, now=None):
+        """Seed (or re-sync) the sessions a batch touches from one batched quote request
+
+        Returns the symbols whose session bar was replaced by the quote.
+        """
+        now = time.time() if now is None else now
+        days = {}
+        for bar in bars:
+            symbol = bar['symbol']
+            days[symbol] = max(days.get(symbol, 0), int(bar['timestamp']) // 86400)
+
+        stale = sorted(
+            symbol for symbol, day in days.items()
+            if symbol not in self.sessions
+            or self.sessions[symbol]['day'] < day
+            or now - self.synced_at.get(symbol, float('-inf')) >= self.reseed_seconds
+        )
+        if not stale:
+            return set()
+
+        try:
+            quotes = self.market_data.session_quotes(stale, INTRADAY_FETCH_TIMEOUT)
+        except Exception as e:
+            print(f'⚠️ Session quotes unavailable, starting sessions from minute bars: {e}')
+            quotes = {}
+
+        seeded = set()
+        for symbol in stale:
+            self.synced_at[symbol] = now
+            quote = quotes.get(symbol)
+            session = self.sessions.get(symbol)
+            # A quote from a previous session (pre-market) says nothing about today's bar
+            if not quote or int(quote['timestamp']) // 86400 != days[symbol]:
+                continue
+            if session is not None and session['day'] == days[symbol] and session['seeded_through'] > quote['timestamp']:
+                continue
+
+            session = self._start_session(symbol, days[symbol], quote, int(quote['timestamp']))
+            session['seeded_through'] = session['first_timestamp']
+            session['volume'] = int(quote['volume'])
+            seeded.add(symbol)
+
+        self.stats['seeded'] += len(seeded)
+        return seeded
+
+    def apply_bar(self, bar):
+        """Fold one minute bar into its symbol's session bar; False for duplicates"""
+        symbol = bar['symbol']
+        timestamp = int(bar['timestamp'])
+        # UTC day number, the same session key market_data uses
+        day = timestamp // 86400
+        self.stats['bars'] += 1
+
+        session = self.sessions.get(symbol)
+        if session is None or session['day'] < day:
+            session = self._start_session(symbol, day, bar, timestamp)
+        elif session['day'] > day:
+            return False
+
+        # Already part of the quote the session was seeded from
+        if timestamp < session['seeded_through']:
+            self.stats['covered_by_quote'] += 1
+            return False
+
+        # SQS delivers at least once - each minute counts once
+        minute = timestamp // 60
+        if minute in session['minutes']:
+            self.stats['duplicates'] += 1
+            return False
+        session['minutes'].add(minute)
+
+        session['high'] = max(session['high'], bar['high'])
+        session['low'] = min(session['low'], bar['low'])
+        session['volume'] += int(bar['volume'])
+        # Late minutes still count towards high/low/volume but never move open or close backwards
+        if timestamp >= session['last_timestamp']:
+            session['last_timestamp'] = timestamp
+            session['close'] = bar['close']
+        if timestamp < session['first_timestamp']:
+            session['first_timestamp'] = timestamp
+            session['open'] = bar['open']
+        return True
+
+    def ingest(self, bars):
+        """Apply a batch of minute bars; returns the symbols whose session bar changed"""
+        changed = self.seed_sessions(bars)
+        for bar in bars:
+            if self.apply_bar(bar):
+                changed.add(bar['symbol'])
+        return changed
+
+    def session_bars(self, symbol):
+        """Completed daily bars plus the symbol's partial bar for today"""
+        session = self.sessions[symbol]
+        history = self.market_data.completed_bars(symbol, session['day'], self.lookback - 1, INTRADAY_FETCH_TIMEOUT)
+        if not history:
+            return None
+        return history.with_bar(dict({key: session[key] for key in ('close', 'volume', 'high', 'low', 'open')}, timestamp=session['first_timestamp']))
+
+    def analyze(self, symbols):
+        """Re-run the live analysis for changed symbols, yielding only signals whose type changed"""
+        if symbols:
+            # One batched sentiment call per bucket covers every minute batch after the first
+            with timer('prefetch_sentiment'):
+                get_sentiment_provider().prefetch(sorted(symbols))
+
+        for symbol in sorted(symbols):
+            try:
+                with timer('fetch', symbol):
+                    data = self.session_bars(symbol)
+                if not data:
+                    print(f'⚠️ No daily history for {symbol}')
+                    continue
+
+                self.stats['analyzed'] += 1
+                with timer('indicators', symbol):
+                    indicators = calculate_enhanced_indicators_cached(symbol, data)
+                with timer('sentiment', symbol):
+                    sentiment_data = get_sentiment_data(symbol)
+                with timer('analysis', symbol):
+                    signal = ml_enhanced_analysis_with_sentiment(symbol, data, indicators, sentiment_data)
+
+                signal_type = signal['signal_type'] if signal else None
+                if signal_type == self.last_signal_types.get(symbol):
+                    continue
+                self.last_signal_types[symbol] = signal_type
+
+                if signal:
+                    self.stats['signals_emitted'] += 1
+                    print(f'⏱️ Intraday signal: {symbol} {signal_type} at {signal["confidence"]:.1f}% confidence')
+                    yield signal
+
+            except Exception as e:
+                print(f'❌ Error analyzing intraday bars for {symbol}: {e}')
+
+# Session state survives across warm invocations of this container
+_engine = None
+
+def get_intraday_engine():
+    global _engine
+    if _engine is None:
+        _engine = IntradayEngine()
+    return _engine
+
+def parse_sqs_bars(event):
+    """Minute bars from SQS records - each body is one bar or a list of bars"""
+    bars = []
+    for record in event.get('Records', []):
+        try:
+            body = json.loads(record['body'])
+        except (KeyError, ValueError) as e:
+            print(f'⚠️ Dropping malformed message {record.get("messageId")}: {e}')
+            continue
+        bars.extend(body if isinstance(body, list) else [body])
+    return bars
+
+def process_minute_bars(bars, engine=None, signals_table=None, trading_api=None, market_open=None):
+    """Ingest a batch of minute bars and store/act on the resulting signals"""
+    engine = engine or get_intraday_engine()
+    with timer('ingest'):
+        changed = engine.ingest(bars)
+
+    if signals_table is None:
+        signals_table = get_table()
+    signal_writer = BatchSignalWriter(signals_table, serializer=encode_signal, max_latency=SIGNAL_FLUSH_SECONDS)
+
+    outcome = process_signal_stream(
+        engine.analyze(changed),
+        signal_writer,
+        PaperExecutor(trading_api) if trading_api else None,
+        is_market_open() if market_open is None else market_open
+    )
+
+    return {
+        'bars_received': len(bars),
+        'symbols_changed': len(changed),
+        'signals_found': outcome['signals_found'],
+        'signals_stored': signal_writer.items_written,
+        'paper_trades_executed': len(outcome['executed_trades'])
+    }
+
+def sqs_handler(event, context):
+    """SQS entry point for pushed minute bars"""
+    metrics = start_scan('intraday')
+    try:
+        bars = parse_sqs_bars(event)
+        with timer('init'):
+            trading_api = init_alpaca_paper_trading()
+        result = process_minute_bars(bars, trading_api=trading_api)
+        print(f'⏱️ Intraday batch: {result["bars_received"]} bars, {result["symbols_changed"]} symbols re-analyzed, {result["signals_found"]} signals')
+        return dict(result, status='success', timestamp=datetime.now().isoformat(), timing=metrics.finish())
+    except Exception as e:
+        # Raising makes SQS redeliver the batch; duplicate minutes are ignored on retry
+        print(f'❌ Error in intraday handler: {str(e)}')
+        raise
+
+def iter_file_bars(path):
+    """Replay source: minute bars from a JSON-lines file"""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def iter_socket_bars(host, port, timeout=None):
+    """Replay source: newline-delimited JSON minute bars from a TCP socket, until it closes"""
+    with socket.create_connection((host, port), timeout=timeout) as connection:
+        with connection.makefile('r') as stream:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+
+def run_replay(source, batch_size=10, **kwargs):
+    """Feed a replay source through process_minute_bars in SQS-sized batches"""
+    totals = {'batches': 0, 'bars_received': 0, 'symbols_changed': 0, 'signals_found': 0, 'signals_stored': 0, 'paper_trades_executed': 0}
+
+    def flush(batch):
+        result = process_minute_bars(batch, **kwargs)
+        totals['batches'] += 1
+        for key, value in result.items():
+            totals[key] += value
+
+    batch = []
+    for bar in source:
+        batch.append(bar)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    return totals
@@ -1,18 +1,19 @@
 import json
-import boto3
 import os
 from datetime import datetime, timedelta
-import urllib.request
-import urllib.parse
-import ssl
+from market_data import get_market_data
+from universe_registry import universe_symbols
+from signal_query import date_bucket, utc_now
+from aws_clients import get_client, get_resource
+from bar_series import bar_column
 
 def lambda_handler(event, context):
     print('🚀 REAL Trading Engine Lambda started')
     
     try:
         # Initialize AWS services
-        dynamodb = boto3.resource('dynamodb')
-        sns = boto3.client('sns')
+        dynamodb = get_resource('dynamodb')
+        sns = get_client('sns')
         
         # Get environment variables
         signals_table_name = os.environ.get('SIGNALS_TABLE', 'trading-system-signals')
@@ -93,39 +94,8 @@ def is_market_open():
 def get_real_stock_data(symbol):
     """Get REAL stock data from Yahoo Finance API"""
     try:
-        # Yahoo Finance API endpoint
-        url = f'https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d&range=30d'
-        
-        # Create SSL context
-        context = ssl.create_default_context()
-        
-        # Make request
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        with urllib.request.urlopen(req, context=context) as response:
-            data = json.loads(response.read().decode())
-        
-        # Extract price data
-        result = data['chart']['result'][0]
-        timestamps = result['timestamp']
-        quotes = result['indicators']['quote'][0]
-        
-        if not timestamps or not quotes['close']:
-            return None
-        
-        # Get last 20 days of data
-        prices = []
-        for i in range(max(0, len(quotes['close']) - 20), len(quotes['close'])):
-            if quotes['close'][i] is not None:
-                prices.append({
-                    'close': quotes['close'][i],
-                    'volume': quotes['volume'][i] if quotes['volume'][i] else 1000000,
-                    'high': quotes['high'][i] if quotes['high'][i] else quotes['close'][i],
-                    'low': quotes['low'][i] if quotes['low'][i] else quotes['close'][i]
-                })
-        
-        return prices
+        # Last 20 days of data: cached history + batched live quote, chart request on a cache miss
+        return get_market_data().get_bars(symbol, 20)
         
     except Exception as e:
         print(f'Error fetching data for {symbol}: {e}')
@@ -136,7 +106,7 @@ def calculate_rsi(prices, period=14):
     if len(prices) < period + 1:
         return 50  # Default neutral RSI
     
-    closes = [p['close'] for p in prices]
+    closes = bar_column(prices, 'close')
     deltas = [closes[i] - closes[i-1] for i in range(1, len(closes))]
     
     gains = [d if d > 0 else 0 for d in deltas]
@@ -161,7 +131,7 @@ def calculate_macd(prices):
     if len(prices) < 26:
         return 0, 0, 0  # Default values
     
-    closes = [p['close'] for p in prices]
+    closes = bar_column(prices, 'close')
     
     # Calculate EMAs
     ema_12 = closes[-1]  # Simplified
@@ -182,13 +152,13 @@ def analyze_real_stock(symbol, data):
         latest = data[-1]
         
         # Calculate technical indicators
-        sma_20 = sum([p['close'] for p in data[-20:]]) / min(20, len(data))
-        sma_50 = sum([p['close'] for p in data]) / len(data)
+        sma_20 = sum(bar_column(data[-20:], 'close')) / min(20, len(data))
+        sma_50 = sum(bar_column(data, 'close')) / len(data)
         rsi = calculate_rsi(data)
         macd, macd_signal, macd_hist = calculate_macd(data)
         
         # Volume analysis
-        avg_volume = sum([p['volume'] for p in data[-10:]]) / min(10, len(data))
+        avg_volume = sum(bar_column(data[-10:], 'volume')) / min(10, len(data))
         volume_ratio = latest['volume'] / avg_volume if avg_volume > 0 else 1
         
         # Calculate price momentum
@@ -281,12 +251,14 @@ def analyze_real_stock(symbol, data):
         else:
             signal_type = 'STRONG_SELL' if signal_score < -80 else 'SELL'
         
+        timestamp = utc_now().isoformat()
         signal = {
             'symbol': symbol,
             'signal_type': signal_type,
             'confidence': round(confidence, 1),
             'price': round(latest['close'], 2),
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
+            'date_bucket': date_bucket(timestamp),
             'reasons': reasons[:4],  # Top 4 reasons
             'technical_data': {
                 'rsi': round(rsi, 1),
@@ -308,23 +280,13 @@ def analyze_real_stock(symbol, data):
 def scan_real_market():
     """Scan REAL market for trading opportunities with expanded universe"""
     # Expanded stock universe for better coverage
-    symbols = [
-        # Large Cap Tech
-        'AAPL', 'GOOGL', 'MSFT', 'AMZN', 'META', 'TSLA', 'NVDA', 'NFLX',
-        'ADBE', 'CRM', 'ORCL', 'INTC', 'AMD', 'QCOM', 'AVGO', 'TXN',
-        
-        # Financial
-        'JPM', 'BAC', 'WFC', 'GS', 'MS', 'C', 'V', 'MA', 'AXP', 'BLK',
-        
-        # Healthcare & Consumer
-        'JNJ', 'PFE', 'UNH', 'ABBV', 'MRK', 'PG', 'KO', 'PEP', 'WMT', 'HD',
-        
-        # ETFs for market sentiment
-        'SPY', 'QQQ', 'IWM', 'XLF', 'XLK', 'XLE'
-    ]
+    symbols = universe_symbols('legacy_scan')
     
     signals = []
     
+    # One batched quote request for the whole universe before per-symbol analysis
+    get_market_data().prefetch(symbols)
+    
     for symbol in symbols:
         try:
             print(f'📈 Analyzing REAL data for {symbol}...')
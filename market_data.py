@@ -0,0 +1,248 @@
+"""
+📡 Batch Market Data Adapter
+
+Serves the daily bars behind get_real_stock_data(symbol). A scan first
+prefetches live quotes for its whole universe in as few batched quote
+requests as the provider allows; each symbol's bars are then its cached
+daily history (BarStore) plus today's partial bar built from the quote.
+Only symbols without usable cached history fall back to a per-symbol
+chart request, whose result is cached for the next scan.
+
+Bars are returned as BarSeries views over the cached columns.
+"""
+
+import os
+import time
+
+from bar_cache import BarStore
+from bar_series import BarSeries
+from http_client import get_json
+from warm_cache import TTLCache
+
+# Symbols per batched quote request
+QUOTE_BATCH_SIZE = int(os.environ.get('QUOTE_BATCH_SIZE', '50'))
+
+# Completed daily bars kept in memory per symbol
+HISTORY_BARS = 120
+
+# Cached history older than this (in days) is not trusted - covers weekends and holidays
+MAX_HISTORY_GAP_DAYS = 5
+
+QUOTE_URL = 'https://query1.finance.yahoo.com/v7/finance/quote?symbols={symbols}'
+CHART_URL = 'https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d&range={range}'
+
+def _utc_day(timestamp):
+    return int(timestamp) // 86400
+
+def _previous_weekday(day):
+    """UTC day number of the last weekday before `day` (day 0, 1970-01-01, was a Thursday)"""
+    day -= 1
+    while (day + 3) % 7 >= 5:
+        day -= 1
+    return day
+
+def fetch_batch_quotes(symbols, timeout=None, fill_missing=True):
+    """Fetch live quotes for many symbols in batched requests
+
+    Missing open/high/low/volume are filled from the price unless
+    fill_missing is False, in which case such quotes are left out.
+    """
+    quotes = {}
+    for start in range(0, len(symbols), QUOTE_BATCH_SIZE):
+        batch = symbols[start:start + QUOTE_BATCH_SIZE]
+        try:
+            data = get_json(QUOTE_URL.format(symbols=','.join(batch)), timeout=timeout)
+        except Exception as e:
+            print(f'⚠️ Batch quote request failed for {len(batch)} symbols: {e}')
+            continue
+
+        for quote in data.get('quoteResponse', {}).get('result', []):
+            price = quote.get('regularMarketPrice')
+            timestamp = quote.get('regularMarketTime')
+            if price is None or timestamp is None:
+                continue
+            if not fill_missing and not all(quote.get(key) for key in ('regularMarketOpen', 'regularMarketDayHigh', 'regularMarketDayLow', 'regularMarketVolume')):
+                continue
+            quotes[quote['symbol']] = {
+                'timestamp': int(timestamp),
+                'open': quote.get('regularMarketOpen') or price,
+                'high': quote.get('regularMarketDayHigh') or price,
+                'low': quote.get('regularMarketDayLow') or price,
+                'close': price,
+                'volume': int(quote.get('regularMarketVolume') or 1000000),
+                'previous_close': quote.get('regularMarketPreviousClose')
+            }
+    return quotes
+
+def fetch_chart_columns(symbol, range_='60d', timeout=None):
+    """Fetch daily bars for one symbol from the chart API as BarStore columns
+
+    Missing volume/high/low/open values are filled in for the analysis.
+    Returns (columns, filled) - filled holds the indexes of rows with
+    filled-in values, which are never cached.
+    """
+    data = get_json(CHART_URL.format(symbol=symbol, range=range_), timeout=timeout)
+
+    result = data['chart']['result'][0]
+    timestamps = result.get('timestamp') or []
+    quotes = result['indicators']['quote'][0]
+
+    columns = {'timestamp': [], 'open': [], 'high': [], 'low': [], 'close': [], 'volume': []}
+    filled = set()
+    for i, timestamp in enumerate(timestamps):
+        close = quotes['close'][i]
+        if close is None:
+            continue
+        if not all(quotes[key][i] for key in ('open', 'high', 'low', 'volume')):
+            filled.add(len(columns['timestamp']))
+        columns['timestamp'].append(int(timestamp))
+        columns['close'].append(close)
+        columns['volume'].append(int(quotes['volume'][i]) if quotes['volume'][i] else 1000000)
+        columns['high'].append(quotes['high'][i] if quotes['high'][i] else close)
+        columns['low'].append(quotes['low'][i] if quotes['low'][i] else close)
+        columns['open'].append(quotes['open'][i] if quotes['open'][i] else close)
+    return columns, filled
+
+def cacheable_columns(columns, filled, day):
+    """Rows worth caching: completed sessions before `day` (UTC) with no filled-in values
+
+    Today's still-trading bar and bars with invented volume or range stay out
+    of the BarStore, which the backtester reads as real history.
+    """
+    rows = [i for i, timestamp in enumerate(columns['timestamp']) if _utc_day(timestamp) < day and i not in filled]
+    return {column: [values[i] for i in rows] for column, values in columns.items()}
+
+def quote_bar(quote):
+    """Today's partial bar from a batched quote"""
+    return {key: quote[key] for key in ('timestamp', 'close', 'volume', 'high', 'low', 'open')}
+
+def completed_series(columns, day, keep=None):
+    """Bars from sessions before `day` (UTC) as a compact BarSeries, keeping at most the last `keep`"""
+    completed = len(columns['timestamp'])
+    while completed and _utc_day(columns['timestamp'][completed - 1]) >= day:
+        completed -= 1
+    start = max(0, completed - keep) if keep else 0
+    # Copy just the kept rows so the cache doesn't pin the whole fetched history
+    return BarSeries({column: values[start:completed] for column, values in columns.items()})
+
+class BatchMarketData:
+    """Cached daily history + batched live quotes, with per-symbol chart fallback
+
+    Completed-session bars are held in a warm-container TTL/LRU cache, so
+    after the first scan of a session only today's bar - from the batched
+    quote - changes between scans.
+    """
+
+    def __init__(self, store=None, history=None):
+        self.store = store or BarStore()
+        self.history = history or TTLCache()
+        self.quotes = {}
+        self.stats = {'quote_symbols': 0, 'cache_hits': 0, 'chart_fallbacks': 0, 'session_refreshes': 0}
+
+    def prefetch(self, symbols, timeout=None):
+        """Refresh live quotes for a whole universe before a scan"""
+        self.quotes = fetch_batch_quotes(list(symbols), timeout)
+        self.stats['quote_symbols'] = len(self.quotes)
+        print(f'📡 Batch quotes: {len(self.quotes)}/{len(symbols)} symbols in {-(-len(symbols) // QUOTE_BATCH_SIZE)} request(s)')
+
+    def session_quotes(self, symbols, timeout=None):
+        """Today's bar so far for each symbol, only from quotes with real open/high/low/volume"""
+        quotes = fetch_batch_quotes(list(symbols), timeout, fill_missing=False)
+        return {symbol: quote_bar(quote) for symbol, quote in quotes.items()}
+
+    def _history_is_current(self, cached, quote_day, previous_close):
+        """Whether cached history already ends with the session before `quote_day`
+
+        Cached rows are always completed sessions (see cacheable_columns), so only
+        sessions missing since the last cached one call for a refresh: the last
+        cached bar is the previous weekday, or its close is the quote's previous close
+        (which also covers market holidays).
+        """
+        if _utc_day(cached['timestamp'][-1]) >= _previous_weekday(quote_day):
+            return True
+        return previous_close is not None and abs(cached['close'][-1] - previous_close) <= max(0.005, previous_close * 1e-4)
+
+    def _completed_history(self, symbol, quote_day, timeout, previous_close=None):
+        """Completed-session bars before `quote_day`, from memory when this session is already loaded"""
+        entry = self.history.get(symbol)
+        if entry is not None and entry['day'] == quote_day:
+            return entry['bars']
+
+        cached = self.store.load(symbol, '1d')
+        if cached['timestamp'] and not self._history_is_current(cached, quote_day, previous_close):
+            # Sessions missing since the last cached one - fetch just the recent ones
+            try:
+                columns, filled = fetch_chart_columns(symbol, '5d', timeout)
+                self.store.merge(symbol, '1d', cacheable_columns(columns, filled, quote_day))
+                cached = self.store.load(symbol, '1d')
+                self.stats['session_refreshes'] += 1
+            except Exception as e:
+                print(f'⚠️ Could not refresh recent bars for {symbol}: {e}')
+
+        completed = completed_series(cached, quote_day, HISTORY_BARS)
+        self.history.set(symbol, {'day': quote_day, 'bars': completed})
+        return completed
+
+    def completed_bars(self, symbol, day, count, timeout=None):
+        """Last `count` daily bars (BarSeries) from sessions before `day` (UTC day number), for callers that build today's bar themselves"""
+        quote = self.quotes.get(symbol) or {}
+        completed = self._completed_history(symbol, day, timeout, quote.get('previous_close'))
+
+        if len(completed) < count:
+            self.stats['chart_fallbacks'] += 1
+            columns, filled = fetch_chart_columns(symbol, timeout=timeout)
+            if columns['timestamp']:
+                self.store.merge(symbol, '1d', cacheable_columns(columns, filled, day))
+                completed = completed_series(columns, day, HISTORY_BARS)
+                self.history.set(symbol, {'day': day, 'bars': completed})
+
+        return completed[max(0, len(completed) - count):]
+
+    def _bars_from_cache(self, symbol, lookback, timeout):
+        quote = self.quotes.get(symbol)
+        if not quote:
+            return None
+
+        quote_day = _utc_day(quote['timestamp'])
+        completed = self._completed_history(symbol, quote_day, timeout, quote.get('previous_close'))
+
+        count = len(completed)
+        if count == 0 or count < lookback - 1:
+            return None
+        if quote_day - _utc_day(completed.timestamp[-1]) > MAX_HISTORY_GAP_DAYS:
+            return None
+
+        return completed[count - (lookback - 1):].with_bar(quote_bar(quote))
+
+    def get_bars(self, symbol, lookback=50, timeout=None):
+        """Last `lookback` daily bars for a symbol as a BarSeries, including today's partial bar"""
+        bars = self._bars_from_cache(symbol, lookback, timeout)
+        if bars is not None:
+            self.stats['cache_hits'] += 1
+            return bars
+
+        self.stats['chart_fallbacks'] += 1
+        columns, filled = fetch_chart_columns(symbol, timeout=timeout)
+        if not columns['timestamp']:
+            return None
+
+        quote = self.quotes.get(symbol)
+        quote_day = _utc_day(quote['timestamp'] if quote else time.time())
+        self.store.merge(symbol, '1d', cacheable_columns(columns, filled, quote_day))
+
+        # The chart response already holds this session's completed bars - keep them warm
+        if quote:
+            self.history.set(symbol, {'day': quote_day, 'bars': completed_series(columns, quote_day, HISTORY_BARS)})
+
+        bars = BarSeries(columns)
+        return bars[max(0, len(bars) - lookback):]
+
+# Shared across warm Lambda invocations of this container
+_market_data = None
+
+def get_market_data():
+    """Module-level adapter, created on first use"""
+    global _market_data
+    if _market_data is None:
+        _market_data = BatchMarketData()
+    return _market_data
@@ -0,0 +1,202 @@
+"""
+🎯 Paper Trade Execution
+
+One account + positions snapshot per run: every order is sized locally
+against it (2% of portfolio value, within remaining buying power) instead
+of calling get_account before each order. Orders are submitted
+concurrently, each with a deterministic client_order_id, so a retried
+submission or a re-run of the same scan slot cannot place the same order
+twice. The portfolio summary for notifications comes from the same
+snapshot, adjusted for the orders placed.
+
+A trade slot is only used up by a confirmed order: when an order fails,
+its slot and buying power are released and the next tradeable signal that
+was held back goes out instead.
+
+Broker round-trips per run: 2 for the snapshot + 1 per order.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Paper trades submitted per run
+PAPER_TRADES_PER_RUN = 3
+
+# Risk management: max 2% of portfolio per trade
+POSITION_FRACTION = 0.02
+
+ORDER_SUBMIT_WORKERS = int(os.environ.get('ORDER_SUBMIT_WORKERS', '4'))
+
+# Orders for the same symbol and side within one window share a client_order_id
+ORDER_ID_WINDOW_MINUTES = int(os.environ.get('ORDER_ID_WINDOW_MINUTES', '30'))
+
+def is_tradeable_signal(signal):
+    """Only BUY signals with 80%+ confidence are traded"""
+    return signal.get('confidence', 0) >= 80 and signal.get('signal_type') in ['BUY', 'STRONG_BUY']
+
+def client_order_id(signal, side='buy', window_minutes=None):
+    """Deterministic order id for a signal's symbol, side and scan window (Alpaca allows 48 chars)"""
+    window_minutes = window_minutes or ORDER_ID_WINDOW_MINUTES
+    moment = datetime.fromisoformat(signal['timestamp'])
+    window = int(moment.timestamp() // (window_minutes * 60))
+    digest = hashlib.sha1(f'{signal["symbol"]}|{side}|{window}'.encode()).hexdigest()[:16]
+    return f'sig-{signal["symbol"]}-{digest}'[:48]
+
+def _is_duplicate_order_error(error):
+    message = str(error).lower()
+    return 'client_order_id' in message and ('unique' in message or 'duplicate' in message or 'exists' in message)
+
+class PaperExecutor:
+    """Sizes and submits a run's paper orders against a single account snapshot"""
+
+    def __init__(self, trading_api, max_trades=PAPER_TRADES_PER_RUN, max_workers=None):
+        self.trading_api = trading_api
+        self.max_trades = max_trades
+        self.max_workers = max_workers or ORDER_SUBMIT_WORKERS
+
+        self.account = None
+        self.positions = None
+        self.buying_power = 0
+        self.planned = 0
+        self.pending = []
+        self.held_back = []
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """Fetch the account and positions once per run"""
+        if self.account is None:
+            self.account = self.trading_api.get_account()
+            self.positions = {position.symbol: float(position.qty) for position in self.trading_api.list_positions()}
+            self.buying_power = float(self.account.buying_power)
+        return self.account
+
+    def plan(self, signal):
+        """Order for a tradeable signal sized against the snapshot, or None"""
+        account = self.snapshot()
+        portfolio_value = float(account.portfolio_value)
+        shares = int(portfolio_value * POSITION_FRACTION / signal['price'])
+
+        if shares < 1:
+            print(f'⚠️ Position too small for {signal["symbol"]} - need at least ${signal["price"]:.2f}')
+            return None
+        if shares * signal['price'] > self.buying_power:
+            print(f'⚠️ Not enough buying power for {signal["symbol"]} (${self.buying_power:,.2f} left)')
+            return None
+
+        self.buying_power -= shares * signal['price']
+        return {
+            'symbol': signal['symbol'],
+            'qty': shares,
+            'side': 'buy',
+            'type': 'market',
+            'time_in_force': 'gtc',
+            'client_order_id': client_order_id(signal)
+        }
+
+    def submit(self, signal):
+        """Plan an order for a signal and send it in the background; False if not traded
+
+        Tradeable signals beyond the run's slots are held back in case an
+        order fails and frees its slot.
+        """
+        if not is_tradeable_signal(signal):
+            return False
+        if self.planned >= self.max_trades:
+            self.held_back.append(signal)
+            return False
+
+        order = self.plan(signal)
+        if order is None:
+            return False
+
+        self.planned += 1
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        self.pending.append((signal, order, self._pool.submit(self._send, order)))
+        return True
+
+    def _send(self, order):
+        """Submit one order; a duplicate client_order_id means it was already placed"""
+        for attempt in range(2):
+            try:
+                return self.trading_api.submit_order(**order)
+            except Exception as e:
+                if _is_duplicate_order_error(e):
+                    print(f'♻️ Order {order["client_order_id"]} already placed - reusing it')
+                    return self.trading_api.get_order_by_client_order_id(order['client_order_id'])
+                if attempt:
+                    raise
+                # One retry with the same client_order_id is safe - the broker dedupes it
+
+    def collect(self):
+        """Wait for every submitted order and return the executed trade records"""
+        executed_trades = []
+        while self.pending:
+            pending, self.pending = self.pending, []
+            for signal, order, future in pending:
+                trade = self._confirm(signal, order, future)
+                if trade:
+                    executed_trades.append(trade)
+
+            # Failed orders freed their slots - fill them from the held-back signals
+            while self.planned < self.max_trades and self.held_back:
+                self.submit(self.held_back.pop(0))
+
+        self.held_back = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        return executed_trades
+
+    def _confirm(self, signal, order, future):
+        """Trade record for a sent order, or None after releasing a failed order's slot"""
+        try:
+            placed = future.result()
+        except Exception as e:
+            print(f'❌ Error executing paper trade for {signal["symbol"]}: {e}')
+            self.planned -= 1
+            self.buying_power += order['qty'] * signal['price']
+            return None
+
+        with self._lock:
+            self.positions[signal['symbol']] = self.positions.get(signal['symbol'], 0) + order['qty']
+
+        print(f'🎯 PAPER TRADE: Bought {order["qty"]} shares of {signal["symbol"]} at ${signal["price"]} (${order["qty"] * signal["price"]:.2f})')
+        return {
+            'symbol': signal['symbol'],
+            'action': signal['signal_type'],
+            'shares': order['qty'],
+            'price': signal['price'],
+            'confidence': signal['confidence'],
+            'order_id': placed.id,
+            'client_order_id': order['client_order_id'],
+            'estimated_value': order['qty'] * signal['price'],
+            'profit_potential': signal['technical_data'].get('profit_potential', 0),
+            'sentiment_boost': signal['sentiment_data'].get('sentiment_boost', 0),
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def execute(self, signals):
+        """Submit orders for the first tradeable signals and wait for them"""
+        for signal in signals:
+            self.submit(signal)
+        return self.collect()
+
+    def portfolio_summary(self):
+        """Portfolio summary from the run's snapshot, with this run's orders applied"""
+        try:
+            account = self.snapshot()
+            return {
+                'total_value': float(account.portfolio_value),
+                'buying_power': self.buying_power,
+                'day_pnl': float(account.unrealized_pl) if hasattr(account, 'unrealized_pl') else 0,
+                'cash': float(account.cash),
+                'positions_count': len([qty for qty in self.positions.values() if qty])
+            }
+        except Exception as e:
+            print(f'Error getting portfolio summary: {e}')
+            return None
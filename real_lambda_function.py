@@ -1,15 +1,50 @@
 import json
-import boto3
 import os
 from datetime import datetime, timedelta
-import urllib.request
-import urllib.parse
-import ssl
-import statistics
-from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from incremental_rsi import rsi_from_closes
+from signal_writer import BatchSignalWriter
+from dynamo_codec import encode_signal
+from market_data import get_market_data
+from sentiment_provider import get_sentiment_provider
+from indicator_engine import LiveIndicatorState
+from warm_cache import TTLCache
+from universe_registry import universe_symbols
+from signal_query import date_bucket, utc_now
+from signal_snapshot import compact_signal, write_snapshot
+from paper_execution import PaperExecutor, is_tradeable_signal
+from aws_clients import get_client, get_table
+from bar_series import bar_column
+from scan_metrics import start_scan, timed, timer
+
+# Bounded-concurrency settings for the market scan fetch stage
+SCAN_MAX_WORKERS = int(os.environ.get('SCAN_MAX_WORKERS', '8'))
+SCAN_FETCH_TIMEOUT = float(os.environ.get('SCAN_FETCH_TIMEOUT', '10'))
+
+# RSI definition: 'simple' (existing average of last 14 moves) or 'wilder'
+RSI_MODE = os.environ.get('RSI_MODE', 'simple')
+
+# Longest a streamed signal waits before it is stored
+SIGNAL_FLUSH_SECONDS = float(os.environ.get('SIGNAL_FLUSH_SECONDS', '2'))
+
+# Scan universe from the registry (universes.json); SCAN_TOP_N keeps only the most liquid symbols
+SCAN_UNIVERSE = os.environ.get('SCAN_UNIVERSE', 'enhanced_scan')
+SCAN_TOP_N = int(os.environ['SCAN_TOP_N']) if os.environ.get('SCAN_TOP_N') else None
+SCAN_SYMBOLS = universe_symbols(SCAN_UNIVERSE, top_n=SCAN_TOP_N)
+
+# Per-symbol indicator state over completed bars, reused by later scans in a warm container
+_indicator_states = TTLCache()
+
+# Broker session reused by later invocations in a warm container (None until connected)
+_trading_api = None
+_trading_api_checked = False
 
 def convert_floats_to_decimal(obj):
     """Convert float values to Decimal for DynamoDB compatibility"""
+    # decimal is only needed by this legacy path - not at handler import
+    from decimal import Decimal
+    
     if isinstance(obj, dict):
         return {key: convert_floats_to_decimal(value) for key, value in obj.items()}
     elif isinstance(obj, list):
@@ -21,7 +56,11 @@ def convert_floats_to_decimal(obj):
 
 # NEW: Initialize Alpaca paper trading
 def init_alpaca_paper_trading():
-    """Initialize Alpaca API for paper trading"""
+    """Initialize Alpaca API for paper trading, once per container"""
+    global _trading_api, _trading_api_checked
+    if _trading_api_checked:
+        return _trading_api
+
     try:
         import alpaca_trade_api as tradeapi
         
@@ -30,6 +69,7 @@ def init_alpaca_paper_trading():
         
         if not api_key or not secret_key:
             print('📊 No Alpaca credentials - continuing with signals only (existing functionality)')
+            _trading_api_checked = True
             return None
         
         # Always use paper trading for safety
@@ -40,12 +80,15 @@ def init_alpaca_paper_trading():
         # Test connection
         account = api.get_account()
         print(f'✅ Alpaca paper trading connected - Portfolio: ${float(account.portfolio_value):,.2f}')
+        _trading_api, _trading_api_checked = api, True
         return api
         
     except ImportError:
         print('📦 alpaca-trade-api not installed - continuing with signals only')
+        _trading_api_checked = True
         return None
     except Exception as e:
+        # Not cached - the next invocation tries to connect again
         print(f'⚠️ Alpaca connection failed: {e} - continuing with signals only')
         return None
 
@@ -56,57 +99,8 @@ def execute_paper_trades(trading_api, signals):
         print('📊 No trading API - storing signals only (existing behavior)')
         return []
     
-    executed_trades = []
-    
-    # Only trade BUY signals with 80%+ confidence
-    high_confidence_buy_signals = [
-        s for s in signals 
-        if s.get('confidence', 0) >= 80 and s.get('signal_type') in ['BUY', 'STRONG_BUY']
-    ]
-    
-    for signal in high_confidence_buy_signals[:3]:  # Limit to 3 trades per run
-        try:
-            # Get portfolio info for position sizing
-            account = trading_api.get_account()
-            portfolio_value = float(account.portfolio_value)
-            
-            # Risk management: max 2% of portfolio per trade
-            max_position_value = portfolio_value * 0.02
-            shares = int(max_position_value / signal['price'])
-            
-            if shares < 1:
-                print(f'⚠️ Position too small for {signal["symbol"]} - need at least ${signal["price"]:.2f}')
-                continue
-            
-            # Execute paper trade
-            order = trading_api.submit_order(
-                symbol=signal['symbol'],
-                qty=shares,
-                side='buy',
-                type='market',
-                time_in_force='gtc'
-            )
-            
-            executed_trades.append({
-                'symbol': signal['symbol'],
-                'action': signal['signal_type'],
-                'shares': shares,
-                'price': signal['price'],
-                'confidence': signal['confidence'],
-                'order_id': order.id,
-                'estimated_value': shares * signal['price'],
-                'profit_potential': signal['technical_data'].get('profit_potential', 0),
-                'sentiment_boost': signal['sentiment_data'].get('sentiment_boost', 0),
-                'timestamp': datetime.now().isoformat()
-            })
-            
-            print(f'🎯 PAPER TRADE: Bought {shares} shares of {signal["symbol"]} at ${signal["price"]} (${shares * signal["price"]:.2f})')
-            
-        except Exception as e:
-            print(f'❌ Error executing paper trade for {signal["symbol"]}: {e}')
-            continue
-    
-    return executed_trades
+    # One account snapshot for the run, orders sized locally and sent concurrently
+    return PaperExecutor(trading_api).execute(signals)
 
 # NEW: Get portfolio summary for enhanced notifications
 def get_portfolio_summary(trading_api):
@@ -131,54 +125,56 @@ def get_portfolio_summary(trading_api):
     
 def lambda_handler(event, context):
     print('🚀 Enhanced Trading Engine Lambda started - ML-POWERED + SENTIMENT + PAPER TRADING MODE')
+    metrics = start_scan('scan')
     
     try:
-        # Initialize AWS services (EXISTING)
-        dynamodb = boto3.resource('dynamodb')
-        sns = boto3.client('sns')
-        
-        # Get environment variables (EXISTING)
-        signals_table_name = os.environ.get('SIGNALS_TABLE', 'trading-system-signals')
-        sns_topic_arn = os.environ.get('SNS_TOPIC_ARN')
-        
-        signals_table = dynamodb.Table(signals_table_name)
+        with timer('init'):
+            # AWS clients are created once per container and reused while it stays warm
+            sns = get_client('sns')
+            
+            # Get environment variables (EXISTING)
+            signals_table_name = os.environ.get('SIGNALS_TABLE', 'trading-system-signals')
+            sns_topic_arn = os.environ.get('SNS_TOPIC_ARN')
+            
+            signals_table = get_table(signals_table_name)
+            
+            # NEW: Initialize paper trading
+            trading_api = init_alpaca_paper_trading()
         
-        # NEW: Initialize paper trading
-        trading_api = init_alpaca_paper_trading()
+        market_open = is_market_open()
+        executor = PaperExecutor(trading_api) if trading_api else None
         
         # Always scan for opportunities with ML + Sentiment enhancement (EXISTING)
         print('📊 Scanning market with ML + Sentiment + Paper Trading enhancement')
         
-        # ENHANCED market scan with ML + Sentiment analysis (EXISTING)
-        signals = scan_enhanced_market_with_sentiment()
-        
-        print(f'📊 Found {len(signals)} enhanced trading signals with sentiment')
-        
-        # Always store signals (EXISTING FUNCTIONALITY)
-        stored_signals = 0
-        for signal in signals:
-            # Add market execution flag and ML confidence (EXISTING)
-            signal['execution_status'] = 'queued' if not is_market_open() else 'ready'
-            signal['market_open_at_creation'] = is_market_open()
-            signal['ml_enhanced'] = True
-            signal['sentiment_enhanced'] = True
-            signal['enhancement_version'] = '2.1'
-            # NEW: Add trading info
-            signal['trading_enabled'] = trading_api is not None
-            
-            if store_signal_in_dynamodb(signals_table, signal):
-                stored_signals += 1
+        # Streaming pipeline: fetch -> analyze -> store -> trade, one symbol at a time
+        signal_writer = BatchSignalWriter(signals_table, serializer=encode_signal, max_latency=SIGNAL_FLUSH_SECONDS)
+        trade_order = UniverseOrderBuffer(SCAN_SYMBOLS)
+        outcome = process_signal_stream(
+            stream_enhanced_signals(
+                max_workers=event.get('max_workers'),
+                fetch_timeout=event.get('fetch_timeout'),
+                on_symbol_done=trade_order.symbol_done
+            ),
+            signal_writer,
+            executor,
+            market_open,
+            trade_order=trade_order
+        )
         
-        # NEW: Execute paper trades if market is open and we have trading API
-        executed_trades = []
-        if trading_api and signals and is_market_open():
-            executed_trades = execute_paper_trades(trading_api, signals)
+        signals_found = outcome['signals_found']
+        stored_signals = signal_writer.items_written
+        executed_trades = outcome['executed_trades']
         
-        # NEW: Get portfolio status for notifications
-        portfolio_status = get_portfolio_summary(trading_api)
+        print(f'📊 Found {signals_found} enhanced trading signals with sentiment')
+        
+        # NEW: Get portfolio status for notifications - from the run's account snapshot
+        with timer('trade'):
+            portfolio_status = executor.portfolio_summary() if executor else None
         
         # Send notifications for high-confidence signals (EXISTING, BUT ENHANCED)
-        high_confidence_signals = [s for s in signals if s.get('confidence', 0) >= 70]
+        high_confidence_signals = outcome['high_confidence_signals']
+        sort_by_universe_order(high_confidence_signals, SCAN_SYMBOLS)
         
         print(f'🎯 High confidence ML + Sentiment signals: {len(high_confidence_signals)}')
         
@@ -188,6 +184,20 @@ def lambda_handler(event, context):
             if send_enhanced_trading_notifications(sns, sns_topic_arn, high_confidence_signals, executed_trades, portfolio_status):
                 notifications_sent = 1
         
+        # Materialized dashboard state, written once the scan is complete
+        snapshot_version = None
+        try:
+            snapshot_version = write_snapshot(signals_table, outcome['latest_signals'], portfolio_status, {
+                'symbols_scanned': len(SCAN_SYMBOLS),
+                'signals_found': signals_found,
+                'signals_stored': stored_signals,
+                'high_confidence_signals': len(high_confidence_signals),
+                'paper_trades_executed': len(executed_trades),
+                'market_open': market_open
+            })
+        except Exception as e:
+            print(f'❌ Error writing signal snapshot: {e}')
+        
         # Check market status for response (EXISTING)
         market_status = 'open' if is_market_open() else 'closed'
         execution_mode = 'immediate' if is_market_open() else 'queued'
@@ -198,8 +208,10 @@ def lambda_handler(event, context):
             'body': json.dumps({
                 'status': 'success',
                 'scanning_mode': 'ml_sentiment_enhanced_always_active_with_trading',
-                'signals_found': len(signals),
+                'signals_found': signals_found,
                 'signals_stored': stored_signals,
+                'signal_write_metrics': signal_writer.metrics_summary(),
+                'snapshot_version': snapshot_version,
                 'high_confidence_signals': len(high_confidence_signals),
                 'paper_trades_executed': len(executed_trades),
                 'executed_trades': executed_trades,
@@ -213,7 +225,8 @@ def lambda_handler(event, context):
                 'sentiment_enabled': True,
                 'trading_enabled': trading_api is not None,
                 'enhancement_active': True,
-                'message': f'ML + Sentiment + Trading Enhanced: Found {len(signals)} signals, executed {len(executed_trades)} trades - {"ready for execution" if is_market_open() else "queued for market open"}'
+                'message': f'ML + Sentiment + Trading Enhanced: Found {signals_found} signals, executed {len(executed_trades)} trades - {"ready for execution" if is_market_open() else "queued for market open"}',
+                'timing': metrics.finish()
             })
         }
         
@@ -227,7 +240,8 @@ def lambda_handler(event, context):
             'body': json.dumps({
                 'status': 'error',
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': datetime.now().isoformat(),
+                'timing': metrics.finish()
             })
         }
 
@@ -264,95 +278,34 @@ def is_market_open():
         # For enhanced mode, let's return True more often for testing
         return True
 
-def get_real_stock_data(symbol):
+def get_real_stock_data(symbol, timeout=None):
     """Get REAL stock data from Yahoo Finance API with enhanced data points (EXISTING)"""
     try:
-        # Yahoo Finance API endpoint - get more data for ML
-        url = f'https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?interval=1d&range=60d'
-        
-        # Create SSL context
-        context = ssl.create_default_context()
-        
-        # Make request
-        req = urllib.request.Request(url)
-        req.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-        
-        with urllib.request.urlopen(req, context=context) as response:
-            data = json.loads(response.read().decode())
-        
-        # Extract price data
-        result = data['chart']['result'][0]
-        timestamps = result['timestamp']
-        quotes = result['indicators']['quote'][0]
-        
-        if not timestamps or not quotes['close']:
-            return None
-        
-        # Get last 50 days of data for ML analysis
-        prices = []
-        for i in range(max(0, len(quotes['close']) - 50), len(quotes['close'])):
-            if quotes['close'][i] is not None:
-                prices.append({
-                    'close': quotes['close'][i],
-                    'volume': quotes['volume'][i] if quotes['volume'][i] else 1000000,
-                    'high': quotes['high'][i] if quotes['high'][i] else quotes['close'][i],
-                    'low': quotes['low'][i] if quotes['low'][i] else quotes['close'][i],
-                    'open': quotes['open'][i] if quotes['open'][i] else quotes['close'][i]
-                })
-        
-        return prices
+        # Last 50 days for ML analysis: cached history + batched live quote,
+        # with a per-symbol chart request only when the cache can't serve it
+        with timer('fetch', symbol):
+            return get_market_data().get_bars(symbol, 50, timeout=timeout or SCAN_FETCH_TIMEOUT)
         
     except Exception as e:
         print(f'Error fetching data for {symbol}: {e}')
         return None
 
-def get_sentiment_data(symbol):
-    """Get FREE sentiment analysis for the stock (EXISTING)"""
-    import random
-    
-    try:
-        # Simulate Reddit sentiment (in real version, this would scrape Reddit)
-        reddit_mentions = random.randint(3, 45)
-        reddit_sentiment = random.uniform(-0.6, 0.8)  # Slightly positive bias
-        
-        # Simulate news sentiment (in real version, this would analyze news)
-        news_articles = random.randint(2, 15)
-        news_sentiment = random.uniform(-0.4, 0.6)
-        
-        # Calculate combined sentiment
-        overall_sentiment = (reddit_sentiment * 0.4 + news_sentiment * 0.6)
-        
-        return {
-            'reddit_mentions': reddit_mentions,
-            'reddit_sentiment': reddit_sentiment,
-            'news_articles': news_articles,
-            'news_sentiment': news_sentiment,
-            'overall_sentiment': overall_sentiment,
-            'trending': reddit_mentions > 20
-        }
-    except Exception as e:
-        print(f'Error getting sentiment for {symbol}: {e}')
-        return {
-            'reddit_mentions': 5,
-            'reddit_sentiment': 0.0,
-            'news_articles': 3,
-            'news_sentiment': 0.0,
-            'overall_sentiment': 0.0,
-            'trending': False
-        }
+def get_sentiment_data(symbol, now=None):
+    """Get FREE sentiment analysis for the stock - fetched once per symbol per time bucket"""
+    return get_sentiment_provider().get(symbol, now)
 
-def calculate_enhanced_indicators(prices):
+def calculate_enhanced_indicators(prices, rsi_state=None):
     """Calculate enhanced technical indicators for ML-powered analysis (EXISTING)"""
     if len(prices) < 20:
         return {}
     
-    closes = [p['close'] for p in prices]
-    volumes = [p['volume'] for p in prices]
-    highs = [p['high'] for p in prices]
-    lows = [p['low'] for p in prices]
+    closes = bar_column(prices, 'close')
+    volumes = bar_column(prices, 'volume')
+    highs = bar_column(prices, 'high')
+    lows = bar_column(prices, 'low')
     
-    # Enhanced RSI calculation
-    rsi = calculate_rsi(prices)
+    # Enhanced RSI calculation - reuse a caller-maintained IncrementalRSI when given
+    rsi = rsi_state.value if rsi_state is not None else calculate_rsi(prices)
     
     # Multiple moving averages
     sma_5 = sum(closes[-5:]) / 5 if len(closes) >= 5 else closes[-1]
@@ -365,7 +318,8 @@ def calculate_enhanced_indicators(prices):
     momentum_5 = ((closes[-1] - closes[-6]) / closes[-6]) * 100 if len(closes) >= 6 else 0
     momentum_10 = ((closes[-1] - closes[-11]) / closes[-11]) * 100 if len(closes) >= 11 else 0
     
-    # Volatility measures
+    # Volatility measures (statistics loads decimal and fractions - deferred to first use)
+    import statistics
     volatility_10 = statistics.stdev(closes[-10:]) if len(closes) >= 10 else 0
     volatility_20 = statistics.stdev(closes[-20:]) if len(closes) >= 20 else 0
     
@@ -402,32 +356,26 @@ def calculate_enhanced_indicators(prices):
         'recent_low': recent_low
     }
 
-def calculate_rsi(prices, period=14):
-    """Enhanced RSI calculation (EXISTING)"""
-    if len(prices) < period + 1:
-        return 50  # Default neutral RSI
-    
-    closes = [p['close'] for p in prices]
-    deltas = [closes[i] - closes[i-1] for i in range(1, len(closes))]
-    
-    gains = [d if d > 0 else 0 for d in deltas]
-    losses = [-d if d < 0 else 0 for d in deltas]
-    
-    if len(gains) < period:
-        return 50
-    
-    avg_gain = sum(gains[-period:]) / period
-    avg_loss = sum(losses[-period:]) / period
-    
-    if avg_loss == 0:
-        return 100
+def calculate_enhanced_indicators_cached(symbol, prices):
+    """calculate_enhanced_indicators, reusing the symbol's completed-bar state across scans"""
+    if len(prices) < 20:
+        return {}
     
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
+    state = _indicator_states.get((symbol, RSI_MODE))
+    if state is None or not state.matches(prices):
+        state = LiveIndicatorState(prices[:-1], RSI_MODE)
+        _indicator_states.set((symbol, RSI_MODE), state)
     
-    return rsi
+    return state.indicators_for(prices[-1])
 
-def ml_enhanced_analysis_with_sentiment(symbol, data, indicators, sentiment_data):
+def calculate_rsi(prices, period=14, mode=None):
+    """Enhanced RSI calculation (EXISTING)"""
+    mode = mode or RSI_MODE
+    if mode == 'simple':
+        prices = prices[-(period + 1):]
+    return rsi_from_closes(bar_column(prices, 'close'), period, mode)
+
+def ml_enhanced_analysis_with_sentiment(symbol, data, indicators, sentiment_data, now=None):
     """ML-Enhanced signal analysis with SENTIMENT for maximum profitability (EXISTING)"""
     try:
         if not data or len(data) < 20:
@@ -607,12 +555,16 @@ def ml_enhanced_analysis_with_sentiment(symbol, data, indicators, sentiment_data
         sentiment_boost = abs(overall_sentiment) * 5  # Sentiment can add up to 5% more profit potential
         profit_potential = min(20, base_profit_potential + sentiment_boost)
         
+        # `now` lets replays stamp signals with the bar's time instead of the wall clock
+        now = now or utc_now()
+        timestamp = now.isoformat()
         signal = {
             'symbol': symbol,
             'signal_type': signal_type,
             'confidence': round(final_confidence, 1),
             'price': round(latest['close'], 2),
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': timestamp,
+            'date_bucket': date_bucket(timestamp),
             'reasons': reasons[:6],  # Top 6 reasons (including sentiment)
             'technical_data': {
                 'rsi': round(indicators['rsi'], 1),
@@ -632,7 +584,7 @@ def ml_enhanced_analysis_with_sentiment(symbol, data, indicators, sentiment_data
                 'trending': sentiment_data['trending'],
                 'sentiment_boost': round(sentiment_boost, 1)
             },
-            'ttl': int((datetime.now() + timedelta(days=7)).timestamp())
+            'ttl': int((now + timedelta(days=7)).timestamp())
         }
         
         return signal
@@ -641,62 +593,223 @@ def ml_enhanced_analysis_with_sentiment(symbol, data, indicators, sentiment_data
         print(f'Error in ML + Sentiment analysis for {symbol}: {e}')
         return None
 
-def scan_enhanced_market_with_sentiment():
-    """Scan market with ML + Sentiment enhancement for maximum profitability (EXISTING)"""
-    # Expanded stock universe for more opportunities
-    symbols = [
-        # Large Cap Tech (highest volume/opportunity)
-        'AAPL', 'GOOGL', 'MSFT', 'AMZN', 'META', 'TSLA', 'NVDA', 'NFLX',
-        'ADBE', 'CRM', 'ORCL', 'INTC', 'AMD', 'QCOM',
-        
-        # Financial (high momentum potential)
-        'JPM', 'BAC', 'GS', 'V', 'MA',
-        
-        # ETFs (diversified opportunities)
-        'SPY', 'QQQ', 'IWM', 'XLF', 'XLK',
-        
-        # High-beta stocks (maximum profit potential)
-        'PLTR', 'SNOW', 'COIN', 'ROKU', 'SHOP'
-    ]
+def fetch_stock_data_concurrently(symbols, max_workers=None, timeout=None):
+    """Fetch stock data for many symbols with bounded concurrency, yielding (symbol, data) as each completes
+    
+    At most two requests per worker are in flight, so fetched bars never pile up
+    ahead of a slower consumer however large the universe is.
+    """
+    if not symbols:
+        return
     
-    signals = []
+    max_workers = max(1, min(max_workers or SCAN_MAX_WORKERS, len(symbols)))
+    timeout = timeout or SCAN_FETCH_TIMEOUT
     
-    for symbol in symbols:
+    pending_symbols = iter(symbols)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+        for symbol in islice(pending_symbols, 2 * max_workers):
+            in_flight[executor.submit(get_real_stock_data, symbol, timeout)] = symbol
+        
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                symbol = in_flight.pop(future)
+                try:
+                    data = future.result()
+                except Exception as e:
+                    print(f'❌ Error fetching {symbol}: {e}')
+                    data = None
+                
+                for next_symbol in islice(pending_symbols, 1):
+                    in_flight[executor.submit(get_real_stock_data, next_symbol, timeout)] = next_symbol
+                
+                yield symbol, data
+
+def analyze_stock_data_stream(symbol_data, on_symbol_done=None):
+    """Analyze stage: (symbol, bars) pairs in, signals out as soon as each symbol is analyzed
+    
+    `on_symbol_done(symbol)` is called once each symbol is finished, whether or not it produced a signal.
+    """
+    for symbol, data in symbol_data:
         try:
             print(f'📈 ML + Sentiment analyzing {symbol}...')
             
-            # Get enhanced stock data
-            data = get_real_stock_data(symbol)
-            
             if not data:
                 print(f'⚠️ No data for {symbol}')
                 continue
             
             # Get sentiment data
-            sentiment_data = get_sentiment_data(symbol)
+            with timer('sentiment', symbol):
+                sentiment_data = get_sentiment_data(symbol)
             
-            # Calculate enhanced indicators
-            indicators = calculate_enhanced_indicators(data)
+            # Calculate enhanced indicators (only today's bar is new on a warm container)
+            with timer('indicators', symbol):
+                indicators = calculate_enhanced_indicators_cached(symbol, data)
             
             # ML + Sentiment enhanced analysis
-            signal = ml_enhanced_analysis_with_sentiment(symbol, data, indicators, sentiment_data)
+            with timer('analysis', symbol):
+                signal = ml_enhanced_analysis_with_sentiment(symbol, data, indicators, sentiment_data)
             
             if signal:
-                signals.append(signal)
                 sentiment_boost = signal["sentiment_data"]["sentiment_boost"]
                 print(f'🎯 ML + Sentiment Signal: {symbol} {signal["signal_type"]} at {signal["confidence"]:.1f}% confidence (Profit: {signal["technical_data"]["profit_potential"]:.1f}%, Sentiment boost: +{sentiment_boost:.1f}%)')
+                yield signal
             
         except Exception as e:
             print(f'❌ Error analyzing {symbol}: {e}')
             continue
+        
+        finally:
+            if on_symbol_done:
+                on_symbol_done(symbol)
+
+def stream_enhanced_signals(symbols=None, max_workers=None, fetch_timeout=None, on_symbol_done=None):
+    """Fetch -> analyze pipeline over a universe, yielding signals in completion order"""
+    symbols = symbols or SCAN_SYMBOLS
+    
+    # One batched quote request for the whole universe, then per-symbol bars from cache
+    with timer('prefetch_quotes'):
+        get_market_data().prefetch(symbols, fetch_timeout)
+    
+    # Sentiment for symbols not already fetched in this time bucket, in batched backend calls
+    with timer('prefetch_sentiment'):
+        get_sentiment_provider().prefetch(symbols)
+    
+    yield from analyze_stock_data_stream(fetch_stock_data_concurrently(symbols, max_workers, fetch_timeout), on_symbol_done)
+
+def scan_enhanced_market_with_sentiment(max_workers=None, fetch_timeout=None):
+    """Scan market with ML + Sentiment enhancement for maximum profitability (EXISTING)"""
+    signals = list(stream_enhanced_signals(SCAN_SYMBOLS, max_workers, fetch_timeout))
+    
+    # Keep universe order so downstream top-N selection stays deterministic
+    sort_by_universe_order(signals, SCAN_SYMBOLS)
     
     print(f'🤖 ML + Sentiment Enhanced scan complete: {len(signals)} profitable opportunities found')
     return signals
 
+def sort_by_universe_order(signals, symbols):
+    universe_order = {symbol: i for i, symbol in enumerate(symbols)}
+    signals.sort(key=lambda s: universe_order.get(s['symbol'], len(universe_order)))
+
+class UniverseOrderBuffer:
+    """Reorder buffer that releases tradeable signals in universe order as symbols finish
+    
+    A signal is released as soon as every symbol before it in the universe is
+    done, so trades go out while the scan is still running yet the run's few
+    trade slots go to the same signals whatever order fetches complete in.
+    Only signals and finished symbols ahead of the first unfinished one are held.
+    """
+    
+    def __init__(self, symbols, release=None):
+        self.positions = {symbol: i for i, symbol in enumerate(symbols)}
+        self.release = release
+        self.next_position = 0
+        # Position -> tradeable signal (or None) for finished symbols past next_position
+        self.finished = {}
+    
+    def add(self, signal):
+        """Hold a tradeable signal until its turn comes - its symbol counts as finished"""
+        self._finish(signal['symbol'], signal)
+    
+    def symbol_done(self, symbol):
+        """Mark a symbol finished (analysis stage callback)"""
+        self._finish(symbol, None)
+    
+    def _finish(self, symbol, signal):
+        position = self.positions.get(symbol)
+        if position is None:
+            # Outside the universe - nothing to wait for
+            if signal is not None:
+                self._release(signal)
+            return
+        if position < self.next_position:
+            return
+        if signal is not None or position not in self.finished:
+            self.finished[position] = signal
+        
+        while self.next_position in self.finished:
+            ready = self.finished.pop(self.next_position)
+            self.next_position += 1
+            if ready is not None:
+                self._release(ready)
+    
+    def _release(self, signal):
+        if self.release:
+            self.release(signal)
+    
+    def drain(self):
+        """Release whatever is still held, in universe order (end of stream)"""
+        for position in sorted(self.finished):
+            if self.finished[position] is not None:
+                self._release(self.finished[position])
+        self.finished = {}
+        self.next_position = len(self.positions)
+
+def process_signal_stream(signals, signal_writer, executor, market_open, trading_enabled=None, trade_order=None):
+    """Store each signal as it arrives; only high-confidence signals are kept for the summary
+    
+    `executor` is the run's PaperExecutor (None for signals only). Tradeable
+    signals are submitted while the stream is still running: through
+    `trade_order` (a UniverseOrderBuffer fed with the analysis stage's
+    finished symbols) in universe order, or straight away without one.
+    """
+    if trading_enabled is None:
+        trading_enabled = executor is not None
+    
+    signals_found = 0
+    high_confidence_signals = []
+    latest_signals = {}
+    
+    trading = executor is not None and market_open
+    if trade_order is not None:
+        trade_order.release = executor.submit if trading else None
+    
+    for signal in signals:
+        signals_found += 1
+        latest_signals[signal['symbol']] = compact_signal(signal)
+        
+        # Add market execution flag and ML confidence (EXISTING)
+        signal['execution_status'] = 'queued' if not market_open else 'ready'
+        signal['market_open_at_creation'] = market_open
+        signal['ml_enhanced'] = True
+        signal['sentiment_enhanced'] = True
+        signal['enhancement_version'] = '2.1'
+        # NEW: Add trading info
+        signal['trading_enabled'] = trading_enabled
+        
+        signal_writer.add(signal)
+        
+        # NEW: Paper trades go out as soon as a signal's turn comes; orders are sent concurrently
+        if trading and is_tradeable_signal(signal):
+            with timer('trade'):
+                if trade_order is not None:
+                    trade_order.add(signal)
+                else:
+                    executor.submit(signal)
+        
+        if signal.get('confidence', 0) >= 70:
+            high_confidence_signals.append(signal)
+    
+    signal_writer.flush()
+    
+    with timer('trade'):
+        if trade_order is not None:
+            trade_order.drain()
+        executed_trades = executor.collect() if executor else []
+    
+    return {
+        'signals_found': signals_found,
+        'high_confidence_signals': high_confidence_signals,
+        'executed_trades': executed_trades,
+        'latest_signals': latest_signals
+    }
+
+@timed('store')
 def store_signal_in_dynamodb(table, signal):
     """Store enhanced signal in DynamoDB (EXISTING)"""
     try:
-        table.put_item(Item=convert_floats_to_decimal(signal))
+        table.put_item(Item=encode_signal(signal))
         sentiment_boost = signal.get('sentiment_data', {}).get('sentiment_boost', 0)
         print(f'💾 Stored enhanced signal for {signal["symbol"]} (Confidence: {signal["confidence"]}%, Sentiment boost: +{sentiment_boost:.1f}%)')
         return True
@@ -705,6 +818,7 @@ def store_signal_in_dynamodb(table, signal):
         return False
 
 # ENHANCED: Send notifications with trading info
+@timed('notify')
 def send_enhanced_trading_notifications(sns_client, topic_arn, signals, executed_trades, portfolio_status):
     """Send enhanced email notifications with trading data"""
     try:
@@ -0,0 +1,245 @@
+"""
+⏱️ Scan Instrumentation
+
+Per-stage and per-symbol latency for a scan, as context-manager and
+decorator timers around fetch, indicators, analysis, store, trade and
+notify. Each handler starts one ScanMetrics per invocation; at the end it
+emits the samples as CloudWatch Embedded Metric Format (EMF) lines on
+stdout - one histogram per stage and one document per symbol - and returns
+a timing breakdown for the response body.
+
+Timers look up the active ScanMetrics when they run, so instrumented code
+needs no handle to it. With METRICS_ENABLED=0 (and outside a handler) the
+timers are no-ops: timer() returns a shared null context manager and timed()
+calls straight through.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') not in ('0', 'false', 'False')
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'TradingSystem')
+
+# Per-symbol EMF documents create one CloudWatch metric per symbol and stage
+METRICS_PER_SYMBOL = os.environ.get('METRICS_PER_SYMBOL', '1') not in ('0', 'false', 'False')
+
+# EMF accepts at most 100 distinct values per histogram
+MAX_HISTOGRAM_VALUES = 100
+
+# Symbols listed in the response breakdown
+SLOWEST_SYMBOLS = 5
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    __slots__ = ('metrics', 'stage', 'symbol', 'started')
+
+    def __init__(self, metrics, stage, symbol):
+        self.metrics = metrics
+        self.stage = stage
+        self.symbol = symbol
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.record(self.stage, (time.perf_counter() - self.started) * 1000, self.symbol)
+        return False
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def histogram(samples):
+    """EMF Values/Counts for latency samples, rounded to 2 significant digits (1 if still too many)"""
+    for digits in (2, 1):
+        counts = {}
+        for sample in samples:
+            value = float(f'{sample:.{digits}g}')
+            counts[value] = counts.get(value, 0) + 1
+        if len(counts) <= MAX_HISTOGRAM_VALUES:
+            break
+
+    values = sorted(counts)[:MAX_HISTOGRAM_VALUES]
+    return {
+        'Values': values,
+        'Counts': [counts[value] for value in values],
+        'Min': min(samples),
+        'Max': max(samples),
+        'Count': len(samples),
+        'Sum': sum(samples)
+    }
+
+class ScanMetrics:
+    """Latency samples for one invocation, by stage and by symbol"""
+
+    def __init__(self, service='scan', enabled=None, namespace=None, per_symbol=None):
+        self.service = service
+        self.enabled = METRICS_ENABLED if enabled is None else enabled
+        self.namespace = namespace or METRICS_NAMESPACE
+        self.per_symbol = METRICS_PER_SYMBOL if per_symbol is None else per_symbol
+
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.symbols = {}
+        self._lock = threading.Lock()
+
+    def timer(self, stage, symbol=None):
+        """Context manager timing one stage (for one symbol, when given)"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage, symbol)
+
+    def record(self, stage, elapsed_ms, symbol=None):
+        """Add one latency sample - fetches report from worker threads, so this locks"""
+        with self._lock:
+            self.stages.setdefault(stage, []).append(elapsed_ms)
+            if symbol is not None:
+                self.symbols.setdefault(symbol, {}).setdefault(stage, []).append(elapsed_ms)
+
+    def breakdown(self):
+        """Where the invocation's time went: per-stage totals and percentiles, slowest symbols"""
+        if not self.enabled:
+            return None
+
+        stages = {}
+        for stage, samples in self.stages.items():
+            ordered = sorted(samples)
+            stages[stage] = {
+                'count': len(samples),
+                'total_ms': round(sum(samples), 1),
+                'avg_ms': round(sum(samples) / len(samples), 1),
+                'p50_ms': round(_percentile(ordered, 0.5), 1),
+                'p90_ms': round(_percentile(ordered, 0.9), 1),
+                'max_ms': round(ordered[-1], 1)
+            }
+
+        symbol_totals = sorted(
+            ((sum(sum(samples) for samples in symbol_stages.values()), symbol) for symbol, symbol_stages in self.symbols.items()),
+            reverse=True
+        )
+        slowest = [
+            dict({'symbol': symbol, 'total_ms': round(total, 1)}, **{stage: round(sum(samples), 1) for stage, samples in self.symbols[symbol].items()})
+            for total, symbol in symbol_totals[:SLOWEST_SYMBOLS]
+        ]
+
+        return {
+            # Stage totals add up work across threads, so they can exceed the wall time
+            'wall_ms': round((time.perf_counter() - self.started) * 1000, 1),
+            'stages': stages,
+            'symbols_timed': len(self.symbols),
+            'slowest_symbols': slowest
+        }
+
+    def emf_documents(self, timestamp_ms=None):
+        """EMF documents: one latency histogram per stage, one per symbol"""
+        timestamp_ms = timestamp_ms or int(time.time() * 1000)
+        documents = []
+
+        for stage, samples in self.stages.items():
+            documents.append({
+                '_aws': {
+                    'Timestamp': timestamp_ms,
+                    'CloudWatchMetrics': [{
+                        'Namespace': self.namespace,
+                        'Dimensions': [['Service', 'Stage']],
+                        'Metrics': [{'Name': 'Latency', 'Unit': 'Milliseconds'}]
+                    }]
+                },
+                'Service': self.service,
+                'Stage': stage,
+                'Latency': histogram(samples)
+            })
+
+        if self.per_symbol:
+            for symbol, stages in self.symbols.items():
+                document = {
+                    '_aws': {
+                        'Timestamp': timestamp_ms,
+                        'CloudWatchMetrics': [{
+                            'Namespace': self.namespace,
+                            'Dimensions': [['Service', 'Symbol']],
+                            'Metrics': [{'Name': f'{stage}_latency', 'Unit': 'Milliseconds'} for stage in stages]
+                        }]
+                    },
+                    'Service': self.service,
+                    'Symbol': symbol
+                }
+                for stage, samples in stages.items():
+                    document[f'{stage}_latency'] = histogram(samples)
+                documents.append(document)
+
+        return documents
+
+    def emit(self):
+        """Print the EMF documents - Lambda forwards stdout to CloudWatch Logs, which extracts the metrics"""
+        for document in self.emf_documents():
+            print(json.dumps(document))
+
+    def finish(self):
+        """Emit the invocation's metrics and return its timing breakdown (None when disabled)"""
+        if not self.enabled:
+            return None
+        summary = self.breakdown()
+        self.emit()
+        return summary
+
+# Metrics of the running invocation - disabled until a handler starts one
+_current = ScanMetrics(enabled=False)
+
+def start_scan(service, enabled=None):
+    """Begin collecting metrics for a new invocation"""
+    global _current
+    _current = ScanMetrics(service, enabled)
+    return _current
+
+def current_metrics():
+    return _current
+
+def resume_scan(metrics):
+    """Make an earlier invocation's metrics current again (after an in-process worker replaced them)"""
+    global _current
+    _current = metrics
+
+def timer(stage, symbol=None):
+    """Time a block against the running invocation's metrics"""
+    return _current.timer(stage, symbol)
+
+def timed(stage):
+    """Decorator timing every call of a function as `stage`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = _current
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            with metrics.timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def merge_breakdowns(breakdowns):
+    """Combine per-shard breakdowns into per-stage totals (percentiles don't merge, so only count/total/max)"""
+    stages = {}
+    for breakdown in breakdowns:
+        for stage, entry in (breakdown or {}).get('stages', {}).items():
+            merged = stages.setdefault(stage, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            merged['count'] += entry['count']
+            merged['total_ms'] = round(merged['total_ms'] + entry['total_ms'], 1)
+            merged['max_ms'] = max(merged['max_ms'], entry['max_ms'])
+
+    for merged in stages.values():
+        merged['avg_ms'] = round(merged['total_ms'] / merged['count'], 1) if merged['count'] else 0
+    return stages
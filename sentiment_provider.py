@@ -0,0 +1,177 @@
+"""
+💬 Sentiment Provider
+
+Sentiment is looked up per (symbol, time bucket): within a bucket every
+scan reuses the first fetch, so a slow Reddit/news source is hit at most
+once per symbol per bucket instead of once per symbol per scan. Like the
+market data adapter, a scan prefetches its whole universe in batched
+backend calls first; the cache lives at module scope and survives warm
+invocations.
+
+Backends implement fetch(symbols, moment) -> {symbol: sentiment} for a
+batch of symbols:
+
+- StubSentimentBackend: the random placeholder used until real sources are wired
+- FixtureSentimentBackend: deterministic per (seed, symbol, bucket), for tests and backtests
+"""
+
+import os
+import random
+import threading
+from datetime import datetime
+
+from warm_cache import TTLCache
+
+# Sentiment is refreshed once per bucket
+SENTIMENT_BUCKET_MINUTES = int(os.environ.get('SENTIMENT_BUCKET_MINUTES', '60'))
+
+# Symbols per backend fetch
+SENTIMENT_BATCH_SIZE = int(os.environ.get('SENTIMENT_BATCH_SIZE', '50'))
+
+# 'stub' (random placeholder) or 'fixture' (deterministic)
+SENTIMENT_BACKEND = os.environ.get('SENTIMENT_BACKEND', 'stub')
+SENTIMENT_FIXTURE_SEED = int(os.environ.get('SENTIMENT_FIXTURE_SEED', '0'))
+
+SENTIMENT_CACHE_MAX_ENTRIES = int(os.environ.get('SENTIMENT_CACHE_MAX_ENTRIES', '5000'))
+
+# Served when the backend fails - no sentiment boost either way
+NEUTRAL_SENTIMENT = {
+    'reddit_mentions': 5,
+    'reddit_sentiment': 0.0,
+    'news_articles': 3,
+    'news_sentiment': 0.0,
+    'overall_sentiment': 0.0,
+    'trending': False
+}
+
+def random_sentiment(rng):
+    """Sentiment with the placeholder's shape and ranges, drawn from `rng`"""
+    # Simulate Reddit sentiment (in real version, this would scrape Reddit)
+    reddit_mentions = rng.randint(3, 45)
+    reddit_sentiment = rng.uniform(-0.6, 0.8)  # Slightly positive bias
+
+    # Simulate news sentiment (in real version, this would analyze news)
+    news_articles = rng.randint(2, 15)
+    news_sentiment = rng.uniform(-0.4, 0.6)
+
+    return {
+        'reddit_mentions': reddit_mentions,
+        'reddit_sentiment': reddit_sentiment,
+        'news_articles': news_articles,
+        'news_sentiment': news_sentiment,
+        'overall_sentiment': reddit_sentiment * 0.4 + news_sentiment * 0.6,
+        'trending': reddit_mentions > 20
+    }
+
+def fixture_sentiment(seed, symbol, label):
+    """Deterministic sentiment for a symbol and bucket label"""
+    return random_sentiment(random.Random(f'{seed}:{symbol}:{label}'))
+
+def bucket_label(moment, bucket_minutes=None):
+    """Readable bucket key: the day for daily buckets, else the bucket's start time"""
+    bucket_minutes = bucket_minutes or SENTIMENT_BUCKET_MINUTES
+    if bucket_minutes % 1440 == 0:
+        return f'{moment:%Y-%m-%d}'
+    minute_of_day = (moment.hour * 60 + moment.minute) // bucket_minutes * bucket_minutes
+    return f'{moment:%Y-%m-%d}T{minute_of_day // 60:02d}:{minute_of_day % 60:02d}'
+
+class StubSentimentBackend:
+    """Random placeholder for the Reddit and news sources"""
+
+    def fetch(self, symbols, moment):
+        return {symbol: random_sentiment(random) for symbol in symbols}
+
+class FixtureSentimentBackend:
+    """Deterministic sentiment keyed by (seed, symbol, bucket) - identical across runs"""
+
+    def __init__(self, seed=None, bucket_minutes=None):
+        self.seed = SENTIMENT_FIXTURE_SEED if seed is None else seed
+        self.bucket_minutes = bucket_minutes or SENTIMENT_BUCKET_MINUTES
+        self.calls = 0
+
+    def fetch(self, symbols, moment):
+        self.calls += 1
+        label = bucket_label(moment, self.bucket_minutes)
+        return {symbol: fixture_sentiment(self.seed, symbol, label) for symbol in symbols}
+
+class SentimentProvider:
+    """Per-(symbol, bucket) sentiment with batched backend fetches and a warm TTL cache"""
+
+    def __init__(self, backend=None, cache=None, bucket_minutes=None, batch_size=None):
+        self.backend = backend or StubSentimentBackend()
+        self.bucket_minutes = bucket_minutes or SENTIMENT_BUCKET_MINUTES
+        self.batch_size = batch_size or SENTIMENT_BATCH_SIZE
+        self.cache = cache or TTLCache(max_entries=SENTIMENT_CACHE_MAX_ENTRIES, ttl=self.bucket_minutes * 60)
+        self.stats = {'fetched': 0, 'batches': 0, 'cache_hits': 0, 'failures': 0}
+        self._lock = threading.Lock()
+
+    def bucket(self, moment):
+        return bucket_label(moment, self.bucket_minutes)
+
+    def _fetch(self, symbols, moment):
+        """Fetch and cache `symbols` in backend batches; failed batches are retried on the next call"""
+        bucket = self.bucket(moment)
+        fetched = {}
+        for start in range(0, len(symbols), self.batch_size):
+            batch = symbols[start:start + self.batch_size]
+            try:
+                results = self.backend.fetch(batch, moment)
+            except Exception as e:
+                print(f'⚠️ Sentiment fetch failed for {len(batch)} symbols: {e}')
+                self.stats['failures'] += 1
+                continue
+
+            self.stats['batches'] += 1
+            for symbol, sentiment in results.items():
+                self.cache.set((symbol, bucket), sentiment)
+                fetched[symbol] = sentiment
+            self.stats['fetched'] += len(results)
+        return fetched
+
+    def prefetch(self, symbols, now=None):
+        """Fetch sentiment for every symbol not yet cached in the current bucket"""
+        now = now or datetime.now()
+        bucket = self.bucket(now)
+        with self._lock:
+            missing = [symbol for symbol in dict.fromkeys(symbols) if self.cache.get((symbol, bucket)) is None]
+            if missing:
+                self._fetch(missing, now)
+        print(f'💬 Sentiment: {len(missing)}/{len(symbols)} symbols fetched for bucket {bucket}')
+
+    def get(self, symbol, now=None):
+        """Sentiment for a symbol in the current bucket, fetching it only on a cache miss"""
+        now = now or datetime.now()
+        key = (symbol, self.bucket(now))
+
+        sentiment = self.cache.get(key)
+        if sentiment is None:
+            with self._lock:
+                # Another thread may have fetched it while we waited
+                sentiment = self.cache.get(key) or self._fetch([symbol], now).get(symbol)
+        else:
+            self.stats['cache_hits'] += 1
+
+        return sentiment if sentiment is not None else dict(NEUTRAL_SENTIMENT)
+
+    def __call__(self, symbol, moment):
+        """Sentiment source interface used by the replay engine"""
+        return self.get(symbol, moment)
+
+def create_sentiment_backend(name=None):
+    """Backend by name ('stub' or 'fixture')"""
+    name = name or SENTIMENT_BACKEND
+    if name == 'fixture':
+        return FixtureSentimentBackend()
+    if name == 'stub':
+        return StubSentimentBackend()
+    raise ValueError(f'Unknown sentiment backend: {name}')
+
+# Shared across warm Lambda invocations of this container
+_provider = None
+
+def get_sentiment_provider():
+    """Module-level provider, created on first use"""
+    global _provider
+    if _provider is None:
+        _provider = SentimentProvider(create_sentiment_backend())
+    return _provider
@@ -0,0 +1,268 @@
+"""
+🧩 Sharded Market Scan
+
+Fans a scan out across Lambda invocations so the universe is no longer
+bounded by one function's 300s timeout:
+
+- coordinator_handler partitions the universe into shards and invokes one
+  worker per shard concurrently
+- worker_handler scans and stores one shard, returning its high-confidence
+  signals
+- aggregate_shard_results merges the shard results; the coordinator then
+  places paper trades and sends the single SNS summary for the whole run
+
+Workers never trade, so the per-run trade cap still applies to the universe
+as a whole. LocalInvoker runs workers in-process for local testing.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from aws_clients import get_client, get_table
+from dynamo_codec import encode_signal
+from real_lambda_function import (
+    SCAN_SYMBOLS,
+    SIGNAL_FLUSH_SECONDS,
+    init_alpaca_paper_trading,
+    is_market_open,
+    process_signal_stream,
+    send_enhanced_trading_notifications,
+    sort_by_universe_order,
+    stream_enhanced_signals
+)
+from paper_execution import PaperExecutor
+from scan_metrics import current_metrics, merge_breakdowns, resume_scan, start_scan, timer
+from signal_snapshot import write_snapshot
+from signal_writer import BatchSignalWriter
+from universe_registry import universe_symbols
+
+# Symbols per worker invocation, and how many workers run at once
+SCAN_SHARD_SIZE = int(os.environ.get('SCAN_SHARD_SIZE', '50'))
+SCAN_MAX_SHARDS_IN_FLIGHT = int(os.environ.get('SCAN_MAX_SHARDS_IN_FLIGHT', '20'))
+SCAN_WORKER_FUNCTION = os.environ.get('SCAN_WORKER_FUNCTION', 'trading-system-scan-worker')
+
+# The worker function's own timeout (template.yaml) - a synchronous invoke may take this long
+SCAN_WORKER_TIMEOUT = int(os.environ.get('SCAN_WORKER_TIMEOUT', '300'))
+
+# Wait out the slowest worker, and never re-invoke on a timeout: a retried
+# invoke would scan and store the shard a second time
+LAMBDA_INVOKE_CONFIG = {
+    'read_timeout': SCAN_WORKER_TIMEOUT + 10,
+    'connect_timeout': 10,
+    'retries': {'max_attempts': 0}
+}
+
+def partition_universe(symbols, shard_size=None):
+    """Split a universe into contiguous shards of at most `shard_size` symbols"""
+    shard_size = max(1, shard_size or SCAN_SHARD_SIZE)
+    return [symbols[start:start + shard_size] for start in range(0, len(symbols), shard_size)]
+
+class LambdaInvoker:
+    """Synchronous worker invocation through the Lambda API"""
+
+    def __init__(self, function_name=None, client=None):
+        self.function_name = function_name or SCAN_WORKER_FUNCTION
+        self.client = client or get_client('lambda', LAMBDA_INVOKE_CONFIG)
+
+    def __call__(self, payload):
+        response = self.client.invoke(
+            FunctionName=self.function_name,
+            InvocationType='RequestResponse',
+            Payload=json.dumps(payload).encode()
+        )
+        result = json.loads(response['Payload'].read())
+        if response.get('FunctionError'):
+            raise RuntimeError(f'Worker failed: {result}')
+        return result
+
+class LocalInvoker:
+    """In-process stand-in for LambdaInvoker - payloads still round-trip through JSON"""
+
+    def __init__(self, handler=None):
+        self.handler = handler or worker_handler
+        self.payloads = []
+
+    def __call__(self, payload):
+        self.payloads.append(payload)
+        # The worker starts its own metrics; hand the caller's back afterwards
+        # (concurrent local workers record into whichever metrics are current)
+        metrics = current_metrics()
+        try:
+            return json.loads(json.dumps(self.handler(json.loads(json.dumps(payload)), None)))
+        finally:
+            resume_scan(metrics)
+
+def worker_handler(event, context):
+    """Scan and store one shard; returns counts plus the shard's high-confidence signals"""
+    shard_id = event.get('shard_id', 0)
+    symbols = event['symbols']
+    print(f'🧩 Shard {shard_id}: scanning {len(symbols)} symbols')
+    metrics = start_scan('scan-worker')
+
+    signals_table = get_table()
+    signal_writer = BatchSignalWriter(signals_table, serializer=encode_signal, max_latency=SIGNAL_FLUSH_SECONDS)
+
+    # Trading happens once in the coordinator, after all shards report back
+    outcome = process_signal_stream(
+        stream_enhanced_signals(symbols, event.get('max_workers'), event.get('fetch_timeout')),
+        signal_writer,
+        None,
+        event.get('market_open', is_market_open()),
+        trading_enabled=event.get('trading_enabled', False)
+    )
+
+    print(f'🧩 Shard {shard_id}: {outcome["signals_found"]} signals, {signal_writer.items_written} stored')
+    return {
+        'shard_id': shard_id,
+        'symbols_scanned': len(symbols),
+        'signals_found': outcome['signals_found'],
+        'signals_stored': signal_writer.items_written,
+        'high_confidence_signals': outcome['high_confidence_signals'],
+        'latest_signals': outcome['latest_signals'],
+        'timing': metrics.finish()
+    }
+
+def aggregate_shard_results(results, universe):
+    """Merge worker results into one run summary, with signals in universe order"""
+    summary = {
+        'shards': len(results),
+        'failed_shards': [],
+        'symbols_scanned': 0,
+        'signals_found': 0,
+        'signals_stored': 0,
+        'high_confidence_signals': [],
+        'latest_signals': {},
+        'shard_timing': {}
+    }
+    breakdowns = []
+
+    for result in results:
+        if 'error' in result:
+            summary['failed_shards'].append({'shard_id': result['shard_id'], 'error': result['error'], 'symbols': result['symbols']})
+            continue
+        summary['symbols_scanned'] += result['symbols_scanned']
+        summary['signals_found'] += result['signals_found']
+        summary['signals_stored'] += result['signals_stored']
+        summary['high_confidence_signals'].extend(result['high_confidence_signals'])
+        summary['latest_signals'].update(result['latest_signals'])
+        breakdowns.append(result.get('timing'))
+
+    summary['shard_timing'] = merge_breakdowns(breakdowns)
+    sort_by_universe_order(summary['high_confidence_signals'], universe)
+    return summary
+
+def run_sharded_scan(universe, invoker, shard_size=None, max_in_flight=None, worker_event=None):
+    """Invoke one worker per shard concurrently and aggregate what they return"""
+    shards = partition_universe(universe, shard_size)
+    max_in_flight = max(1, min(max_in_flight or SCAN_MAX_SHARDS_IN_FLIGHT, len(shards) or 1))
+    print(f'🧩 Fanning out {len(universe)} symbols across {len(shards)} shards ({max_in_flight} at a time)')
+
+    def invoke(shard_id):
+        payload = dict(worker_event or {}, shard_id=shard_id, symbols=shards[shard_id])
+        try:
+            return invoker(payload)
+        except Exception as e:
+            # Not retried here: a worker that timed out on our side may still have stored
+            # its signals. The failed shard and its symbols are reported instead.
+            print(f'❌ Shard {shard_id} failed ({len(shards[shard_id])} symbols not scanned): {e}')
+            return {'shard_id': shard_id, 'error': str(e), 'symbols': shards[shard_id]}
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        results = list(executor.map(invoke, range(len(shards))))
+
+    return aggregate_shard_results(results, universe)
+
+def coordinator_handler(event, context, invoker=None):
+    """Sharded scan entry point: fan out, then trade and notify once for the whole universe"""
+    print('🧩 Sharded scan coordinator started')
+    metrics = start_scan('scan-coordinator')
+
+    try:
+        universe = event.get('symbols') or (universe_symbols(event['universe'], top_n=event.get('top_n')) if event.get('universe') else SCAN_SYMBOLS)
+        market_open = is_market_open()
+        with timer('init'):
+            trading_api = init_alpaca_paper_trading()
+            sns_topic_arn = os.environ.get('SNS_TOPIC_ARN')
+            signals_table = get_table()
+
+        with timer('shards'):
+            summary = run_sharded_scan(
+                universe,
+                invoker or LambdaInvoker(),
+                shard_size=event.get('shard_size'),
+                max_in_flight=event.get('max_shards_in_flight'),
+                worker_event={
+                    'market_open': market_open,
+                    'trading_enabled': trading_api is not None,
+                    'max_workers': event.get('max_workers'),
+                    'fetch_timeout': event.get('fetch_timeout')
+                }
+            )
+        high_confidence_signals = summary['high_confidence_signals']
+
+        executor = PaperExecutor(trading_api) if trading_api else None
+
+        with timer('trade'):
+            executed_trades = []
+            if executor and high_confidence_signals and market_open:
+                executed_trades = executor.execute(high_confidence_signals)
+
+            portfolio_status = executor.portfolio_summary() if executor else None
+
+        notifications_sent = 0
+        if high_confidence_signals and sns_topic_arn:
+            if send_enhanced_trading_notifications(get_client('sns'), sns_topic_arn, high_confidence_signals, executed_trades, portfolio_status):
+                notifications_sent = 1
+
+        snapshot_version = None
+        try:
+            snapshot_version = write_snapshot(signals_table, summary['latest_signals'], portfolio_status, {
+                'symbols_scanned': summary['symbols_scanned'],
+                'signals_found': summary['signals_found'],
+                'signals_stored': summary['signals_stored'],
+                'high_confidence_signals': len(high_confidence_signals),
+                'paper_trades_executed': len(executed_trades),
+                'market_open': market_open,
+                'shards': summary['shards'],
+                'failed_shards': len(summary['failed_shards'])
+            })
+        except Exception as e:
+            print(f'❌ Error writing signal snapshot: {e}')
+
+        print(f'✅ Sharded scan complete: {summary["signals_found"]} signals from {summary["shards"]} shards, {len(executed_trades)} trades')
+        return {
+            'statusCode': 200,
+            'body': json.dumps({
+                'status': 'success' if not summary['failed_shards'] else 'partial',
+                'scanning_mode': 'sharded',
+                'shards': summary['shards'],
+                'failed_shards': summary['failed_shards'],
+                'symbols_scanned': summary['symbols_scanned'],
+                'signals_found': summary['signals_found'],
+                'signals_stored': summary['signals_stored'],
+                'high_confidence_signals': len(high_confidence_signals),
+                'paper_trades_executed': len(executed_trades),
+                'executed_trades': executed_trades,
+                'notifications_sent': notifications_sent,
+                'snapshot_version': snapshot_version,
+                'timestamp': datetime.now().isoformat(),
+                'market_status': 'open' if market_open else 'closed',
+                'trading_mode': 'paper_trading' if trading_api else 'signals_only',
+                'timing': metrics.finish(),
+                'shard_timing': summary['shard_timing']
+            })
+        }
+
+    except Exception as e:
+        print(f'❌ Error in sharded scan coordinator: {str(e)}')
+        return {
+            'statusCode': 500,
+            'body': json.dumps({
+                'status': 'error',
+                'error': str(e),
+                'timestamp': datetime.now().isoformat(),
+                'timing': metrics.finish()
+            })
+        }
@@ -0,0 +1,212 @@
+"""
+🔎 Signal Query API
+
+Read path for the dashboard. Signals carry a `date_bucket` attribute
+(the UTC day, YYYY-MM-DD, of their timestamp), and the signals table has a
+global secondary index on (date_bucket, timestamp). "Latest N signals" and
+"signals since T" walk that index one day bucket at a time, newest first,
+so each request reads only the items it returns - no table scans.
+
+Results are paginated with an opaque cursor that records the bucket and the
+DynamoDB LastEvaluatedKey to resume from. view=snapshot returns the
+materialized latest-state item instead (see signal_snapshot.py).
+
+Signal timestamps are naive ISO strings in UTC (utc_now(); Lambda's local
+time is UTC as well), so a bucket is a UTC calendar day.
+
+Signals written before the index existed have no date_bucket, and a GSI
+leaves such items out. Rather than fall back to table scans on the read
+path, operation=backfill_date_buckets adds the attribute to them once
+after deploying; new signals expire after 7 days anyway.
+"""
+
+import base64
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from aws_clients import get_table
+from dynamo_codec import decode_signal
+from signal_snapshot import read_snapshot
+
+SIGNALS_DATE_INDEX = os.environ.get('SIGNALS_DATE_INDEX', 'signals-by-date')
+
+# Signals expire after 7 days (see the ttl attribute), so older buckets are empty
+SIGNAL_LOOKBACK_DAYS = int(os.environ.get('SIGNAL_LOOKBACK_DAYS', '7'))
+MAX_PAGE_SIZE = 100
+
+def utc_now():
+    """Current time as a naive UTC datetime - the clock signal timestamps use"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def utc_timestamp(timestamp):
+    """ISO timestamp as naive UTC; one with an offset is converted, a naive one is taken as UTC"""
+    # Python 3.9's fromisoformat (the Lambda runtime) does not accept a 'Z' suffix
+    moment = datetime.fromisoformat(timestamp[:-1] + '+00:00' if timestamp.endswith('Z') else timestamp)
+    if moment.tzinfo is not None:
+        return moment.astimezone(timezone.utc).replace(tzinfo=None).isoformat()
+    return timestamp
+
+def date_bucket(timestamp):
+    """Index partition for an ISO timestamp: its UTC calendar day"""
+    return utc_timestamp(timestamp)[:10]
+
+def encode_cursor(bucket, last_key):
+    return base64.urlsafe_b64encode(json.dumps({'bucket': bucket, 'key': last_key}).encode()).decode()
+
+def decode_cursor(cursor):
+    state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return state['bucket'], state.get('key')
+
+def query_signals(table, limit=20, since=None, cursor=None, now=None, index_name=None):
+    """Newest-first page of signals, optionally only those at or after `since` (ISO timestamp)
+
+    Returns (items, next_cursor); next_cursor is None once the range is exhausted.
+    """
+    # Only the query path needs boto3's condition builders - date_bucket users never load them
+    from boto3.dynamodb.conditions import Key
+
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    now = now or utc_now()
+    if since:
+        since = utc_timestamp(since)
+    oldest_bucket = date_bucket(since) if since else (now - timedelta(days=SIGNAL_LOOKBACK_DAYS)).strftime('%Y-%m-%d')
+
+    if cursor:
+        bucket, start_key = decode_cursor(cursor)
+    else:
+        bucket, start_key = now.strftime('%Y-%m-%d'), None
+
+    items = []
+    while bucket >= oldest_bucket:
+        condition = Key('date_bucket').eq(bucket)
+        if since:
+            condition = condition & Key('timestamp').gte(since)
+
+        params = {
+            'IndexName': index_name or SIGNALS_DATE_INDEX,
+            'KeyConditionExpression': condition,
+            'ScanIndexForward': False,
+            'Limit': limit - len(items)
+        }
+        if start_key:
+            params['ExclusiveStartKey'] = start_key
+
+        response = table.query(**params)
+        items.extend(decode_signal(item) for item in response.get('Items', []))
+        start_key = response.get('LastEvaluatedKey')
+
+        if not start_key:
+            # Bucket exhausted - continue with the previous day
+            bucket = (datetime.strptime(bucket, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+
+        if len(items) >= limit:
+            break
+
+    next_cursor = encode_cursor(bucket, start_key) if len(items) >= limit and bucket >= oldest_bucket else None
+    return items, next_cursor
+
+def backfill_date_buckets(table, start_key=None, deadline=None):
+    """Add date_bucket to signals written before the date index existed
+
+    Scans for items without the attribute and sets it from their timestamp;
+    conditional updates make re-runs harmless. Stops after the page in which
+    `deadline` (a monotonic time) passes and returns the key to resume from.
+    """
+    from botocore.exceptions import ClientError
+
+    updated = 0
+    while True:
+        params = {
+            'FilterExpression': 'attribute_not_exists(date_bucket)',
+            'ProjectionExpression': '#sym, #ts',
+            'ExpressionAttributeNames': {'#sym': 'symbol', '#ts': 'timestamp'}
+        }
+        if start_key:
+            params['ExclusiveStartKey'] = start_key
+        response = table.scan(**params)
+
+        for item in response.get('Items', []):
+            try:
+                bucket = date_bucket(item['timestamp'])
+            except ValueError:
+                # Not a signal (the snapshot item's sort key is 'latest')
+                continue
+            try:
+                table.update_item(
+                    Key={'symbol': item['symbol'], 'timestamp': item['timestamp']},
+                    UpdateExpression='SET date_bucket = :bucket',
+                    ConditionExpression='attribute_exists(#sym) AND attribute_not_exists(date_bucket)',
+                    ExpressionAttributeNames={'#sym': 'symbol'},
+                    ExpressionAttributeValues={':bucket': bucket}
+                )
+                updated += 1
+            except ClientError as e:
+                # Expired or already backfilled meanwhile
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+
+        start_key = response.get('LastEvaluatedKey')
+        if not start_key or (deadline is not None and time.monotonic() >= deadline):
+            break
+
+    print(f'🔎 Backfilled date_bucket on {updated} signals (done={start_key is None})')
+    return {'updated': updated, 'next_key': start_key}
+
+def lambda_handler(event, context):
+    """GET-style entry point: limit, since, cursor or view=snapshot from the event or its query string
+
+    operation=backfill_date_buckets (with an optional start_key to resume) runs the one-off backfill.
+    """
+    params = (event or {}).get('queryStringParameters') or event or {}
+
+    try:
+        table = get_table()
+
+        if params.get('operation') == 'backfill_date_buckets':
+            # One-off maintenance run - leaves headroom inside the Lambda timeout
+            deadline = time.monotonic() + context.get_remaining_time_in_millis() / 1000 - 10 if context else None
+            result = backfill_date_buckets(table, params.get('start_key'), deadline)
+            return {
+                'statusCode': 200,
+                'body': json.dumps(dict(result, status='success'))
+            }
+
+        if params.get('view') == 'snapshot':
+            snapshot = read_snapshot(table)
+            return {
+                'statusCode': 200,
+                'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+                'body': json.dumps({'status': 'success', 'snapshot': snapshot})
+            }
+
+        items, next_cursor = query_signals(
+            table,
+            limit=params.get('limit', 20),
+            since=params.get('since'),
+            cursor=params.get('cursor')
+        )
+
+        print(f'🔎 Served {len(items)} signals (since={params.get("since")}, more={next_cursor is not None})')
+        return {
+            'statusCode': 200,
+            'headers': {'Content-Type': 'application/json', 'Access-Control-Allow-Origin': '*'},
+            'body': json.dumps({
+                'status': 'success',
+                'items': items,
+                'count': len(items),
+                'next_cursor': next_cursor
+            })
+        }
+
+    except Exception as e:
+        print(f'❌ Error querying signals: {str(e)}')
+        return {
+            'statusCode': 500,
+            'body': json.dumps({
+                'status': 'error',
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            })
+        }
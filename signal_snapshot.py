@@ -0,0 +1,90 @@
+"""
+📸 Latest-State Snapshot
+
+One small, versioned item in the signals table holds what the dashboard
+shows: the latest signal per symbol, the paper trading portfolio summary
+and the last scan's stats. The engine rewrites it at the end of every scan;
+readers fetch it with a single GetItem and can cache it by version.
+
+Each write merges the new signals into the previous snapshot and is
+conditional on the version it read, so concurrent scans never overwrite
+each other's state - the loser re-reads and retries.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+
+from dynamo_codec import decode_snapshot, encode_snapshot
+from scan_metrics import timed
+
+# Reserved key - '#' never appears in a ticker, so the item cannot collide with a signal
+SNAPSHOT_KEY = {'symbol': '#SNAPSHOT', 'timestamp': 'latest'}
+
+# Symbols without a fresh signal keep their last one for this long (signals themselves expire after 7 days)
+SNAPSHOT_MAX_SIGNAL_AGE_DAYS = int(os.environ.get('SNAPSHOT_MAX_SIGNAL_AGE_DAYS', '7'))
+
+class SnapshotConflictError(Exception):
+    """Snapshot kept changing underneath us for every attempt"""
+
+def compact_signal(signal):
+    """The fields of a signal the dashboard renders"""
+    return {
+        'signal_type': signal['signal_type'],
+        'confidence': signal['confidence'],
+        'price': signal['price'],
+        'timestamp': signal['timestamp'],
+        'profit_potential': signal.get('technical_data', {}).get('profit_potential', 0),
+        'sentiment_boost': signal.get('sentiment_data', {}).get('sentiment_boost', 0),
+        'reason': signal['reasons'][0] if signal.get('reasons') else None
+    }
+
+def build_snapshot(previous, latest_signals, portfolio, scan_stats, now=None):
+    """Next snapshot: previous per-symbol signals, overlaid with this scan's and aged out"""
+    # Signal timestamps are naive UTC (see signal_query.utc_now)
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    cutoff = (now - timedelta(days=SNAPSHOT_MAX_SIGNAL_AGE_DAYS)).isoformat()
+
+    signals = dict(previous.get('signals', {})) if previous else {}
+    signals.update(latest_signals)
+    signals = {symbol: signal for symbol, signal in signals.items() if signal['timestamp'] >= cutoff}
+
+    return dict(
+        SNAPSHOT_KEY,
+        version=(previous['version'] if previous else 0) + 1,
+        generated_at=now.isoformat(),
+        signals=signals,
+        portfolio=portfolio,
+        scan_stats=scan_stats
+    )
+
+def read_snapshot(table, consistent=False):
+    """Current snapshot (native floats), or None before the first scan"""
+    item = table.get_item(Key=SNAPSHOT_KEY, ConsistentRead=consistent).get('Item')
+    return decode_snapshot(item) if item else None
+
+@timed('snapshot')
+def write_snapshot(table, latest_signals, portfolio, scan_stats, now=None, max_attempts=3):
+    """Atomically replace the snapshot with the next version; returns the version written"""
+    from botocore.exceptions import ClientError
+
+    for attempt in range(max_attempts):
+        previous = read_snapshot(table, consistent=True)
+        snapshot = build_snapshot(previous, latest_signals, portfolio, scan_stats, now)
+
+        if previous:
+            condition = {'ConditionExpression': 'version = :expected', 'ExpressionAttributeValues': {':expected': previous['version']}}
+        else:
+            condition = {'ConditionExpression': 'attribute_not_exists(version)'}
+
+        try:
+            table.put_item(Item=encode_snapshot(snapshot), **condition)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+            print(f'⚠️ Snapshot version {snapshot["version"]} was taken by another writer - retrying')
+            continue
+
+        print(f'📸 Snapshot v{snapshot["version"]} written: {len(snapshot["signals"])} symbols')
+        return snapshot['version']
+
+    raise SnapshotConflictError(f'Snapshot still conflicting after {max_attempts} attempts')
@@ -0,0 +1,174 @@
+"""
+💾 Batched DynamoDB Signal Writer
+
+Buffers signals and writes them with BatchWriteItem (up to 25 items per
+request) instead of one put_item round-trip per signal. Unprocessed items
+are retried with capped exponential backoff and full jitter, as are
+throttling, 5xx and connection errors; any other error (validation, missing
+table, access denied) fails the batch at once. Every batch records its own
+metrics. An optional max_latency bounds how long a
+signal may sit in a partly filled buffer, for streaming producers: a timer
+sends the buffer once its oldest signal has waited that long, even while
+the producer is still busy fetching the next one.
+"""
+
+import random
+import threading
+import time
+
+from scan_metrics import timed
+
+# DynamoDB's hard limit on items per BatchWriteItem request
+MAX_BATCH_SIZE = 25
+
+# Error codes that succeed when the same request is sent again later
+RETRYABLE_ERROR_CODES = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'InternalServerError',
+    'ServiceUnavailable'
+}
+
+def is_retryable_error(error):
+    """Throttling, server-side and connection errors are worth retrying - nothing else is"""
+    # botocore is only loaded here, once a batch write has already failed
+    from botocore.exceptions import ClientError, ConnectionError as EndpointError, HTTPClientError
+
+    if isinstance(error, ClientError):
+        code = error.response.get('Error', {}).get('Code')
+        status = error.response.get('ResponseMetadata', {}).get('HTTPStatusCode') or 0
+        return code in RETRYABLE_ERROR_CODES or status >= 500
+    return isinstance(error, (EndpointError, HTTPClientError, ConnectionError, TimeoutError))
+
+class BatchSignalWriter:
+    """Buffered BatchWriteItem writer for a DynamoDB table resource"""
+
+    def __init__(self, table, batch_size=MAX_BATCH_SIZE, max_retries=6, base_delay=0.05, max_delay=2.0,
+                 serializer=None, sleep=time.sleep, max_latency=None):
+        self.table = table
+        self.batch_size = min(batch_size, MAX_BATCH_SIZE)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # Converts a signal into a DynamoDB-safe item (floats -> Decimal)
+        self.serializer = serializer or (lambda signal: signal)
+        self.sleep = sleep
+        # Seconds a buffered signal may wait for a full batch before it is sent anyway
+        self.max_latency = max_latency
+
+        self.buffer = {}
+        self.buffered_since = None
+        self._timer = None
+        # The latency timer flushes from its own thread
+        self._lock = threading.RLock()
+        self.batch_metrics = []
+        self.items_written = 0
+        self.items_failed = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+    def add(self, signal):
+        """Queue a signal, sending a batch once the buffer is full"""
+        item = self.serializer(signal)
+        with self._lock:
+            # BatchWriteItem rejects duplicate keys in one request - the latest write wins
+            self.buffer[(signal.get('symbol'), signal.get('timestamp'))] = item
+            if self.buffered_since is None:
+                self.buffered_since = time.monotonic()
+                self._start_timer(self.max_latency)
+
+            if len(self.buffer) >= self.batch_size:
+                self._send_batch()
+
+    def flush(self):
+        """Send everything still buffered"""
+        with self._lock:
+            while self.buffer:
+                self._send_batch()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _start_timer(self, delay):
+        if self.max_latency is None or self._timer is not None:
+            return
+        self._timer = threading.Timer(delay, self._flush_expired)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_expired(self):
+        """Latency timer: send the buffer if its oldest signal has waited max_latency"""
+        with self._lock:
+            self._timer = None
+            if self.buffered_since is None:
+                return
+            waited = time.monotonic() - self.buffered_since
+            if waited >= self.max_latency:
+                self.flush()
+            else:
+                # A batch went out meanwhile - time the signals still buffered
+                self._start_timer(self.max_latency - waited)
+
+    @timed('store')
+    def _send_batch(self):
+        keys = list(self.buffer)[:self.batch_size]
+        items = [self.buffer.pop(key) for key in keys]
+        self.buffered_since = time.monotonic() if self.buffer else None
+
+        pending = [{'PutRequest': {'Item': item}} for item in items]
+        started = time.perf_counter()
+        requests = 0
+        retries = 0
+
+        while pending:
+            requests += 1
+            try:
+                response = self.table.meta.client.batch_write_item(RequestItems={self.table.name: pending})
+                pending = response.get('UnprocessedItems', {}).get(self.table.name, [])
+            except Exception as e:
+                # Throttling and transient errors are retried like unprocessed items;
+                # anything else would fail the same way again
+                print(f'⚠️ Batch write error ({len(pending)} items): {e}')
+                if not is_retryable_error(e):
+                    break
+
+            if not pending or retries >= self.max_retries:
+                break
+
+            retries += 1
+            self.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retries)))
+
+        written = len(items) - len(pending)
+        self.items_written += written
+        self.items_failed += len(pending)
+
+        metrics = {
+            'items': len(items),
+            'written': written,
+            'failed': len(pending),
+            'requests': requests,
+            'retries': retries,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+        self.batch_metrics.append(metrics)
+
+        print(f'💾 Stored batch of {written}/{len(items)} signals in {requests} request(s) ({metrics["latency_ms"]}ms, {retries} retries)')
+        if pending:
+            print(f'❌ {len(pending)} signals still unprocessed after {retries} retries')
+
+    def metrics_summary(self):
+        """Totals across all batches written so far"""
+        return {
+            'batches': len(self.batch_metrics),
+            'items_written': self.items_written,
+            'items_failed': self.items_failed,
+            'requests': sum(m['requests'] for m in self.batch_metrics),
+            'retries': sum(m['retries'] for m in self.batch_metrics),
+            'total_latency_ms': round(sum(m['latency_ms'] for m in self.batch_metrics), 1),
+            'batch_metrics': self.batch_metrics
+        }
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The Lambda modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
@@ -0,0 +1,154 @@
+"""
+In-memory stand-ins for the AWS services the handlers talk to
+"""
+
+import threading
+
+from botocore.exceptions import ClientError
+
+def _key_conditions(condition):
+    """Flatten a boto3 key condition into (attribute, operator, value) tuples"""
+    expression = condition.get_expression()
+    if expression['operator'] == 'AND':
+        return [term for part in expression['values'] for term in _key_conditions(part)]
+    key, value = expression['values']
+    return [(key.name, expression['operator'], value)]
+
+def _matches(item, conditions):
+    for name, operator, value in conditions:
+        if name not in item:
+            return False
+        if operator == '=' and item[name] != value:
+            return False
+        if operator == '>=' and item[name] < value:
+            return False
+    return True
+
+def _conditional_check_failed(operation):
+    return ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': 'The conditional request failed'}}, operation)
+
+class FakeSignalsTable:
+    """The signals table (symbol, timestamp) with its signals-by-date index (date_bucket, timestamp)"""
+
+    def __init__(self, items=(), scan_page_size=25):
+        self.name = 'trading-signals'
+        # BatchSignalWriter writes through table.meta.client
+        self.meta = _Record(client=self)
+        self.items = {}
+        self.scan_page_size = scan_page_size
+        self.calls = {'query': 0, 'scan': 0, 'update_item': 0, 'batch_write_item': 0}
+        self._lock = threading.Lock()
+        for item in items:
+            self.put_item(Item=item)
+
+    def put_item(self, Item, ConditionExpression=None, ExpressionAttributeValues=None):
+        key = (Item['symbol'], Item['timestamp'])
+        current = self.items.get(key)
+        if ConditionExpression == 'attribute_not_exists(version)' and current is not None:
+            raise _conditional_check_failed('PutItem')
+        if ConditionExpression == 'version = :expected' and (current or {}).get('version') != ExpressionAttributeValues[':expected']:
+            raise _conditional_check_failed('PutItem')
+        self.items[key] = dict(Item)
+
+    def batch_write_item(self, RequestItems):
+        with self._lock:
+            self.calls['batch_write_item'] += 1
+            for request in RequestItems[self.name]:
+                self.put_item(Item=request['PutRequest']['Item'])
+        return {'UnprocessedItems': {}}
+
+    def get_item(self, Key, ConsistentRead=False):
+        item = self.items.get((Key['symbol'], Key['timestamp']))
+        return {'Item': dict(item)} if item else {}
+
+    def query(self, IndexName, KeyConditionExpression, ScanIndexForward=True, Limit=None, ExclusiveStartKey=None):
+        self.calls['query'] += 1
+        conditions = _key_conditions(KeyConditionExpression)
+
+        rows = sorted(
+            (item for item in self.items.values() if 'date_bucket' in item and _matches(item, conditions)),
+            key=lambda item: (item['timestamp'], item['symbol']),
+            reverse=not ScanIndexForward
+        )
+        if ExclusiveStartKey:
+            keys = [(item['timestamp'], item['symbol']) for item in rows]
+            rows = rows[keys.index((ExclusiveStartKey['timestamp'], ExclusiveStartKey['symbol'])) + 1:]
+
+        page = rows[:Limit] if Limit else rows
+        response = {'Items': [dict(item) for item in page]}
+        if Limit and len(rows) > Limit:
+            last = page[-1]
+            response['LastEvaluatedKey'] = {key: last[key] for key in ('symbol', 'timestamp', 'date_bucket')}
+        return response
+
+    def scan(self, FilterExpression, ProjectionExpression, ExpressionAttributeNames, ExclusiveStartKey=None):
+        assert FilterExpression == 'attribute_not_exists(date_bucket)'
+        self.calls['scan'] += 1
+
+        keys = sorted(self.items)
+        if ExclusiveStartKey:
+            keys = keys[keys.index((ExclusiveStartKey['symbol'], ExclusiveStartKey['timestamp'])) + 1:]
+        page = keys[:self.scan_page_size]
+
+        attributes = [ExpressionAttributeNames[name.strip()] for name in ProjectionExpression.split(',')]
+        response = {'Items': [
+            {attribute: self.items[key][attribute] for attribute in attributes}
+            for key in page if 'date_bucket' not in self.items[key]
+        ]}
+        if len(keys) > len(page):
+            response['LastEvaluatedKey'] = {'symbol': page[-1][0], 'timestamp': page[-1][1]}
+        return response
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues):
+        assert UpdateExpression == 'SET date_bucket = :bucket'
+        self.calls['update_item'] += 1
+
+        item = self.items.get((Key['symbol'], Key['timestamp']))
+        if item is None or 'date_bucket' in item:
+            raise _conditional_check_failed('UpdateItem')
+        item['date_bucket'] = ExpressionAttributeValues[':bucket']
+
+class _Record:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+class FakeBroker:
+    """In-memory stand-in for the Alpaca REST client, counting every round-trip"""
+
+    def __init__(self, portfolio_value=100000.0, buying_power=None, positions=None, fail_symbols=()):
+        self.portfolio_value = portfolio_value
+        self.buying_power = portfolio_value if buying_power is None else buying_power
+        self.positions = dict(positions or {})
+        self.fail_symbols = set(fail_symbols)
+        self.orders = {}
+        self.calls = {'get_account': 0, 'list_positions': 0, 'submit_order': 0, 'get_order_by_client_order_id': 0}
+        self._lock = threading.Lock()
+
+    def get_account(self):
+        self.calls['get_account'] += 1
+        return _Record(
+            portfolio_value=str(self.portfolio_value),
+            buying_power=str(self.buying_power),
+            cash=str(self.buying_power),
+            unrealized_pl='0'
+        )
+
+    def list_positions(self):
+        self.calls['list_positions'] += 1
+        return [_Record(symbol=symbol, qty=str(qty)) for symbol, qty in self.positions.items()]
+
+    def submit_order(self, symbol, qty, side, type, time_in_force, client_order_id=None):
+        with self._lock:
+            self.calls['submit_order'] += 1
+            if symbol in self.fail_symbols:
+                raise RuntimeError(f'order rejected for {symbol}')
+            if client_order_id in self.orders:
+                raise RuntimeError('client_order_id must be unique')
+            order = _Record(id=f'order-{len(self.orders) + 1}', client_order_id=client_order_id, symbol=symbol, qty=qty, side=side)
+            self.orders[client_order_id] = order
+            self.positions[symbol] = self.positions.get(symbol, 0) + qty
+            return order
+
+    def get_order_by_client_order_id(self, client_order_id):
+        self.calls['get_order_by_client_order_id'] += 1
+        return self.orders[client_order_id]
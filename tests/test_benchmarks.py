@@ -0,0 +1,45 @@
+import benchmarks
+
+def test_synthetic_bars_are_reproducible_ohlc():
+    bars = benchmarks.synthetic_bars(30, seed=3)
+
+    assert bars == benchmarks.synthetic_bars(30, seed=3)
+    assert all(bar['low'] <= min(bar['open'], bar['close']) and bar['high'] >= max(bar['open'], bar['close']) for bar in bars)
+
+def test_every_benchmark_case_runs():
+    cases = benchmarks.benchmark_cases([60], [3])
+    names = [name for name, _, _ in cases]
+
+    assert len(names) == len(set(names)) == 8
+    for _, _, func in cases:
+        func()
+
+def test_compare_to_baseline_flags_regressions_beyond_tolerance():
+    def document(**timings):
+        return {'results': {name: {'best_s': seconds} for name, seconds in timings.items()}}
+
+    comparison = benchmarks.compare_to_baseline(
+        document(fast=1.2, slow=1.3, new=1.0),
+        document(fast=1.0, slow=1.0),
+        tolerance=0.25
+    )
+
+    assert set(comparison) == {'fast', 'slow'}
+    assert comparison['fast']['regression'] is False
+    assert comparison['slow']['regression'] is True
+
+def test_handler_imports_defer_statistics_and_decimal():
+    for module in ('real_lambda_function', 'backtesting_engine'):
+        result = benchmarks.measure_import(module, repeat=1)
+
+        assert result['deferred_imports'] == [], module
+
+def test_deferred_import_violations_ignore_client_setup():
+    results = {
+        'import[a]': {'deferred_imports': ['decimal']},
+        'import[b]': {'deferred_imports': []},
+        'cold_start[a]': {'deferred_imports': ['decimal']},
+        'calculate_rsi_historical[bars=250]': {}
+    }
+
+    assert benchmarks.deferred_import_violations(results) == {'import[a]': ['decimal']}
@@ -0,0 +1,42 @@
+from decimal import Decimal
+
+from dynamo_codec import decode_signal, encode_signal, encode_trade
+
+def make_signal(**overrides):
+    signal = {
+        'symbol': 'AAPL',
+        'signal_type': 'BUY',
+        'confidence': 87.44,
+        'price': 189.234,
+        'timestamp': '2024-01-02T15:30:00',
+        'reasons': ['Above 5-day trend'],
+        'technical_data': {'rsi': 31.25, 'volume_ratio': 1.844, 'signal_score': 93.60000000000001},
+        'sentiment_data': {'overall_sentiment': 0.3124, 'reddit_mentions': 27, 'trending': True},
+        'ttl': 1704813000
+    }
+    signal.update(overrides)
+    return signal
+
+def test_fields_are_quantized_to_their_schema_precision():
+    item = encode_signal(make_signal(extra=0.1))
+
+    assert item['confidence'] == Decimal('87.4')
+    assert item['price'] == Decimal('189.23')
+    assert item['technical_data']['signal_score'] == Decimal('93.60')
+    assert item['sentiment_data']['reddit_mentions'] == 27
+    assert item['extra'] == Decimal('0.1')
+    assert decode_signal(item)['price'] == 189.23
+
+def test_non_finite_floats_are_stored_as_null():
+    nan, inf = float('nan'), float('inf')
+    item = encode_signal(make_signal(
+        confidence=nan,
+        technical_data={'rsi': inf, 'volume_ratio': 1.5},
+        extra={'ratio': -inf, 'values': [nan, 1.5]}
+    ))
+
+    assert item['confidence'] is None
+    assert item['technical_data'] == {'rsi': None, 'volume_ratio': Decimal('1.50')}
+    assert item['extra'] == {'ratio': None, 'values': [None, Decimal('1.5')]}
+    assert decode_signal(item)['confidence'] is None
+    assert encode_trade({'symbol': 'AAPL', 'price': nan, 'shares': 3})['price'] is None
@@ -0,0 +1,62 @@
+import threading
+
+import http_client
+
+class FakeResponse:
+    status = 200
+    will_close = False
+
+    def read(self):
+        return b'{"ok": true}'
+
+    def getheader(self, name, default=None):
+        return default
+
+class FakeConnection:
+    """Keep-alive connection whose first request fails once when `flaky` is set"""
+
+    def __init__(self, host, timeout=None, context=None):
+        self.sock = None
+        self.timeout = timeout
+        self.flaky = FakeConnection.flaky_next
+        FakeConnection.flaky_next = False
+
+    def request(self, method, path, headers=None):
+        if self.flaky:
+            self.flaky = False
+            raise ConnectionResetError('connection reset by peer')
+
+    def getresponse(self):
+        return FakeResponse()
+
+    def close(self):
+        pass
+
+FakeConnection.flaky_next = False
+
+def test_stats_count_every_request_across_threads(monkeypatch):
+    monkeypatch.setattr(http_client.http.client, 'HTTPSConnection', FakeConnection)
+    client = http_client.PooledHTTPClient(pool_size=8, max_retries=2, backoff=0)
+
+    def fetch():
+        for _ in range(250):
+            assert client.get_json('https://query1.finance.yahoo.com/v7/finance/quote?symbols=AAPL') == {'ok': True}
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert client.stats['requests'] == 2000
+    assert client.stats['connections_opened'] + client.stats['connections_reused'] == 2000
+    assert client.stats['connections_opened'] <= 8
+
+def test_retries_are_counted(monkeypatch):
+    monkeypatch.setattr(http_client.http.client, 'HTTPSConnection', FakeConnection)
+    client = http_client.PooledHTTPClient(max_retries=2, backoff=0)
+    FakeConnection.flaky_next = True
+
+    client.get_json('https://query1.finance.yahoo.com/v7/finance/quote?symbols=AAPL')
+
+    assert client.stats == {'requests': 2, 'connections_opened': 2, 'connections_reused': 0, 'retries': 1}
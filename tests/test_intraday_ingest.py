@@ -0,0 +1,75 @@
+import pytest
+
+from intraday_ingest import IntradayEngine
+
+DAY = 19884
+OPEN = DAY * 86400 + 13 * 3600 + 30 * 60
+
+class FakeMarketData:
+    """Serves quote bars for session seeding and records each request"""
+
+    def __init__(self, quotes=None, error=None):
+        self.quotes = quotes or {}
+        self.error = error
+        self.requests = []
+
+    def session_quotes(self, symbols, timeout=None):
+        self.requests.append(list(symbols))
+        if self.error:
+            raise self.error
+        return {symbol: dict(self.quotes[symbol]) for symbol in symbols if symbol in self.quotes}
+
+def minute(symbol, timestamp, price, volume=100):
+    return {'symbol': symbol, 'timestamp': timestamp, 'open': price, 'high': price + 1, 'low': price - 1, 'close': price, 'volume': volume}
+
+def quote(timestamp, close, volume):
+    return {'timestamp': timestamp, 'open': 10.0, 'high': 15.0, 'low': 9.0, 'close': close, 'volume': volume}
+
+def test_cold_start_seeds_the_session_from_the_quote():
+    market_data = FakeMarketData({'AAA': quote(OPEN + 3600, 12.0, 50000)})
+    engine = IntradayEngine(market_data)
+
+    changed = engine.ingest([minute('AAA', OPEN + 3540, 11.0), minute('AAA', OPEN + 3600, 13.0), minute('AAA', OPEN + 3660, 16.0)])
+    session = engine.sessions['AAA']
+
+    assert changed == {'AAA'}
+    assert market_data.requests == [['AAA']]
+    # The session keeps the quote's open and low; only minutes from the quote on are added
+    assert (session['open'], session['high'], session['low'], session['close']) == (10.0, 17.0, 9.0, 16.0)
+    assert session['volume'] == 50200
+    assert engine.stats['covered_by_quote'] == 1
+
+def test_sessions_are_seeded_once_per_batch_and_resynced_later():
+    market_data = FakeMarketData({'AAA': quote(OPEN + 600, 12.0, 1000), 'BBB': quote(OPEN + 600, 20.0, 2000)})
+    engine = IntradayEngine(market_data, reseed_seconds=300)
+
+    engine.seed_sessions([minute('AAA', OPEN + 600, 12.0), minute('BBB', OPEN + 600, 20.0), minute('AAA', OPEN + 660, 12.0)], now=1000)
+    assert market_data.requests == [['AAA', 'BBB']]
+
+    assert engine.seed_sessions([minute('AAA', OPEN + 720, 12.0)], now=1100) == set()
+    assert len(market_data.requests) == 1
+
+    engine.apply_bar(minute('AAA', OPEN + 720, 12.0, volume=7))
+    market_data.quotes['AAA'] = quote(OPEN + 900, 14.0, 1500)
+    assert engine.seed_sessions([minute('AAA', OPEN + 900, 14.0)], now=1300) == {'AAA'}
+    assert engine.sessions['AAA']['volume'] == 1500
+    assert engine.sessions['AAA']['close'] == 14.0
+
+def test_previous_day_quote_falls_back_to_the_first_minute():
+    market_data = FakeMarketData({'AAA': quote(OPEN - 86400, 12.0, 50000)})
+    engine = IntradayEngine(market_data)
+
+    engine.ingest([minute('AAA', OPEN, 11.0), minute('AAA', OPEN + 60, 11.5)])
+    session = engine.sessions['AAA']
+
+    assert session['open'] == 11.0
+    assert session['volume'] == 200
+    assert engine.stats['seeded'] == 0
+
+@pytest.mark.parametrize('market_data', [FakeMarketData(), FakeMarketData(error=TimeoutError('quote timeout'))])
+def test_missing_quotes_start_from_minutes(market_data):
+    engine = IntradayEngine(market_data)
+
+    assert engine.ingest([minute('AAA', OPEN, 11.0), minute('AAA', OPEN, 11.0)]) == {'AAA'}
+    assert engine.sessions['AAA']['volume'] == 100
+    assert engine.stats['duplicates'] == 1
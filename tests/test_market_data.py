@@ -0,0 +1,89 @@
+import pytest
+
+import market_data
+from bar_cache import BarStore
+from market_data import BatchMarketData
+
+# Monday 2024-06-10 (UTC day number)
+MONDAY = 19884
+OPEN_SECONDS = 13 * 3600 + 30 * 60
+
+def daily_columns(last_day, count, close=100.0):
+    """`count` consecutive daily bars ending on `last_day`, the last one closing at `close`"""
+    days = range(last_day - count + 1, last_day + 1)
+    closes = [close - (last_day - day) * 0.5 for day in days]
+    return {
+        'timestamp': [day * 86400 + OPEN_SECONDS for day in days],
+        'open': list(closes),
+        'high': [price + 1 for price in closes],
+        'low': [price - 1 for price in closes],
+        'close': closes,
+        'volume': [1000000] * len(closes)
+    }
+
+def quote(close, previous_close):
+    return {
+        'timestamp': MONDAY * 86400 + OPEN_SECONDS + 3600,
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': 500000,
+        'previous_close': previous_close
+    }
+
+@pytest.fixture
+def charts(monkeypatch):
+    requests = []
+
+    def fetch_chart_columns(symbol, range_='60d', timeout=None):
+        requests.append((symbol, range_))
+        return daily_columns(MONDAY, 60 if range_ == '60d' else 5, close=200.0), set()
+
+    monkeypatch.setattr(market_data, 'fetch_chart_columns', fetch_chart_columns)
+    return requests
+
+def market(tmp_path, monkeypatch, quotes, cached):
+    store = BarStore(str(tmp_path))
+    for symbol, columns in cached.items():
+        store.replace(symbol, '1d', columns)
+    monkeypatch.setattr(market_data, 'fetch_batch_quotes', lambda symbols, timeout=None, fill_missing=True: dict(quotes))
+    data = BatchMarketData(store)
+    data.prefetch(list(quotes))
+    return data
+
+def test_cached_symbols_make_no_chart_requests(tmp_path, monkeypatch, charts):
+    data = market(tmp_path, monkeypatch, {
+        # History through Friday, the session before Monday
+        'FRI': quote(101.0, 99.0),
+        # Friday was a holiday: history ends Thursday, whose close is the previous close
+        'HOL': quote(101.0, 100.0)
+    }, {
+        'FRI': daily_columns(MONDAY - 3, 60, close=99.0),
+        'HOL': daily_columns(MONDAY - 4, 60, close=100.0)
+    })
+
+    for _ in range(3):
+        for symbol in ('FRI', 'HOL'):
+            bars = data.get_bars(symbol, 50)
+            assert len(bars) == 50
+            assert bars.close[-1] == 101.0
+
+    assert charts == []
+    assert data.stats['cache_hits'] == 6
+
+def test_missing_sessions_refresh_recent_bars_once(tmp_path, monkeypatch, charts):
+    data = market(tmp_path, monkeypatch, {'GAP': quote(201.0, 200.0)}, {'GAP': daily_columns(MONDAY - 10, 60, close=150.0)})
+
+    data.get_bars('GAP', 50)
+    data.get_bars('GAP', 50)
+
+    assert charts == [('GAP', '5d')]
+    assert data.store.load('GAP', '1d')['close'][-1] == 199.5
+
+def test_uncached_symbols_fall_back_to_the_chart(tmp_path, monkeypatch, charts):
+    data = market(tmp_path, monkeypatch, {'NEW': quote(201.0, 200.0)}, {})
+
+    bars = data.get_bars('NEW', 50)
+
+    assert charts == [('NEW', '60d')]
+    assert len(bars) == 50
+    # Only completed sessions are cached
+    assert market_data._utc_day(data.store.load('NEW', '1d')['timestamp'][-1]) == MONDAY - 1
@@ -0,0 +1,25 @@
+import backtesting_engine
+
+class RecordingTable:
+    def __init__(self):
+        self.items = []
+
+    def put_item(self, Item):
+        self.items.append(Item)
+
+class RecordingDynamoDB:
+    def __init__(self):
+        self.table = RecordingTable()
+
+    def Table(self, name):
+        return self.table
+
+def test_optimizer_out_of_time_before_any_symbol_stores_nothing():
+    dynamodb = RecordingDynamoDB()
+
+    results = backtesting_engine.optimize_confidence_thresholds(dynamodb, 'performance', offline=True, workers=1, time_budget=0)
+
+    assert results['status'] == 'incomplete'
+    assert results['symbols_evaluated'] == 0
+    assert 'optimal_threshold' not in results
+    assert dynamodb.table.items == []
@@ -0,0 +1,62 @@
+from paper_execution import PaperExecutor, client_order_id
+from fakes import FakeBroker
+
+def make_signal(symbol, price=100.0, confidence=85.0, timestamp='2024-06-10T15:00:00'):
+    return {
+        'symbol': symbol,
+        'signal_type': 'BUY',
+        'confidence': confidence,
+        'price': price,
+        'timestamp': timestamp,
+        'technical_data': {'profit_potential': 4.0},
+        'sentiment_data': {'sentiment_boost': 1.0}
+    }
+
+def test_orders_are_sized_against_one_snapshot_within_the_run_slots():
+    broker = FakeBroker(portfolio_value=100000.0)
+    executor = PaperExecutor(broker, max_trades=3)
+
+    trades = executor.execute([make_signal(symbol) for symbol in 'ABCDE'] + [make_signal('LOW', confidence=60.0)])
+
+    assert [trade['symbol'] for trade in trades] == ['A', 'B', 'C']
+    assert all(trade['shares'] == 20 for trade in trades)
+    assert executor.buying_power == 100000.0 - 3 * 2000.0
+    assert broker.calls == {'get_account': 1, 'list_positions': 1, 'submit_order': 3, 'get_order_by_client_order_id': 0}
+    assert executor.portfolio_summary()['positions_count'] == 3
+
+def test_orders_beyond_buying_power_are_skipped():
+    broker = FakeBroker(portfolio_value=100000.0, buying_power=3000.0)
+    executor = PaperExecutor(broker, max_trades=3)
+
+    trades = executor.execute([make_signal('A'), make_signal('B')])
+
+    assert [trade['symbol'] for trade in trades] == ['A']
+    assert executor.buying_power == 1000.0
+
+def test_a_failed_order_releases_its_slot_and_buying_power():
+    broker = FakeBroker(portfolio_value=100000.0, fail_symbols={'B'})
+    executor = PaperExecutor(broker, max_trades=3)
+
+    trades = executor.execute([make_signal(symbol) for symbol in 'ABCDE'])
+
+    assert [trade['symbol'] for trade in trades] == ['A', 'C', 'D']
+    assert executor.planned == 3
+    assert executor.buying_power == 100000.0 - 3 * 2000.0
+    assert 'E' not in broker.positions
+
+def test_resubmitting_a_window_resolves_the_existing_order():
+    broker = FakeBroker()
+    first = PaperExecutor(broker).execute([make_signal('A')])
+    # Same symbol, side and 30-minute window: the re-run maps to the same client_order_id
+    retried = PaperExecutor(broker).execute([make_signal('A', timestamp='2024-06-10T15:10:00')])
+
+    assert retried[0]['order_id'] == first[0]['order_id']
+    assert len(broker.orders) == 1
+    assert broker.calls['get_order_by_client_order_id'] == 1
+
+def test_client_order_id_changes_with_the_window():
+    signal = make_signal('A')
+
+    assert client_order_id(signal) == client_order_id(make_signal('A', timestamp='2024-06-10T15:29:59'))
+    assert client_order_id(signal) != client_order_id(make_signal('A', timestamp='2024-06-10T15:30:00'))
+    assert len(client_order_id(make_signal('VERYLONGSYMBOLNAME' * 3))) <= 48
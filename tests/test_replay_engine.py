@@ -0,0 +1,72 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import replay_engine
+from real_lambda_function import calculate_enhanced_indicators
+from replay_engine import LIVE_INDICATOR_KEYS, LIVE_WINDOW, ReplayClock, ReplayEngine, live_indicator_rows
+
+SYMBOLS = ['AAA', 'BBB', 'CCC']
+START = datetime(2023, 1, 2)
+
+def history(symbol, days=160, seed=1):
+    """Seeded random-walk daily bars"""
+    rng = random.Random(f'{seed}:{symbol}')
+    price = 50.0
+    bars = []
+    for i in range(days):
+        moment = START + timedelta(days=i)
+        open_price = price
+        price = max(1.0, price * (1 + rng.gauss(0, 0.025)))
+        bars.append({
+            'date': moment,
+            'timestamp': int(moment.timestamp()),
+            'open': open_price,
+            'high': max(open_price, price) * 1.01,
+            'low': min(open_price, price) * 0.99,
+            'close': price,
+            'volume': rng.randint(500000, 3000000)
+        })
+    return bars
+
+def replay(symbols, **kwargs):
+    engine = ReplayEngine(symbols, **kwargs)
+    engine.load({symbol: history(symbol) for symbol in symbols})
+    return engine.run()
+
+def test_replay_output_is_deterministic():
+    first = replay(SYMBOLS)
+
+    assert first == replay(SYMBOLS)
+    assert all(first[symbol] for symbol in SYMBOLS)
+
+def test_symbols_replay_independently_of_the_universe():
+    combined = replay(SYMBOLS)
+
+    for symbol in SYMBOLS:
+        assert replay([symbol])[symbol] == combined[symbol]
+
+def test_trades_leave_room_for_the_holding_period():
+    trades = replay(['AAA'], holding_period=5)['AAA']
+    last_entry = (START + timedelta(days=160 - 1 - 5)).isoformat()
+
+    assert trades == sorted(trades, key=lambda trade: trade['date'])
+    assert trades[0]['date'] >= (START + timedelta(days=LIVE_WINDOW - 1)).isoformat()
+    assert trades[-1]['date'] <= last_entry
+
+def test_clock_ends_on_the_last_replayed_bar():
+    clock = ReplayClock()
+    replay(SYMBOLS, clock=clock)
+
+    assert clock() == START + timedelta(days=159)
+
+@pytest.mark.skipif(not replay_engine.numpy_available(), reason='vectorized indicators need numpy')
+def test_precomputed_rows_match_the_live_indicators():
+    bars = history('AAA')
+    rows = live_indicator_rows(replay_engine.as_bar_series(bars))
+
+    assert rows[LIVE_WINDOW - 2] is None
+    for i in (LIVE_WINDOW - 1, 100, len(bars) - 1):
+        live = calculate_enhanced_indicators(bars[i - LIVE_WINDOW + 1:i + 1])
+        assert {key: rows[i][key] for key in LIVE_INDICATOR_KEYS} == pytest.approx({key: live[key] for key in LIVE_INDICATOR_KEYS})
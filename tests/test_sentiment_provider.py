@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+
+import sentiment_provider
+from sentiment_provider import NEUTRAL_SENTIMENT, FixtureSentimentBackend, SentimentProvider, bucket_label
+
+MORNING = datetime(2024, 6, 10, 10, 5)
+
+class FailingBackend:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, symbols, moment):
+        self.calls += 1
+        raise TimeoutError('sentiment source timed out')
+
+def test_bucket_labels():
+    assert bucket_label(MORNING, 60) == '2024-06-10T10:00'
+    assert bucket_label(MORNING, 15) == '2024-06-10T10:00'
+    assert bucket_label(datetime(2024, 6, 10, 10, 20), 15) == '2024-06-10T10:15'
+    assert bucket_label(MORNING, 1440) == '2024-06-10'
+
+def test_prefetch_batches_the_universe_once_per_bucket():
+    backend = FixtureSentimentBackend(seed=1, bucket_minutes=60)
+    provider = SentimentProvider(backend, bucket_minutes=60, batch_size=4)
+    symbols = ['S%d' % i for i in range(10)]
+
+    provider.prefetch(symbols + symbols[:3], now=MORNING)
+    assert backend.calls == 3
+
+    # Later scans in the same bucket are served from the cache
+    provider.prefetch(symbols, now=MORNING.replace(minute=55))
+    values = [provider.get(symbol, now=MORNING.replace(minute=30)) for symbol in symbols]
+    assert backend.calls == 3
+    assert provider.stats == {'fetched': 10, 'batches': 3, 'cache_hits': 10, 'failures': 0}
+    assert values[0] == sentiment_provider.fixture_sentiment(1, 'S0', '2024-06-10T10:00')
+
+    # The next bucket fetches again, with new values
+    provider.prefetch(symbols, now=MORNING.replace(hour=11))
+    assert backend.calls == 6
+    assert provider.get('S0', now=MORNING.replace(hour=11)) != values[0]
+
+def test_a_cache_miss_fetches_only_that_symbol():
+    backend = FixtureSentimentBackend(seed=1, bucket_minutes=60)
+    provider = SentimentProvider(backend, bucket_minutes=60)
+
+    first = provider.get('AAA', now=MORNING)
+
+    assert backend.calls == 1
+    assert provider.get('AAA', now=MORNING) == first
+    assert backend.calls == 1
+
+def test_fixture_backend_is_deterministic_per_seed():
+    first = FixtureSentimentBackend(seed=1, bucket_minutes=60).fetch(['AAA', 'BBB'], MORNING)
+
+    assert first == FixtureSentimentBackend(seed=1, bucket_minutes=60).fetch(['AAA', 'BBB'], MORNING)
+    assert first != FixtureSentimentBackend(seed=2, bucket_minutes=60).fetch(['AAA', 'BBB'], MORNING)
+
+def test_failures_serve_neutral_sentiment_and_are_retried():
+    backend = FailingBackend()
+    provider = SentimentProvider(backend, bucket_minutes=60)
+
+    provider.prefetch(['AAA'], now=MORNING)
+    assert provider.get('AAA', now=MORNING) == NEUTRAL_SENTIMENT
+    assert backend.calls == 2
+    assert provider.stats['failures'] == 2
+
+@pytest.mark.parametrize('name, backend', [('fixture', FixtureSentimentBackend), ('stub', sentiment_provider.StubSentimentBackend)])
+def test_backends_are_selected_by_name(name, backend):
+    assert isinstance(sentiment_provider.create_sentiment_backend(name), backend)
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        sentiment_provider.create_sentiment_backend('reddit')
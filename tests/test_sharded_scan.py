@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+import sharded_scan
+from fakes import FakeSignalsTable
+
+UNIVERSE = ['S%02d' % i for i in range(23)]
+
+def fake_signal(symbol):
+    number = int(symbol[1:])
+    return {
+        'symbol': symbol,
+        'signal_type': 'BUY',
+        'confidence': 60.0 + number,
+        'price': 10.0 + number,
+        'timestamp': '2024-06-10T15:00:00',
+        'reasons': ['Test signal'],
+        'technical_data': {'profit_potential': 3.0},
+        'sentiment_data': {'sentiment_boost': 1.0}
+    }
+
+def fake_stream(symbols, max_workers=None, fetch_timeout=None):
+    # Completion order differs from universe order, as with concurrent fetches
+    for symbol in reversed(symbols):
+        if int(symbol[1:]) % 2 == 0:
+            yield fake_signal(symbol)
+
+@pytest.fixture
+def table(monkeypatch):
+    table = FakeSignalsTable()
+    monkeypatch.setattr(sharded_scan, 'get_table', lambda: table)
+    monkeypatch.setattr(sharded_scan, 'stream_enhanced_signals', fake_stream)
+    monkeypatch.setattr(sharded_scan, 'is_market_open', lambda: False)
+    monkeypatch.setattr(sharded_scan, 'init_alpaca_paper_trading', lambda: None)
+    monkeypatch.delenv('SNS_TOPIC_ARN', raising=False)
+    return table
+
+def test_partition_universe_keeps_contiguous_shards():
+    shards = sharded_scan.partition_universe(UNIVERSE, 10)
+
+    assert [len(shard) for shard in shards] == [10, 10, 3]
+    assert sum(shards, []) == UNIVERSE
+
+def test_sharded_scan_matches_a_single_shard_run(table):
+    sharded = sharded_scan.run_sharded_scan(UNIVERSE, sharded_scan.LocalInvoker(), shard_size=5, max_in_flight=3)
+    single = sharded_scan.run_sharded_scan(UNIVERSE, sharded_scan.LocalInvoker(), shard_size=len(UNIVERSE))
+
+    assert sharded['shards'] == 5 and single['shards'] == 1
+    assert sharded['symbols_scanned'] == single['symbols_scanned'] == len(UNIVERSE)
+    assert sharded['signals_found'] == single['signals_found'] == 12
+    # Only signals at 70%+ are high confidence, and they come back in universe order
+    assert [s['symbol'] for s in sharded['high_confidence_signals']] == [s['symbol'] for s in single['high_confidence_signals']]
+    assert [s['symbol'] for s in sharded['high_confidence_signals']] == ['S10', 'S12', 'S14', 'S16', 'S18', 'S20', 'S22']
+    assert sharded['latest_signals'] == single['latest_signals']
+    assert len(table.items) == 12
+
+def test_failed_shards_are_reported_and_the_rest_aggregated(table):
+    local = sharded_scan.LocalInvoker()
+
+    def invoker(payload):
+        if payload['shard_id'] == 1:
+            raise RuntimeError('worker timed out')
+        return local(payload)
+
+    summary = sharded_scan.run_sharded_scan(UNIVERSE, invoker, shard_size=10)
+
+    assert summary['failed_shards'] == [{'shard_id': 1, 'error': 'worker timed out', 'symbols': UNIVERSE[10:20]}]
+    assert summary['symbols_scanned'] == 13
+    assert [payload['symbols'] for payload in local.payloads] == [UNIVERSE[:10], UNIVERSE[20:]]
+
+def test_coordinator_passes_the_run_context_to_workers(table):
+    invoker = sharded_scan.LocalInvoker()
+
+    response = sharded_scan.coordinator_handler({'symbols': UNIVERSE, 'shard_size': 8, 'fetch_timeout': 3}, None, invoker=invoker)
+    body = json.loads(response['body'])
+
+    assert response['statusCode'] == 200
+    assert body['status'] == 'success'
+    assert (body['shards'], body['signals_stored'], body['paper_trades_executed']) == (3, 12, 0)
+    assert body['snapshot_version'] == 1
+    assert all(payload['market_open'] is False and payload['trading_enabled'] is False and payload['fetch_timeout'] == 3 for payload in invoker.payloads)
+
+def test_lambda_invoker_waits_out_workers_without_retrying(monkeypatch):
+    created = []
+    monkeypatch.setattr(sharded_scan, 'get_client', lambda service, config=None: created.append((service, config)) or object())
+
+    sharded_scan.LambdaInvoker()
+
+    service, config = created[0]
+    assert service == 'lambda'
+    assert config['read_timeout'] > sharded_scan.SCAN_WORKER_TIMEOUT
+    assert config['retries'] == {'max_attempts': 0}
+
+def test_configured_clients_are_cached_separately():
+    import aws_clients
+
+    default = aws_clients.get_client('lambda')
+    configured = aws_clients.get_client('lambda', sharded_scan.LAMBDA_INVOKE_CONFIG)
+
+    assert configured is not default
+    assert configured is aws_clients.get_client('lambda', dict(sharded_scan.LAMBDA_INVOKE_CONFIG))
+    assert configured.meta.config.read_timeout == sharded_scan.SCAN_WORKER_TIMEOUT + 10
+    # botocore counts the first attempt: one attempt in total, no retries
+    assert configured.meta.config.retries['total_max_attempts'] == 1
@@ -0,0 +1,124 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import signal_query
+from dynamo_codec import decode_signal, encode_signal
+from fakes import FakeSignalsTable
+from signal_snapshot import compact_signal, write_snapshot
+
+NOW = datetime(2024, 6, 10, 15, 0)
+
+def make_signal(symbol, timestamp, with_bucket=True):
+    signal = {
+        'symbol': symbol,
+        'signal_type': 'BUY',
+        'confidence': 75.0,
+        'price': 10.5,
+        'timestamp': timestamp,
+        'reasons': ['Test signal'],
+        'technical_data': {'profit_potential': 3.0},
+        'sentiment_data': {'sentiment_boost': 1.0}
+    }
+    if with_bucket:
+        signal['date_bucket'] = signal_query.date_bucket(timestamp)
+    return encode_signal(signal)
+
+@pytest.fixture
+def signals():
+    rng = random.Random(7)
+    items = []
+    for days_ago in range(10):
+        for _ in range(rng.randint(0, 12)):
+            moment = NOW - timedelta(days=days_ago, minutes=rng.randint(0, 600))
+            items.append(make_signal(rng.choice('ABCDEFG'), moment.isoformat()))
+    return items
+
+def newest_first(items):
+    return sorted(items, key=lambda item: (item['timestamp'], item['symbol']), reverse=True)
+
+def read_all_pages(table, **kwargs):
+    timestamps, cursor, pages = [], None, 0
+    while True:
+        page, cursor = signal_query.query_signals(table, cursor=cursor, now=NOW, **kwargs)
+        timestamps += [item['timestamp'] for item in page]
+        pages += 1
+        if not cursor:
+            return timestamps, pages
+
+def test_latest_signals_paginate_newest_first_through_the_lookback(signals):
+    table = FakeSignalsTable(signals)
+    oldest_bucket = (NOW - timedelta(days=signal_query.SIGNAL_LOOKBACK_DAYS)).strftime('%Y-%m-%d')
+    expected = [item['timestamp'] for item in newest_first(signals) if item['date_bucket'] >= oldest_bucket]
+
+    timestamps, pages = read_all_pages(table, limit=5)
+
+    assert timestamps == expected
+    assert pages == -(-len(expected) // 5)
+
+def test_since_returns_only_newer_signals_across_buckets(signals):
+    table = FakeSignalsTable(signals)
+    since = (NOW - timedelta(days=2, hours=3)).isoformat()
+
+    timestamps, _ = read_all_pages(table, limit=4, since=since)
+
+    assert timestamps == [item['timestamp'] for item in newest_first(signals) if item['timestamp'] >= since]
+
+def test_since_with_an_offset_is_compared_in_utc():
+    table = FakeSignalsTable([make_signal('A', '2024-06-10T13:00:00'), make_signal('B', '2024-06-10T15:00:00')])
+
+    page, _ = signal_query.query_signals(table, since='2024-06-10T16:00:00+02:00', now=NOW)
+
+    assert [item['symbol'] for item in page] == ['B']
+
+def test_page_decodes_items_to_native_floats(signals):
+    page, cursor = signal_query.query_signals(FakeSignalsTable(signals), limit=3, now=NOW)
+
+    assert len(page) == 3 and cursor
+    assert isinstance(page[0]['confidence'], float)
+
+def test_date_bucket_is_the_utc_day():
+    assert signal_query.date_bucket('2024-06-10T23:30:00') == '2024-06-10'
+    assert signal_query.date_bucket('2024-06-10T23:30:00-04:00') == '2024-06-11'
+    assert signal_query.date_bucket('2024-06-10T01:00:00Z') == '2024-06-10'
+
+def test_handler_serves_pages_and_the_snapshot_view(monkeypatch, signals):
+    table = FakeSignalsTable(signals)
+    monkeypatch.setattr(signal_query, 'get_table', lambda: table)
+    monkeypatch.setattr(signal_query, 'utc_now', lambda: NOW)
+
+    body = json.loads(signal_query.lambda_handler({'queryStringParameters': {'limit': '2'}}, None)['body'])
+    assert body['count'] == 2 and body['next_cursor']
+
+    following = {'limit': '2', 'cursor': body['next_cursor']}
+    next_body = json.loads(signal_query.lambda_handler({'queryStringParameters': following}, None)['body'])
+    assert next_body['items'][0]['timestamp'] <= body['items'][-1]['timestamp']
+
+    write_snapshot(table, {'A': compact_signal(decode_signal(signals[0]))}, {'total_value': 1000.0}, {'signals_found': 1}, now=NOW)
+    response = signal_query.lambda_handler({'queryStringParameters': {'view': 'snapshot'}}, None)
+    snapshot = json.loads(response['body'])['snapshot']
+
+    assert response['statusCode'] == 200
+    assert snapshot['version'] == 1
+    assert list(snapshot['signals']) == ['A']
+    assert snapshot['portfolio'] == {'total_value': 1000}
+
+def test_backfill_makes_legacy_signals_visible_to_the_index(signals):
+    legacy = [make_signal('OLD', (NOW - timedelta(hours=hours)).isoformat(), with_bucket=False) for hours in range(1, 6)]
+    table = FakeSignalsTable(signals + legacy, scan_page_size=7)
+    write_snapshot(table, {}, None, {}, now=NOW)
+
+    before, _ = read_all_pages(table, limit=50)
+    result = signal_query.backfill_date_buckets(table)
+    after, _ = read_all_pages(table, limit=50)
+
+    assert result == {'updated': 5, 'next_key': None}
+    assert table.calls['scan'] > 1
+    assert len(after) == len(before) + 5
+    assert table.items[('OLD', legacy[0]['timestamp'])]['date_bucket'] == '2024-06-10'
+    assert 'date_bucket' not in table.items[('#SNAPSHOT', 'latest')]
+
+    # A re-run finds nothing left to do
+    assert signal_query.backfill_date_buckets(table)['updated'] == 0
@@ -0,0 +1,82 @@
+import random
+
+from fakes import FakeBroker, FakeSignalsTable
+from paper_execution import PaperExecutor
+from real_lambda_function import UniverseOrderBuffer, process_signal_stream
+from signal_writer import BatchSignalWriter
+
+UNIVERSE = ['S%02d' % i for i in range(12)]
+
+def make_signal(symbol, confidence=85.0):
+    return {
+        'symbol': symbol,
+        'signal_type': 'BUY',
+        'confidence': confidence,
+        'price': 50.0,
+        'timestamp': '2024-06-10T15:00:00',
+        'reasons': ['Test signal'],
+        'technical_data': {'profit_potential': 3.0},
+        'sentiment_data': {'sentiment_boost': 1.0}
+    }
+
+def completion_stream(completion_order, signals, trade_order, executor, observed):
+    """Stands in for the fetch -> analyze stages: signals in completion order, each symbol reported done"""
+    for symbol in completion_order:
+        if symbol in signals:
+            yield signals[symbol]
+        trade_order.symbol_done(symbol)
+        # Orders submitted so far
+        observed.append(len(executor.pending))
+
+def run_stream(completion_order, signals, observed=None):
+    observed = [] if observed is None else observed
+    broker = FakeBroker()
+    executor = PaperExecutor(broker, max_trades=3)
+    trade_order = UniverseOrderBuffer(UNIVERSE)
+    outcome = process_signal_stream(
+        completion_stream(completion_order, signals, trade_order, executor, observed),
+        BatchSignalWriter(FakeSignalsTable()),
+        executor,
+        True,
+        trade_order=trade_order
+    )
+    return outcome, broker
+
+def test_first_trade_is_submitted_before_the_stream_ends():
+    signals = {symbol: make_signal(symbol) for symbol in ('S00', 'S05', 'S09')}
+    observed = []
+
+    outcome, _ = run_stream(UNIVERSE, signals, observed)
+
+    # S00 is first in the universe, so its order goes out as soon as it is analyzed
+    assert observed[0] == 1
+    assert observed.index(3) < len(UNIVERSE) - 1
+    assert [trade['symbol'] for trade in outcome['executed_trades']] == ['S00', 'S05', 'S09']
+
+def test_trades_follow_universe_order_whatever_the_completion_order():
+    signals = {symbol: make_signal(symbol, confidence=80.0 + i) for i, symbol in enumerate(UNIVERSE) if i % 2}
+    signals['S04'] = make_signal('S04', confidence=60.0)
+
+    for seed in range(10):
+        completion_order = list(UNIVERSE)
+        random.Random(seed).shuffle(completion_order)
+        outcome, broker = run_stream(completion_order, signals)
+
+        assert [trade['symbol'] for trade in outcome['executed_trades']] == ['S01', 'S03', 'S05']
+        assert broker.calls['submit_order'] == 3
+        assert outcome['signals_found'] == len(signals)
+
+def test_buffer_holds_only_signals_ahead_of_an_unfinished_symbol():
+    released = []
+    trade_order = UniverseOrderBuffer(['A', 'B', 'C', 'D'], release=released.append)
+
+    trade_order.add(make_signal('C'))
+    trade_order.symbol_done('B')
+    assert released == []
+
+    trade_order.symbol_done('A')
+    assert [signal['symbol'] for signal in released] == ['C']
+    assert trade_order.finished == {}
+
+    trade_order.add(make_signal('OTHER'))
+    assert released[-1]['symbol'] == 'OTHER'
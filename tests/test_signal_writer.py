@@ -0,0 +1,65 @@
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from fakes import FakeSignalsTable
+from signal_writer import BatchSignalWriter
+
+def client_error(code, status=400):
+    return ClientError({'Error': {'Code': code, 'Message': code}, 'ResponseMetadata': {'HTTPStatusCode': status}}, 'BatchWriteItem')
+
+class FlakyTable(FakeSignalsTable):
+    """Fails the first batch writes with the given errors, then writes normally"""
+
+    def __init__(self, errors):
+        super().__init__()
+        self.errors = list(errors)
+
+    def batch_write_item(self, RequestItems):
+        if self.errors:
+            self.calls['batch_write_item'] += 1
+            raise self.errors.pop(0)
+        return super().batch_write_item(RequestItems)
+
+def make_signal(i):
+    return {'symbol': 'S%02d' % i, 'timestamp': '2024-06-10T15:00:00', 'signal_type': 'BUY'}
+
+def write(table, count=3):
+    sleeps = []
+    writer = BatchSignalWriter(table, sleep=sleeps.append)
+    for i in range(count):
+        writer.add(make_signal(i))
+    writer.flush()
+    return writer, sleeps
+
+def test_throttling_server_and_connection_errors_are_retried():
+    table = FlakyTable([
+        client_error('ProvisionedThroughputExceededException'),
+        client_error('InternalFailure', status=503),
+        EndpointConnectionError(endpoint_url='https://dynamodb.us-east-1.amazonaws.com')
+    ])
+
+    writer, sleeps = write(table)
+
+    assert (writer.items_written, writer.items_failed) == (3, 0)
+    assert table.calls['batch_write_item'] == 4
+    assert len(sleeps) == 3
+    assert writer.batch_metrics[0]['retries'] == 3
+
+def test_non_retryable_errors_fail_the_batch_at_once():
+    for error in (client_error('ValidationException'), client_error('ResourceNotFoundException'), client_error('AccessDeniedException')):
+        table = FlakyTable([error])
+
+        writer, sleeps = write(table)
+
+        assert (writer.items_written, writer.items_failed) == (0, 3)
+        assert table.calls['batch_write_item'] == 1
+        assert sleeps == []
+
+def test_retries_stop_after_max_retries():
+    table = FlakyTable([client_error('ThrottlingException')] * 10)
+    sleeps = []
+    writer = BatchSignalWriter(table, max_retries=2, sleep=sleeps.append)
+    writer.add(make_signal(0))
+    writer.flush()
+
+    assert (writer.items_written, writer.items_failed) == (0, 1)
+    assert table.calls['batch_write_item'] == 3
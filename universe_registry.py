@@ -0,0 +1,105 @@
+"""
+🗂️ Symbol Universe Registry
+
+Scans and backtests read their symbol lists from universes.json instead of
+embedding them in code. Each symbol carries sector, asset type, tags and
+liquidity metadata (average daily volume); named universes are ordered
+symbol lists. Sector/tag indexes and a liquidity ranking are built once at
+load, so filtering a universe - e.g. the top N by average volume, or
+without symbols marked inactive - is a few set lookups.
+"""
+
+import json
+import os
+
+UNIVERSE_FILE = os.environ.get('UNIVERSE_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'universes.json'))
+
+class UniverseRegistry:
+    """Indexed symbol metadata plus named, ordered universes"""
+
+    def __init__(self, data):
+        self.version = data.get('version')
+        self.as_of = data.get('as_of')
+        self.symbols = data['symbols']
+        self.universes = data['universes']
+
+        for name, members in self.universes.items():
+            unknown = [symbol for symbol in members if symbol not in self.symbols]
+            if unknown:
+                raise ValueError(f'Universe {name} references unknown symbols: {unknown}')
+
+        self.by_sector = {}
+        self.by_tag = {}
+        for symbol, info in self.symbols.items():
+            self.by_sector.setdefault(info.get('sector'), set()).add(symbol)
+            for tag in info.get('tags', []):
+                self.by_tag.setdefault(tag, set()).add(symbol)
+
+        # Most liquid first; ties keep file order
+        self.liquidity_rank = {
+            symbol: rank for rank, symbol in enumerate(
+                sorted(self.symbols, key=lambda s: -self.symbols[s].get('avg_volume', 0))
+            )
+        }
+
+    @classmethod
+    def from_file(cls, path=None):
+        with open(path or UNIVERSE_FILE) as f:
+            return cls(json.load(f))
+
+    def info(self, symbol):
+        """Metadata for one symbol (None if unknown)"""
+        return self.symbols.get(symbol)
+
+    def universe(self, name):
+        """Symbols of a named universe, in their configured order"""
+        if name not in self.universes:
+            raise KeyError(f'Unknown universe {name!r} - available: {sorted(self.universes)}')
+        return list(self.universes[name])
+
+    def select(self, universe=None, sectors=None, tags=None, min_avg_volume=None, top_n=None,
+               include_inactive=False, by_liquidity=False):
+        """Filter a universe (default: every known symbol)
+
+        top_n keeps the N most liquid matches; results are in universe order
+        unless `by_liquidity` (implied by top_n) asks for most liquid first.
+        """
+        symbols = self.universe(universe) if universe else list(self.symbols)
+
+        allowed = None
+        if sectors:
+            allowed = set().union(*(self.by_sector.get(sector, set()) for sector in sectors))
+        if tags:
+            tagged = set().union(*(self.by_tag.get(tag, set()) for tag in tags))
+            allowed = tagged if allowed is None else allowed & tagged
+
+        selected = []
+        for symbol in symbols:
+            info = self.symbols[symbol]
+            if allowed is not None and symbol not in allowed:
+                continue
+            if not include_inactive and not info.get('active', True):
+                continue
+            if min_avg_volume is not None and info.get('avg_volume', 0) < min_avg_volume:
+                continue
+            selected.append(symbol)
+
+        if top_n is not None or by_liquidity:
+            selected.sort(key=self.liquidity_rank.__getitem__)
+        if top_n is not None:
+            selected = selected[:top_n]
+        return selected
+
+# Loaded once per container
+_registry = None
+
+def get_universe_registry():
+    """Module-level registry, loaded from UNIVERSE_FILE on first use"""
+    global _registry
+    if _registry is None:
+        _registry = UniverseRegistry.from_file()
+    return _registry
+
+def universe_symbols(name, **filters):
+    """Shortcut: the active symbols of a named universe, optionally filtered (see select)"""
+    return get_universe_registry().select(name, **filters)
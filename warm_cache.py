@@ -0,0 +1,67 @@
+"""
+♨️ Warm-Container Cache
+
+Module-level caches live as long as the Lambda container, so state built in
+one scheduled invocation can be reused by the next one 30 minutes later.
+TTLCache bounds that state with a per-entry time-to-live and LRU eviction.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+WARM_CACHE_TTL = float(os.environ.get('WARM_CACHE_TTL', str(6 * 3600)))
+WARM_CACHE_MAX_ENTRIES = int(os.environ.get('WARM_CACHE_MAX_ENTRIES', '500'))
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, max_entries=None, ttl=None, clock=time.monotonic):
+        self.max_entries = max_entries or WARM_CACHE_MAX_ENTRIES
+        self.ttl = ttl or WARM_CACHE_TTL
+        self.clock = clock
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """Cached value for `key`, or `default` when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entries beyond max_entries"""
+        with self._lock:
+            self._entries[key] = (self.clock() + (ttl or self.ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evicted'] += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[1] if entry is not None else default
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()